@@ -10,9 +10,12 @@ O que ele faz:
 - Estabelece conexão WebSocket com seleção de região, suporte a modo demo/live e keep-alive
 - Mantém reconexão automática e restaura subscriptions realtime após perda de conexão
 - Consulta saldo da conta e sincroniza informações básicas do estado da sessão
+- Expõe gates de prontidão (autenticado, saldo, ativos, horário) resolvidos pelos eventos do broker
 - Envia ordens e acompanha ciclo de vida da operação até resultado final
 - Solicita candles históricos e converte os dados também para DataFrame com pandas
+- Faz backfill paginado do histórico a partir de end_time, com várias páginas em voo e entrega por página
 - Faz streaming de candles em tempo real via callback ou async generator
+- Divide assinaturas de candles entre vários sockets autenticados (pool_size > 1)
 - Solicita snapshot de ativos e mantém cache dinâmico de ativos, status e payouts
 - Permite filtros avançados de ativos por payout, abertura, OTC, tipo, busca textual, volatilidade e horário
 - Expõe estado consolidado do broker, incluindo conexão, conta, ativos, candles, ordens, limites e eventos desconhecidos
@@ -36,8 +39,11 @@ Requisitos:
 - pandas
 - loguru
 - Módulos internos do projeto:
+  - codec
   - constants
+  - events
   - exceptions
+  - history
   - models
   - monitoring
   - websocket_client
@@ -46,10 +52,9 @@ Requisitos:
 
 from __future__ import annotations
 import asyncio
-import json
 import time
 import uuid
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import (
@@ -58,6 +63,7 @@ from typing import (
     Awaitable,
     Callable,
     DefaultDict,
+    Deque,
     Dict,
     Iterable,
     List,
@@ -70,13 +76,16 @@ from typing import (
 import pandas as pd
 from loguru import logger
 
-from .constants import API_LIMITS, ASSET_IDS_TO_NAMES, ASSETS, REGIONS, TIMEFRAMES
+from . import codec
+from .constants import API_LIMITS, ASSET_IDS_TO_NAMES, ASSETS, HISTORY_SETTINGS, REGIONS, TIMEFRAMES
+from .events import EventBus, is_async_handler
 from .exceptions import (
     AuthenticationError,
     ConnectionError,
     InvalidParameterError,
     OrderError,
     PocketOptionError,
+    TimeoutError,
 )
 from .models import (
     Balance,
@@ -87,11 +96,25 @@ from .models import (
     OrderStatus,
     ServerTime,
 )
+from .history import CandleHistoryPager, CandleRequestRegistry
+from .latency import LatencyRegistry
 from .monitoring import ErrorCategory, ErrorSeverity, error_monitor, health_checker
 from .websocket_client import AsyncWebSocketClient
 
 EventCallback = Callable[[Any], Union[None, Awaitable[None]]]
 
+# Gates de prontidão da sessão, resolvidos pelos eventos recebidos do broker
+READINESS_GATES = ("authenticated", "balance", "assets", "time_synced")
+CONNECT_READINESS_GATES = ("balance", "assets")
+# Evento normalizado -> gate aberto pelo seu handler interno (falha do handler falha o gate)
+EVENT_READINESS_GATES = {
+    "authenticated": "authenticated",
+    "balance_updated": "balance",
+    "balance_data": "balance",
+    "assets": "assets",
+    "assets_received": "assets",
+}
+
 @dataclass
 class CandleQueueSubscription:
     key: str
@@ -124,6 +147,17 @@ def _server_ts_to_dt_utc(ts: Any) -> datetime:
 
     return dt
 
+_logging_silenced = False
+
+def _silence_logging() -> None:
+    """Troca os sinks do loguru por um sink mudo uma única vez por processo (logger.add é caro)."""
+    global _logging_silenced
+    if _logging_silenced:
+        return
+    logger.remove()
+    logger.add(lambda _: None, level="CRITICAL")
+    _logging_silenced = True
+
 class AsyncPocketOptionClient:
     """Cliente async principal da PocketOption com suporte realtime expandido."""
 
@@ -138,6 +172,8 @@ class AsyncPocketOptionClient:
         persistent_connection: bool = False,
         auto_reconnect: bool = True,
         enable_logging: bool = True,
+        pool_size: int = 1,
+        transport: Optional[AsyncWebSocketClient] = None,
     ):
         self.raw_ssid = ssid
         self.is_demo = is_demo
@@ -148,10 +184,10 @@ class AsyncPocketOptionClient:
         self.persistent_connection = persistent_connection
         self.auto_reconnect = auto_reconnect
         self.enable_logging = enable_logging
+        self.pool_size = max(1, int(pool_size))
 
         if not enable_logging:
-            logger.remove()
-            logger.add(lambda _: None, level="CRITICAL")
+            _silence_logging()
 
         self._original_demo = None
         if ssid.startswith('42["auth",'):
@@ -160,21 +196,38 @@ class AsyncPocketOptionClient:
             self.session_id = ssid
             self._complete_ssid = None
 
-        self._websocket = AsyncWebSocketClient()
+        # transport permite substituir o socket real (ex.: replay de capturas gravadas)
+        self._websocket = transport or AsyncWebSocketClient()
         self._balance: Optional[Balance] = None
         self._orders: Dict[str, OrderResult] = {}
         self._active_orders: Dict[str, OrderResult] = {}
         self._order_results: Dict[str, OrderResult] = {}
+        # requestId -> (future da confirmação successopenOrder, instante do envio em perf_counter_ns)
+        self._order_confirmations: Dict[str, Tuple[asyncio.Future, int]] = {}
+        # order_id -> futures aguardando o successcloseOrder (check_win, wait_for_results, iter_results)
+        self._settlement_waiters: Dict[str, List[asyncio.Future]] = {}
         self._candles_cache: Dict[str, List[Candle]] = {}
+        # Pedidos de histórico em voo, casados pela resposta (ativo/período/índice) e coalescidos
+        self._history_requests = CandleRequestRegistry()
         self._server_time: Optional[ServerTime] = None
 
-        self._event_callbacks: DefaultDict[str, List[EventCallback]] = defaultdict(list)
+        self._event_callbacks = EventBus(
+            error_template="Error in event callback for {event}: {error}",
+            log_errors=enable_logging,
+        )
         self._pending_event_futures: DefaultDict[str, List[asyncio.Future]] = defaultdict(list)
 
         self._error_monitor = error_monitor
         self._health_checker = health_checker
-        self._operation_metrics: DefaultDict[str, List[float]] = defaultdict(list)
+        # Latência (ns) das operações de ida e volta ao broker: connect, balance, candles, order_open
+        self._latency = LatencyRegistry()
         self._last_health_check = time.time()
+        # Rearmados a cada conexão; o tempo até cada gate abrir é registrado como ready_<gate>
+        self._ready_gates: Dict[str, asyncio.Event] = {name: asyncio.Event() for name in READINESS_GATES}
+        # Falha registrada por gate (handler interno quebrou): wait_until_ready retorna na hora
+        self._ready_failures: Dict[str, asyncio.Event] = {name: asyncio.Event() for name in READINESS_GATES}
+        self._ready_errors: Dict[str, BaseException] = {}
+        self._ready_armed_ns = time.perf_counter_ns()
 
         self._keep_alive_manager = None
         self._ping_task: Optional[asyncio.Task] = None
@@ -201,7 +254,9 @@ class AsyncPocketOptionClient:
         self._candle_stream_subscriptions: Dict[str, Dict[str, Any]] = {}
         self._candle_queue_subscriptions: Dict[str, List[CandleQueueSubscription]] = defaultdict(list)
         self._raw_state_sections: Dict[str, Any] = {}
-        self._raw_events_history: List[Dict[str, Any]] = []
+        self._raw_events_history: Deque[Dict[str, Any]] = deque(maxlen=1000)
+        self._raw_history_enabled = False
+        self._raw_handler_attached = False
         self._news_cache: List[Dict[str, Any]] = []
         self._account_config: Dict[str, Any] = {}
         self._trade_limits: List[Dict[str, Any]] = []
@@ -210,9 +265,7 @@ class AsyncPocketOptionClient:
         self._asset_request_cooldown: float = 2.0
 
         self._setup_event_handlers()
-        self._websocket.add_event_handler("json_data", self._on_json_data)
-        self._websocket.add_event_handler("raw_message", self._on_raw_message)
-        self._websocket.add_event_handler("unknown_event", self._on_unknown_event)
+        self._websocket.add_event_handler("disconnected", self._on_disconnected)
 
         logger.info(
             f"Initialized PocketOption client (demo={is_demo}, uid={self.uid}, persistent={persistent_connection})"
@@ -225,18 +278,24 @@ class AsyncPocketOptionClient:
     # -------------------------------------------------------------------------
 
     def _setup_event_handlers(self) -> None:
-        self._websocket.add_event_handler("authenticated", self._on_authenticated)
-        self._websocket.add_event_handler("balance_updated", self._on_balance_updated)
-        self._websocket.add_event_handler("balance_data", self._on_balance_data)
-        self._websocket.add_event_handler("order_opened", self._on_order_opened)
-        self._websocket.add_event_handler("order_closed", self._on_order_closed)
-        self._websocket.add_event_handler("stream_update", self._on_stream_update)
-        self._websocket.add_event_handler("candles_received", self._on_candles_received)
-        self._websocket.add_event_handler("history_update", self._on_history_update)
-        self._websocket.add_event_handler("disconnected", self._on_disconnected)
-        self._websocket.add_event_handler("assets", self._on_assets_event)
-        self._websocket.add_event_handler("assets_received", self._on_assets_event)
-        self._websocket.add_event_handler("payout_update", self._on_payout_update)
+        self._register_transport_handlers(self._websocket)
+
+    def _register_transport_handlers(self, source: Any) -> None:
+        """Assina os eventos normalizados do roteador de frames, idênticos nos modos regular e persistente."""
+        source.set_handler_error_callback(self._on_transport_handler_error)
+        source.add_event_handler("authenticated", self._on_authenticated)
+        source.add_event_handler("balance_updated", self._on_balance_updated)
+        source.add_event_handler("balance_data", self._on_balance_data)
+        source.add_event_handler("order_opened", self._on_order_opened)
+        source.add_event_handler("order_closed", self._on_order_closed)
+        source.add_event_handler("stream_update", self._on_stream_update)
+        source.add_event_handler("candles_received", self._on_candles_received)
+        source.add_event_handler("history_update", self._on_history_update)
+        source.add_event_handler("assets", self._on_assets_event)
+        source.add_event_handler("assets_received", self._on_assets_event)
+        source.add_event_handler("payout_update", self._on_payout_update)
+        source.add_event_handler("json_data", self._on_json_data)
+        source.add_event_handler("unknown_event", self._on_unknown_event)
 
     async def connect(
         self,
@@ -249,9 +308,14 @@ class AsyncPocketOptionClient:
             self.persistent_connection = bool(persistent)
 
         try:
+            started = time.perf_counter_ns()
             if self.persistent_connection:
-                return await self._start_persistent_connection(regions)
-            return await self._start_regular_connection(regions)
+                connected = await self._start_persistent_connection(regions)
+            else:
+                connected = await self._start_regular_connection(regions)
+            if connected:
+                self._latency.record("connect", time.perf_counter_ns() - started)
+            return connected
         except Exception as exc:
             logger.error(f"Connection failed: {exc}")
             await self._error_monitor.record_error(
@@ -280,60 +344,88 @@ class AsyncPocketOptionClient:
 
         self._connection_stats["total_connections"] += 1
         self._connection_stats["connection_start_time"] = time.time()
+        self._arm_readiness_gates()
 
+        region_urls: Dict[str, str] = {}
         for region in regions:
-            try:
-                region_url = REGIONS.get_region(region)
-                if not region_url:
-                    continue
+            region_url = REGIONS.get_region(region)
+            if region_url and region_url not in region_urls:
+                region_urls[region_url] = region
 
-                logger.info(f"Trying region: {region} ({region_url})")
-                ssid_message = self._format_session_message()
-                success = await self._websocket.connect([region_url], ssid_message)
+        if not region_urls:
+            return False
 
-                if success:
-                    await self._wait_for_authentication()
-                    await self._initialize_data()
-                    await self._start_keep_alive_tasks()
-                    self._connection_stats["successful_connections"] += 1
-                    logger.info(f"Connected and authenticated on region: {region}")
-                    await self._emit_event("connected", {"region": region, "url": region_url})
-                    return True
-            except Exception as exc:
-                logger.warning(f"Failed to connect to region {region}: {exc}")
-                continue
+        try:
+            logger.info(f"Racing regions: {list(region_urls.values())}")
+            ssid_message = self._format_session_message()
+            success = await self._websocket.connect(list(region_urls), ssid_message)
+
+            if success:
+                connected_url = self._websocket.connection_info.url if self._websocket.connection_info else None
+                region = region_urls.get(connected_url, "UNKNOWN")
+
+                await self._wait_for_authentication()
+                await self._initialize_data()
+                if self.pool_size > 1:
+                    await self._open_connection_pool(region, regions)
+                await self._start_keep_alive_tasks()
+                self._connection_stats["successful_connections"] += 1
+                logger.info(f"Connected and authenticated on region: {region}")
+                await self._emit_event("connected", {"region": region, "url": connected_url})
+                return True
+        except Exception as exc:
+            logger.warning(f"Failed to connect to regions {list(region_urls.values())}: {exc}")
 
         return False
 
+    async def _open_connection_pool(self, primary_region: str, regions: List[str]) -> None:
+        """Abre sockets secundários nas demais regiões permitidas para dividir as assinaturas."""
+        ordered = [primary_region] + [name for name in regions if name != primary_region]
+        # A região do principal vai primeiro: o pool desloca cada secundário pela quantidade de membros ativos
+        urls = [url for url in (REGIONS.get_region(name) for name in ordered) if url]
+
+        pool = self._websocket.connection_pool
+        pool.max_connections = max(pool.max_connections, self.pool_size)
+        try:
+            await pool.open(urls, self._format_session_message(), self.pool_size)
+        except Exception as exc:
+            logger.warning(f"Connection pool could not be fully opened: {exc}")
+
     async def _start_persistent_connection(self, regions: Optional[List[str]] = None) -> bool:
         logger.info("Starting persistent connection with automatic keep-alive...")
 
         from .connection_keep_alive import ConnectionKeepAlive
 
+        self._arm_readiness_gates()
         complete_ssid = self.raw_ssid
-        self._keep_alive_manager = ConnectionKeepAlive(complete_ssid, self.is_demo)
+        self._keep_alive_manager = ConnectionKeepAlive(
+            complete_ssid,
+            self.is_demo,
+            route_table=self._websocket.event_routes,
+            recorder=self._websocket.recorder,
+        )
 
         self._keep_alive_manager.add_event_handler("connected", self._on_keep_alive_connected)
         self._keep_alive_manager.add_event_handler("reconnected", self._on_keep_alive_reconnected)
         self._keep_alive_manager.add_event_handler("message_received", self._on_keep_alive_message)
-        self._keep_alive_manager.add_event_handler("balance_data", self._on_balance_data)
-        self._keep_alive_manager.add_event_handler("balance_updated", self._on_balance_updated)
-        self._keep_alive_manager.add_event_handler("authenticated", self._on_authenticated)
-        self._keep_alive_manager.add_event_handler("order_opened", self._on_order_opened)
-        self._keep_alive_manager.add_event_handler("order_closed", self._on_order_closed)
-        self._keep_alive_manager.add_event_handler("stream_update", self._on_stream_update)
-        self._keep_alive_manager.add_event_handler("json_data", self._on_json_data)
-        self._keep_alive_manager.add_event_handler("assets", self._on_assets_event)
-        self._keep_alive_manager.add_event_handler("assets_received", self._on_assets_event)
-        self._keep_alive_manager.add_event_handler("payout_update", self._on_payout_update)
+        self._register_transport_handlers(self._keep_alive_manager)
 
+        # Antes do connect: os handlers disparados durante a conexão já enviam pelo keep-alive
+        self._is_persistent = True
         success = await self._keep_alive_manager.connect_with_keep_alive(regions)
         if success:
-            self._is_persistent = True
+            # O loop de mensagens do keep-alive já está rodando: aqui os gates podem ser aguardados
+            if not await self.wait_until_ready("authenticated", timeout=10.0):
+                logger.error("Persistent connection not authenticated within 10.0s")
+                await self._keep_alive_manager.disconnect()
+                self._is_persistent = False
+                return False
+            await self._initialize_data()
             logger.info("Persistent connection established successfully")
             await self._emit_event("connected", {"persistent": True})
             return True
 
+        self._is_persistent = False
         logger.error("Failed to establish persistent connection")
         return False
 
@@ -383,11 +475,16 @@ class AsyncPocketOptionClient:
         if self._is_persistent and self._keep_alive_manager:
             await self._keep_alive_manager.disconnect()
         else:
+            await self._websocket.connection_pool.close()
             await self._websocket.disconnect()
 
         self._is_persistent = False
         self._balance = None
+        self._arm_readiness_gates()
         self._orders.clear()
+        self._fail_order_confirmations(ConnectionError("Disconnected before order confirmation"))
+        self._fail_settlement_waiters(ConnectionError("Disconnected before order settlement"))
+        self._history_requests.fail_all(ConnectionError("Disconnected before candle history arrived"))
 
         logger.info("Disconnected successfully")
         await self._emit_event("disconnected", {})
@@ -412,13 +509,18 @@ class AsyncPocketOptionClient:
     # Public API - base compatibility
     # -------------------------------------------------------------------------
 
-    async def get_balance(self) -> Balance:
+    async def get_balance(self, timeout: float = 5.0) -> Balance:
         if not self.is_connected:
             raise ConnectionError("Not connected to PocketOption")
 
-        if not self._balance or (datetime.now() - self._balance.last_updated).seconds > 60:
-            await self._request_balance_update()
-            await asyncio.sleep(1)
+        if not self._balance or (datetime.now(timezone.utc) - self._balance.last_updated).total_seconds() > 60:
+            updated = self._expect_event("balance_updated")
+            try:
+                with self._latency.measure("balance"):
+                    await self._request_balance_update()
+                    await self._await_event("balance_updated", updated, timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Balance refresh not received within {timeout}s")
 
         if not self._balance:
             raise PocketOptionError("Balance data not available")
@@ -446,8 +548,15 @@ class AsyncPocketOptionClient:
                 duration=duration,
                 request_id=order_id,
             )
-            await self._send_order(order)
-            result = await self._wait_for_order_result(order_id, order)
+            with self._latency.measure("order_open"):
+                # Registrado antes do envio: o successopenOrder pode chegar antes do await seguinte
+                self._register_order_confirmation(order_id)
+                try:
+                    await self._send_order(order)
+                except BaseException:
+                    self._discard_order_confirmation(order_id)
+                    raise
+                result = await self._wait_for_order_result(order_id, order)
             logger.info(f"Order placed: {result.order_id} - {result.status}")
             return result
         except Exception as exc:
@@ -476,6 +585,9 @@ class AsyncPocketOptionClient:
         if normalized_asset not in ASSETS and normalized_asset not in self._asset_status_cache:
             logger.debug(f"Asset {normalized_asset} not found in static map; continuing with realtime symbol")
 
+        # end_time explícito ou mais candles do que uma página: backfill paginado via loadHistoryPeriod
+        historical = end_time is not None
+        paged = historical or count > HISTORY_SETTINGS["page_size"]
         if not end_time:
             end_time = datetime.now(timezone.utc)
 
@@ -487,11 +599,14 @@ class AsyncPocketOptionClient:
                     timeframe_seconds,
                     count,
                     end_time,
+                    paged=paged,
                 )
                 cache_key = self._make_candle_cache_key(normalized_asset, timeframe_seconds)
-                self._candles_cache[cache_key] = candles
-                if candles:
-                    self._latest_candles[cache_key] = candles[-1]
+                # Um recorte do passado não substitui o cache ao vivo do ativo
+                if not historical:
+                    self._candles_cache[cache_key] = candles
+                    if candles:
+                        self._latest_candles[cache_key] = candles[-1]
                 logger.info(f"Retrieved {len(candles)} candles for {normalized_asset}")
                 return candles
             except Exception as exc:
@@ -531,6 +646,48 @@ class AsyncPocketOptionClient:
             df.sort_index(inplace=True)
         return df
 
+    async def iter_candle_pages(
+        self,
+        asset: str,
+        timeframe: Union[str, int],
+        count: int,
+        end_time: Optional[datetime] = None,
+        page_size: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        max_gap: Optional[float] = None,
+    ) -> AsyncGenerator[List[Candle], None]:
+        """
+        Backfill paginado: entrega páginas de candles da mais recente para a mais antiga,
+        cada uma em ordem crescente, à medida que chegam. Só max_in_flight páginas ficam
+        em memória, então dá para percorrer dezenas de milhares de candles em streaming.
+        Lacunas sem candles menores que max_gap segundos (fins de semana, feriados) são atravessadas.
+        """
+        if not self.is_connected:
+            raise ConnectionError("Not connected to PocketOption")
+
+        timeframe_seconds = self._normalize_timeframe(timeframe)
+        normalized_asset = self._normalize_asset_name_for_payout(asset)
+        end = end_time or datetime.now(timezone.utc)
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=timezone.utc)
+
+        pager = CandleHistoryPager(
+            lambda end_ts, span: self._request_history_page(normalized_asset, timeframe_seconds, end_ts, span),
+            timeframe_seconds,
+            count,
+            end.timestamp(),
+            page_size=page_size or HISTORY_SETTINGS["page_size"],
+            max_in_flight=max_in_flight or HISTORY_SETTINGS["max_in_flight"],
+            max_gap=max_gap or HISTORY_SETTINGS["max_gap"],
+        )
+        pages = pager.pages()
+        try:
+            async for page in pages:
+                yield page
+        finally:
+            await pages.aclose()
+            logger.debug(f"History backfill for {normalized_asset}: {pager.stats}")
+
     async def check_order_result(self, order_id: str) -> Optional[OrderResult]:
         if order_id in self._active_orders:
             return self._active_orders[order_id]
@@ -542,14 +699,50 @@ class AsyncPocketOptionClient:
         return list(self._active_orders.values())
 
     def add_event_callback(self, event: str, callback: EventCallback) -> None:
-        self._event_callbacks[event].append(callback)
+        self._event_callbacks.subscribe(event, callback)
+        if event == "raw_message_received":
+            self._sync_raw_message_subscription()
 
     def remove_event_callback(self, event: str, callback: EventCallback) -> None:
-        if event in self._event_callbacks:
-            try:
-                self._event_callbacks[event].remove(callback)
-            except ValueError:
-                pass
+        self._event_callbacks.unsubscribe(event, callback)
+        if event == "raw_message_received":
+            self._sync_raw_message_subscription()
+
+    def set_concurrent_callbacks(self, enabled: bool = True) -> None:
+        """Executa callbacks assíncronos independentes do mesmo evento em paralelo (asyncio.gather)."""
+        self._event_callbacks.concurrent = bool(enabled)
+
+    def enable_raw_message_capture(
+        self,
+        history: bool = True,
+        every_n: Optional[int] = None,
+        per_second: Optional[int] = None,
+    ) -> None:
+        """
+        Ativa a observação de frames brutos (desligada por padrão).
+
+        - history=True mantém os últimos 1000 frames em memória
+        - every_n / per_second ativam amostragem para depuração em produção
+        """
+        self._raw_history_enabled = bool(history)
+        self._websocket.set_raw_message_sampling(every_n=every_n, per_second=per_second)
+        self._sync_raw_message_subscription()
+
+    def disable_raw_message_capture(self) -> None:
+        self._raw_history_enabled = False
+        self._websocket.set_raw_message_sampling()
+        self._raw_events_history.clear()
+        self._sync_raw_message_subscription()
+
+    def _sync_raw_message_subscription(self) -> None:
+        """Só registra o handler raw no transporte se houver consumidor."""
+        wanted = self._raw_history_enabled or self._event_callbacks.has_handlers("raw_message_received")
+        if wanted and not self._raw_handler_attached:
+            self._websocket.add_event_handler("raw_message", self._on_raw_message)
+            self._raw_handler_attached = True
+        elif not wanted and self._raw_handler_attached:
+            self._websocket.remove_event_handler("raw_message", self._on_raw_message)
+            self._raw_handler_attached = False
 
     @property
     def is_connected(self) -> bool:
@@ -580,6 +773,10 @@ class AsyncPocketOptionClient:
 
     def get_connection_stats(self) -> Dict[str, Any]:
         stats = self._connection_stats.copy()
+        stats["latency"] = self.get_latency_stats()
+        stats["readiness"] = self.get_readiness()
+        stats["readiness_errors"] = self.get_readiness_errors()
+        stats["history_requests"] = self._history_requests.get_stats()
         if self._is_persistent and self._keep_alive_manager:
             stats.update(self._keep_alive_manager.get_stats())
         else:
@@ -587,10 +784,66 @@ class AsyncPocketOptionClient:
                 {
                     "websocket_connected": self._websocket.is_connected,
                     "connection_info": self._websocket.connection_info,
+                    "ingress": self._websocket.get_ingress_stats(),
+                    "outbound": self._websocket.get_outbound_stats(),
+                    "tls": self._websocket.get_tls_stats(),
+                    "compression": self._websocket.get_compression_stats(),
+                    "recorder": self._websocket.get_recorder_stats(),
+                    "pool": self._websocket.connection_pool.get_load_report(),
+                    "regions": self._websocket.connection_pool.scoreboard.snapshot(),
                 }
             )
         return stats
 
+    @property
+    def latency(self) -> LatencyRegistry:
+        """Histogramas de latência do cliente (podem ser salvos e somados com LatencyRegistry.save/merge)."""
+        return self._latency
+
+    def get_latency_stats(self, unit: str = "ms") -> Dict[str, Dict[str, float]]:
+        return self._latency.summary(unit)
+
+    # -------------------------------------------------------------------------
+    # Public API - readiness
+    # -------------------------------------------------------------------------
+
+    def is_ready(self, *gates: str) -> bool:
+        """True se todos os gates pedidos (padrão: os aguardados pelo connect) já abriram."""
+        return all(gate.is_set() for gate in self._select_gates(gates))
+
+    def get_readiness(self) -> Dict[str, bool]:
+        return {name: gate.is_set() for name, gate in self._ready_gates.items()}
+
+    async def wait_until_ready(self, *gates: str, timeout: float = 10.0) -> bool:
+        """
+        Aguarda os gates pedidos abrirem (authenticated, balance, assets, time_synced).
+
+        Retorna False no timeout ou assim que um dos gates pedidos falhar (handler
+        interno com erro); o motivo fica em get_readiness_errors().
+        """
+        pending = [name for name in self._select_gate_names(gates) if not self._ready_gates[name].is_set()]
+        if not pending:
+            return True
+
+        if not any(name in self._ready_errors for name in pending):
+            ready = asyncio.ensure_future(self._wait_gates_open(pending))
+            failures = [asyncio.ensure_future(self._ready_failures[name].wait()) for name in pending]
+            try:
+                await asyncio.wait([ready, *failures], timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for task in (ready, *failures):
+                    task.cancel()
+
+        failed = {name: self._ready_errors[name] for name in pending if name in self._ready_errors}
+        if failed:
+            logger.warning(f"Readiness gate(s) failed: {failed}")
+            return False
+        return all(self._ready_gates[name].is_set() for name in pending)
+
+    def get_readiness_errors(self) -> Dict[str, str]:
+        """Falhas registradas nos gates desde a última conexão (gate -> erro)."""
+        return {name: repr(error) for name, error in self._ready_errors.items()}
+
     # -------------------------------------------------------------------------
     # Public API - realtime assets / payouts
     # -------------------------------------------------------------------------
@@ -600,11 +853,23 @@ class AsyncPocketOptionClient:
         if not self.is_connected:
             raise ConnectionError("Not connected to PocketOption")
 
-        now = time.time()
-        if self._last_assets_request_at and (now - self._last_assets_request_at) < self._asset_request_cooldown:
+        received = self._expect_event("assets_received")
+        if not await self._send_assets_request():
+            self._discard_event_future("assets_received", received)
             return dict(self._asset_status_cache)
 
-        self._last_assets_request_at = now
+        try:
+            await self._await_event("assets_received", received, timeout)
+        except Exception:
+            pass
+
+        return dict(self._asset_status_cache)
+
+    async def _send_assets_request(self) -> bool:
+        """Envia os pedidos de snapshot de ativos; False no cooldown ou se nenhum envio saiu."""
+        now = time.time()
+        if self._last_assets_request_at and (now - self._last_assets_request_at) < self._asset_request_cooldown:
+            return False
 
         messages = [
             '42["assets"]',
@@ -612,18 +877,14 @@ class AsyncPocketOptionClient:
             '42["loadAssets"]',
         ]
 
+        sent = False
         for message in messages:
-            try:
-                await self.send_message(message)
-            except Exception:
-                continue
+            sent = await self.send_message(message) or sent
 
-        try:
-            await self._wait_for_event("assets_received", timeout=timeout)
-        except Exception:
-            pass
-
-        return dict(self._asset_status_cache)
+        # O cooldown só conta a partir de um pedido que de fato saiu
+        if sent:
+            self._last_assets_request_at = now
+        return sent
 
     async def get_assets(
         self,
@@ -940,6 +1201,8 @@ class AsyncPocketOptionClient:
         trading_hours: Optional[Union[str, Dict[str, Any]]] = None,
         **extra_filters: Any,
     ) -> EventCallback:
+        callback_is_async = is_async_handler(callback)
+
         async def _wrapped(_data: Any) -> None:
             records = await self.get_assets(
                 only_open=only_open,
@@ -957,7 +1220,7 @@ class AsyncPocketOptionClient:
                 "count": len(records),
                 "updated_at": datetime.now(timezone.utc),
             }
-            if asyncio.iscoroutinefunction(callback):
+            if callback_is_async:
                 await callback(payload)
             else:
                 callback(payload)
@@ -979,6 +1242,7 @@ class AsyncPocketOptionClient:
         otc: Optional[bool] = None,
     ) -> EventCallback:
         selected_assets = {self._normalize_asset_name_for_payout(asset) for asset in assets} if assets else None
+        callback_is_async = is_async_handler(callback)
 
         async def _wrapped(_data: Any) -> None:
             payload: Dict[str, Dict[str, Any]] = {}
@@ -1019,7 +1283,7 @@ class AsyncPocketOptionClient:
                 "updated_at": datetime.now(timezone.utc),
             }
 
-            if asyncio.iscoroutinefunction(callback):
+            if callback_is_async:
                 await callback(event_payload)
             else:
                 callback(event_payload)
@@ -1062,12 +1326,14 @@ class AsyncPocketOptionClient:
         }
 
         if callback is not None:
+            callback_is_async = is_async_handler(callback)
+
             async def _wrapped(data: Any) -> None:
                 if str(data.get("asset")) != normalized_asset:
                     return
                 if int(data.get("timeframe", 0)) != timeframe_seconds:
                     return
-                if asyncio.iscoroutinefunction(callback):
+                if callback_is_async:
                     await callback(data)
                 else:
                     callback(data)
@@ -1142,6 +1408,7 @@ class AsyncPocketOptionClient:
                 self.remove_event_callback("candle_update", callback)
 
         self._candle_queue_subscriptions.pop(subscription_key, None)
+        self._websocket.connection_pool.release(subscription_key)
 
     # -------------------------------------------------------------------------
     # Public API - broker state / raw exposure
@@ -1227,7 +1494,7 @@ class AsyncPocketOptionClient:
         }
         if self.is_fast_history:
             auth_data["isFastHistory"] = True
-        return f'42["auth",{json.dumps(auth_data)}]'
+        return f'42["auth",{codec.dumps(auth_data)}]'
 
     def _parse_complete_ssid(self, ssid: str) -> None:
         try:
@@ -1235,7 +1502,7 @@ class AsyncPocketOptionClient:
             json_end = ssid.rfind("}") + 1
             if json_start != -1 and json_end > json_start:
                 json_part = ssid[json_start:json_end]
-                data = json.loads(json_part)
+                data = codec.loads(json_part)
                 self.session_id = data.get("session", "")
                 self._original_demo = bool(data.get("isDemo", 1))
                 self.uid = data.get("uid", 0)
@@ -1249,46 +1516,38 @@ class AsyncPocketOptionClient:
         self._complete_ssid = None
 
     async def _wait_for_authentication(self, timeout: float = 10.0) -> None:
-        auth_received = False
+        # O successauth pode já ter sido reprocessado pelo conector antes desta chamada
+        if not await self._websocket.wait_for_authentication(timeout):
+            raise AuthenticationError("Authentication timeout")
+        self._mark_ready("authenticated")
 
-        def on_auth(_data: Any) -> None:
-            nonlocal auth_received
-            auth_received = True
-
-        self._websocket.add_event_handler("authenticated", on_auth)
-        try:
-            start_time = time.time()
-            while not auth_received and (time.time() - start_time) < timeout:
-                await asyncio.sleep(0.1)
-
-            if not auth_received:
-                raise AuthenticationError("Authentication timeout")
-        finally:
-            self._websocket.remove_event_handler("authenticated", on_auth)
+    async def _initialize_data(self, wait: bool = True, timeout: float = 5.0) -> Tuple[str, ...]:
+        """
+        Pede saldo e ativos em paralelo e aguarda só os gates cujos pedidos saíram.
 
-    async def _initialize_data(self) -> None:
+        wait=False apenas envia os pedidos: no handler de reconexão do keep-alive
+        as respostas chegam pelo loop de mensagens depois do retorno. Devolve os
+        gates efetivamente pedidos.
+        """
         logger.info("Initializing broker data...")
-        await self._request_balance_update()
+        requested: List[str] = []
+        if await self._request_balance_update():
+            requested.append("balance")
         await self._setup_time_sync()
+        if await self._send_assets_request():
+            requested.append("assets")
 
-        try:
-            await self.get_payouts(force_refresh=True)
-        except Exception:
-            pass
+        if wait and requested and not await self.wait_until_ready(*requested, timeout=timeout):
+            logger.warning(f"Broker data not fully received within {timeout}s: {self.get_readiness()}")
+        return tuple(requested)
 
-        try:
-            await self.request_assets_snapshot(timeout=5.0)
-        except Exception:
-            pass
-
-    async def _request_balance_update(self) -> None:
-        message = '42["getBalance"]'
-        if self._is_persistent and self._keep_alive_manager:
-            await self._keep_alive_manager.send_message(message)
-        else:
-            await self._websocket.send_message(message)
+    async def _request_balance_update(self) -> bool:
+        return await self.send_message('42["getBalance"]')
 
     async def _setup_time_sync(self) -> None:
+        # Provisório até o broker informar o horário (gate time_synced)
+        if self._ready_gates["time_synced"].is_set():
+            return
         local_time = datetime.now(timezone.utc).timestamp()
         self._server_time = ServerTime(
             server_timestamp=local_time,
@@ -1296,6 +1555,52 @@ class AsyncPocketOptionClient:
             offset=0.0,
         )
 
+    # -------------------------------------------------------------------------
+    # Helpers - readiness
+    # -------------------------------------------------------------------------
+
+    def _select_gate_names(self, names: Tuple[str, ...]) -> Tuple[str, ...]:
+        selected = names or ("authenticated",) + CONNECT_READINESS_GATES
+        unknown = [name for name in selected if name not in self._ready_gates]
+        if unknown:
+            raise InvalidParameterError(f"Unknown readiness gate(s): {unknown}; expected {list(READINESS_GATES)}")
+        return selected
+
+    def _select_gates(self, names: Tuple[str, ...]) -> List[asyncio.Event]:
+        return [self._ready_gates[name] for name in self._select_gate_names(names)]
+
+    def _arm_readiness_gates(self) -> None:
+        for gate in self._ready_gates.values():
+            gate.clear()
+        for failure in self._ready_failures.values():
+            failure.clear()
+        self._ready_errors.clear()
+        self._ready_armed_ns = time.perf_counter_ns()
+
+    def _mark_ready(self, name: str) -> None:
+        gate = self._ready_gates[name]
+        if not gate.is_set():
+            # Uma resposta válida posterior supera a falha anterior
+            self._ready_errors.pop(name, None)
+            self._ready_failures[name].clear()
+            gate.set()
+            self._latency.record(f"ready_{name}", time.perf_counter_ns() - self._ready_armed_ns)
+
+    async def _wait_gates_open(self, names: List[str]) -> None:
+        for name in names:
+            await self._ready_gates[name].wait()
+
+    def _fail_ready(self, name: str, error: BaseException) -> None:
+        if self._ready_gates[name].is_set():
+            return
+        self._ready_errors[name] = error
+        self._ready_failures[name].set()
+
+    def _on_transport_handler_error(self, event: str, error: BaseException) -> None:
+        gate = EVENT_READINESS_GATES.get(event)
+        if gate is not None:
+            self._fail_ready(gate, error)
+
     # -------------------------------------------------------------------------
     # Helpers - order flow
     # -------------------------------------------------------------------------
@@ -1326,11 +1631,16 @@ class AsyncPocketOptionClient:
 
     async def _send_order(self, order: Order) -> None:
         asset_name = self._normalize_asset_name_for_payout(order.asset)
-        message = (
-            f'42["openOrder",{{"asset":"{asset_name}","amount":{order.amount},'
-            f'"action":"{order.direction.value}","isDemo":{1 if self.is_demo else 0},'
-            f'"requestId":"{order.request_id}","optionType":100,"time":{order.duration}}}]'
-        )
+        order_data = {
+            "asset": asset_name,
+            "amount": order.amount,
+            "action": order.direction.value,
+            "isDemo": 1 if self.is_demo else 0,
+            "requestId": order.request_id,
+            "optionType": 100,
+            "time": order.duration,
+        }
+        message = f'42["openOrder",{codec.dumps(order_data)}]'
 
         if self._is_persistent and self._keep_alive_manager:
             await self._keep_alive_manager.send_message(message)
@@ -1346,13 +1656,19 @@ class AsyncPocketOptionClient:
         order: Order,
         timeout: float = 30.0,
     ) -> OrderResult:
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if request_id in self._active_orders:
-                return self._active_orders[request_id]
-            if request_id in self._order_results:
-                return self._order_results[request_id]
-            await asyncio.sleep(0.2)
+        if request_id in self._active_orders:
+            return self._active_orders[request_id]
+        if request_id in self._order_results:
+            return self._order_results[request_id]
+
+        entry = self._order_confirmations.get(request_id)
+        future = entry[0] if entry else self._register_order_confirmation(request_id)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._discard_order_confirmation(request_id)
 
         if request_id in self._active_orders:
             return self._active_orders[request_id]
@@ -1366,52 +1682,140 @@ class AsyncPocketOptionClient:
             direction=order.direction,
             duration=order.duration,
             status=OrderStatus.ACTIVE,
-            placed_at=datetime.now(),
-            expires_at=datetime.now() + timedelta(seconds=order.duration),
+            placed_at=datetime.now(timezone.utc),
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=order.duration),
             error_message="Timeout waiting for server confirmation",
         )
         self._active_orders[request_id] = fallback_result
         return fallback_result
 
+    def _register_order_confirmation(self, request_id: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._order_confirmations[request_id] = (future, time.perf_counter_ns())
+        return future
+
+    def _discard_order_confirmation(self, request_id: str) -> None:
+        entry = self._order_confirmations.pop(request_id, None)
+        if entry and not entry[0].done():
+            entry[0].cancel()
+
+    def _resolve_order_confirmation(self, request_id: str, result: OrderResult) -> None:
+        entry = self._order_confirmations.pop(request_id, None)
+        if entry is None:
+            return
+        future, sent_at = entry
+        if not future.done():
+            self._latency.record("order_ack", time.perf_counter_ns() - sent_at)
+            future.set_result(result)
+
+    def _fail_order_confirmations(self, error: BaseException) -> None:
+        pending, self._order_confirmations = self._order_confirmations, {}
+        for future, _ in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
     async def check_win(
         self,
         order_id: str,
         max_wait_time: float = 300.0,
     ) -> Optional[Dict[str, Any]]:
-        start_time = time.time()
-
-        while time.time() - start_time < max_wait_time:
-            if order_id in self._order_results:
-                result = self._order_results[order_id]
-                return {
-                    "result": (
-                        "win"
-                        if result.status == OrderStatus.WIN
-                        else "loss"
-                        if result.status == OrderStatus.LOSE
-                        else "draw"
-                    ),
-                    "profit": result.profit if result.profit is not None else 0,
-                    "order_id": order_id,
-                    "completed": True,
-                    "status": result.status.value,
-                }
-
-            if order_id in self._active_orders:
-                active_order = self._active_orders[order_id]
-                time_remaining = (active_order.expires_at - datetime.now()).total_seconds()
-                if time_remaining <= 0:
-                    logger.debug(f"Order {order_id} expired but result has not arrived yet")
-
-            await asyncio.sleep(1.0)
+        try:
+            result = await self.wait_for_result(order_id, timeout=max_wait_time)
+        except ConnectionError as exc:
+            logger.debug(f"Stopped waiting for order {order_id}: {exc}")
+            result = None
+
+        if result is None:
+            return {
+                "result": "timeout",
+                "order_id": order_id,
+                "completed": False,
+                "timeout": True,
+            }
 
         return {
-            "result": "timeout",
+            "result": (
+                "win"
+                if result.status == OrderStatus.WIN
+                else "loss"
+                if result.status == OrderStatus.LOSE
+                else "draw"
+            ),
+            "profit": result.profit if result.profit is not None else 0,
             "order_id": order_id,
-            "completed": False,
-            "timeout": True,
+            "completed": True,
+            "status": result.status.value,
         }
 
+    async def wait_for_result(self, order_id: str, timeout: Optional[float] = None) -> Optional[OrderResult]:
+        """Aguarda o fechamento da ordem (successcloseOrder); retorna None se o timeout expirar."""
+        order_id = str(order_id)
+        future = self._settlement_future(order_id)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._release_settlement_future(order_id, future)
+
+    async def wait_for_results(
+        self,
+        order_ids: Iterable[str],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Optional[OrderResult]]:
+        """Aguarda várias ordens; as que não fecharem dentro do timeout ficam como None."""
+        results: Dict[str, Optional[OrderResult]] = {str(order_id): None for order_id in order_ids}
+        async for result in self.iter_results(list(results), timeout=timeout):
+            results[result.order_id] = result
+        return results
+
+    async def iter_results(
+        self,
+        order_ids: Iterable[str],
+        timeout: Optional[float] = None,
+    ) -> AsyncGenerator[OrderResult, None]:
+        """Entrega os resultados na ordem em que as ordens fecham; encerra ao esgotar o timeout total."""
+        pending = {self._settlement_future(order_id): order_id for order_id in dict.fromkeys(map(str, order_ids))}
+        try:
+            for next_result in asyncio.as_completed(list(pending), timeout=timeout):
+                try:
+                    yield await next_result
+                except asyncio.TimeoutError:
+                    return
+        finally:
+            for future, order_id in pending.items():
+                self._release_settlement_future(order_id, future)
+
+    def _settlement_future(self, order_id: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        result = self._order_results.get(order_id)
+        if result is not None:
+            future.set_result(result)
+        else:
+            self._settlement_waiters.setdefault(order_id, []).append(future)
+        return future
+
+    def _release_settlement_future(self, order_id: str, future: asyncio.Future) -> None:
+        waiters = self._settlement_waiters.get(order_id)
+        if waiters and future in waiters:
+            waiters.remove(future)
+            if not waiters:
+                del self._settlement_waiters[order_id]
+        if not future.done():
+            future.cancel()
+
+    def _resolve_settlement(self, order_id: str, result: OrderResult) -> None:
+        for future in self._settlement_waiters.pop(order_id, ()):
+            if not future.done():
+                future.set_result(result)
+
+    def _fail_settlement_waiters(self, error: BaseException) -> None:
+        pending, self._settlement_waiters = self._settlement_waiters, {}
+        for waiters in pending.values():
+            for future in waiters:
+                if not future.done():
+                    future.set_exception(error)
+
     # -------------------------------------------------------------------------
     # Helpers - candle request / parsing
     # -------------------------------------------------------------------------
@@ -1422,30 +1826,39 @@ class AsyncPocketOptionClient:
         timeframe: int,
         count: int,
         end_time: datetime,
+        paged: bool = False,
     ) -> List[Candle]:
-        _ = end_time  # preservado para compatibilidade futura
+        if paged:
+            pages = [page async for page in self.iter_candle_pages(asset, timeframe, count, end_time)]
+            return [candle for page in reversed(pages) for candle in page]
 
         message_data = ["changeSymbol", {"asset": str(asset), "period": timeframe}]
-        message = f"42{json.dumps(message_data)}"
+        message = f"42{codec.dumps(message_data)}"
 
-        if self.enable_logging:
-            logger.debug(f"Requesting candles with changeSymbol: {message}")
-
-        candle_future = asyncio.Future()
         request_id = self._make_candle_cache_key(asset, timeframe)
-
-        if not hasattr(self, "_candle_requests"):
-            self._candle_requests: Dict[str, asyncio.Future] = {}
-
-        self._candle_requests[request_id] = candle_future
-
-        if self._is_persistent and self._keep_alive_manager:
-            await self._keep_alive_manager.send_message(message)
-        else:
-            await self._websocket.send_message(message)
+        # Chamadas concorrentes para o mesmo ativo/período compartilham um único changeSymbol
+        candle_future, is_leader = self._history_requests.join(asset, timeframe)
+        started = time.perf_counter_ns()
 
         try:
+            if is_leader:
+                if self.enable_logging:
+                    logger.debug(f"Requesting candles with changeSymbol: {message}")
+                try:
+                    if self._is_persistent and self._keep_alive_manager:
+                        await self._keep_alive_manager.send_message(message)
+                    elif self._pool_active():
+                        # O histórico vem pelo mesmo socket que já acompanha (ou passará a acompanhar) o ativo
+                        await self._websocket.connection_pool.subscribe(request_id, message)
+                    else:
+                        await self._websocket.send_message(message)
+                except Exception as exc:
+                    self._history_requests.leave(asset, timeframe, candle_future)
+                    self._history_requests.fail(asset, timeframe, exc)
+                    raise
+
             candles = await asyncio.wait_for(candle_future, timeout=10.0)
+            self._latency.record("candles", time.perf_counter_ns() - started)
             if count and isinstance(candles, list) and len(candles) > count:
                 return candles[-count:]
             return candles
@@ -1453,13 +1866,70 @@ class AsyncPocketOptionClient:
             logger.warning(f"Candle request timed out for {asset}")
             return []
         finally:
-            if request_id in getattr(self, "_candle_requests", {}):
-                del self._candle_requests[request_id]
+            self._history_requests.leave(asset, timeframe, candle_future)
+
+    async def _request_history_page(self, asset: str, period: int, end_ts: int, span: int) -> List[Candle]:
+        """Pede ao broker os candles com início em [end_ts - span, end_ts) via loadHistoryPeriod."""
+        timeout = HISTORY_SETTINGS["page_timeout"]
+        attempts = 1 + max(0, int(HISTORY_SETTINGS["page_retries"]))
+        for attempt in range(attempts):
+            index = self._history_requests.next_index(end_ts)
+            page_future, _ = self._history_requests.join(asset, period, index)
+            payload = {"asset": asset, "index": index, "time": int(end_ts), "offset": int(span), "period": period}
+            started = time.perf_counter_ns()
+            try:
+                if not await self.send_message(f'42{codec.dumps(["loadHistoryPeriod", payload])}'):
+                    raise ConnectionError("Failed to send history page request")
+                candles = await asyncio.wait_for(page_future, timeout=timeout)
+                self._latency.record("history_page", time.perf_counter_ns() - started)
+                return candles
+            except asyncio.TimeoutError:
+                logger.warning(f"History page for {asset} ending at {end_ts} timed out (attempt {attempt + 1}/{attempts})")
+            finally:
+                self._history_requests.leave(asset, period, page_future, index)
+        raise TimeoutError(f"History page for {asset} ending at {end_ts} not received after {attempts} attempts")
+
+    def _resolve_history_response(self, data: Dict[str, Any]) -> bool:
+        """Entrega um payload de histórico só aos pedidos do mesmo ativo/período (e índice, se houver)."""
+        asset = data.get("asset")
+        period = data.get("period")
+        if not asset or not period:
+            return False
+
+        asset = self._normalize_asset_name_for_payout(asset)
+        period = int(period)
+        index = data.get("index")
+        if index is not None and self._history_requests.is_pending(asset, period, index):
+            key_index = int(index)
+        elif self._history_requests.is_pending(asset, period):
+            key_index = None
+        else:
+            return False
+
+        raw_candles = data.get("candles")
+        if not isinstance(raw_candles, list):
+            raw_candles = data.get("data") or []
+        candles = self._parse_candles_data(raw_candles, asset, period)
+        self._history_requests.resolve(asset, period, candles, key_index)
+        if self.enable_logging:
+            logger.success(f"Candles data received: {len(candles)} candles for {asset}")
+        return True
 
     async def _send_change_symbol(self, asset: str, timeframe: int) -> None:
-        message = f'42["changeSymbol",{{"asset":"{asset}","period":{timeframe}}}]'
+        message = f'42["changeSymbol",{codec.dumps({"asset": asset, "period": timeframe})}]'
+        if self._pool_active():
+            key = self._make_candle_cache_key(asset, timeframe)
+            try:
+                await self._websocket.connection_pool.subscribe(key, message)
+                self._connection_stats["messages_sent"] += 1
+            except Exception as exc:
+                logger.error(f"Failed to send message: {exc}")
+            return
         await self.send_message(message)
 
+    def _pool_active(self) -> bool:
+        return not self._is_persistent and self._websocket.connection_pool.size > 1
+
     def _parse_candles_data(
         self,
         candles_data: List[Any],
@@ -1580,17 +2050,13 @@ class AsyncPocketOptionClient:
             self._update_server_time(data.get("timestamp"))
 
         if "candles" in data and isinstance(data["candles"], list):
-            asset = data.get("asset")
-            period = data.get("period")
-            if asset and period and hasattr(self, "_candle_requests"):
-                request_id = self._make_candle_cache_key(str(asset), int(period))
-                if request_id in self._candle_requests and not self._candle_requests[request_id].done():
-                    candles = self._parse_candles_data(data["candles"], str(asset), int(period))
-                    self._candle_requests[request_id].set_result(candles)
-                    if self.enable_logging:
-                        logger.success(f"Candles data received: {len(candles)} candles for {asset}")
-                    del self._candle_requests[request_id]
-                    return
+            if self._resolve_history_response(data):
+                return
+
+        # Eventos fora da tabela de rotas só alimentam as extrações acima; nunca alteram ordens
+        event_name = data.get("_event")
+        if event_name is not None and event_name not in self._websocket.event_routes:
+            return
 
         if "requestId" in data and "asset" in data and "amount" in data:
             request_id = str(data["requestId"])
@@ -1602,12 +2068,13 @@ class AsyncPocketOptionClient:
                     direction=OrderDirection.CALL if data.get("command", 0) == 0 else OrderDirection.PUT,
                     duration=int(data.get("time", 60)),
                     status=OrderStatus.ACTIVE,
-                    placed_at=datetime.now(),
-                    expires_at=datetime.now() + timedelta(seconds=int(data.get("time", 60))),
+                    placed_at=datetime.now(timezone.utc),
+                    expires_at=datetime.now(timezone.utc) + timedelta(seconds=int(data.get("time", 60))),
                     profit=float(data.get("profit", 0)) if "profit" in data else None,
                     payout=float(data.get("payout", 0) or 0) if "payout" in data else None,
                 )
                 self._active_orders[request_id] = order_result
+                self._resolve_order_confirmation(request_id, order_result)
                 await self._emit_event("order_opened", data)
 
         elif "deals" in data and isinstance(data["deals"], list):
@@ -1642,22 +2109,25 @@ class AsyncPocketOptionClient:
                 )
                 self._order_results[order_id] = result
                 del self._active_orders[order_id]
+                # Atraso entre a expiração prevista e a chegada do resultado
+                lag = (datetime.now(timezone.utc) - active_order.expires_at).total_seconds()
+                self._latency.record("settlement_lag", int(max(lag, 0.0) * 1e9))
+                self._resolve_settlement(order_id, result)
                 await self._emit_event("order_closed", result)
 
     async def _on_raw_message(self, data: Dict[str, Any]) -> None:
-        preview = str((data or {}).get("preview") or (data or {}).get("message") or "")
-        if any(marker in preview.lower() for marker in ["assets", "payout", "profit", "otc", "news", "limit"]):
-            logger.debug(f"[RAW MESSAGE] {preview[:500]}")
+        if self._raw_history_enabled:
+            preview = str((data or {}).get("preview") or (data or {}).get("message") or "")
+            if any(marker in preview.lower() for marker in ["assets", "payout", "profit", "otc", "news", "limit"]):
+                logger.debug(f"[RAW MESSAGE] {preview[:500]}")
 
-        self._raw_events_history.append(
-            {
-                "type": "raw_message",
-                "data": data,
-                "received_at": datetime.now(timezone.utc).isoformat(),
-            }
-        )
-        if len(self._raw_events_history) > 1000:
-            self._raw_events_history = self._raw_events_history[-1000:]
+            self._raw_events_history.append(
+                {
+                    "type": "raw_message",
+                    "data": data,
+                    "received_at": (data or {}).get("received_at"),
+                }
+            )
 
         await self._emit_event("raw_message_received", data)
 
@@ -1673,9 +2143,7 @@ class AsyncPocketOptionClient:
 
         self._capture_raw_section("unknown_events", self._last_unknown_events[-100:])
 
-        payload = data.get("data") if isinstance(data, dict) else data
-        self._extract_broker_state_sections(payload)
-
+        # As extrações de estado/payout do payload já rodaram no json_data emitido antes pelo roteador
         await self._emit_event("unknown_event", data)
 
     async def _emit_event(self, event: str, data: Any) -> None:
@@ -1689,21 +2157,13 @@ class AsyncPocketOptionClient:
                 f for f in self._pending_event_futures[event] if not f.done()
             ]
 
-        if event in self._event_callbacks:
-            for callback in list(self._event_callbacks[event]):
-                try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(data)
-                    else:
-                        callback(data)
-                except Exception as exc:
-                    if self.enable_logging:
-                        logger.error(f"Error in event callback for {event}: {exc}")
+        await self._event_callbacks.emit(event, data)
 
     async def _on_authenticated(self, data: Dict[str, Any]) -> None:
         if self.enable_logging:
             logger.success("Successfully authenticated with PocketOption")
         self._connection_stats["successful_connections"] += 1
+        self._mark_ready("authenticated")
         await self._emit_event("authenticated", data)
 
     async def _on_balance_updated(self, data: Dict[str, Any]) -> None:
@@ -1716,10 +2176,12 @@ class AsyncPocketOptionClient:
             self._balance = balance
             self._account_config["currency"] = balance.currency
             self._account_config["is_demo"] = balance.is_demo
+            self._mark_ready("balance")
             await self._emit_event("balance_updated", balance)
         except Exception as exc:
             if self.enable_logging:
                 logger.error(f"Failed to parse balance data: {exc}")
+            self._fail_ready("balance", exc)
 
     async def _on_balance_data(self, data: Dict[str, Any]) -> None:
         await self._on_balance_updated(data)
@@ -1738,8 +2200,10 @@ class AsyncPocketOptionClient:
         if isinstance(data, dict) and data.get("_placeholder") is True:
             return
 
-        self._extract_payouts_from_any_payload(data)
-        self._extract_broker_state_sections(data)
+        # Payloads dict já passaram pelas extrações em _on_json_data (o roteador emite json_data antes,
+        # e o pool repassa o json_data dos sockets secundários)
+        if not isinstance(data, dict):
+            self._extract_payouts_from_any_payload(data)
 
         if "asset" in data and "period" in data and ("candles" in data or "data" in data):
             await self._handle_candles_stream(data)
@@ -1747,26 +2211,13 @@ class AsyncPocketOptionClient:
         await self._emit_event("stream_update", data)
 
     async def _on_candles_received(self, data: Dict[str, Any]) -> None:
-        if hasattr(self, "_candle_requests") and self._candle_requests:
+        # O mesmo frame já pode ter sido entregue via json_data; aí não há mais pedido pendente
+        if isinstance(data, dict) and len(self._history_requests):
             try:
-                for request_id, future in list(self._candle_requests.items()):
-                    if future.done():
-                        continue
-                    parts = request_id.split("_")
-                    if len(parts) < 2:
-                        continue
-                    asset = "_".join(parts[:-1])
-                    timeframe = int(parts[-1])
-                    candles = self._parse_candles_data(data.get("candles", []), asset, timeframe)
-                    future.set_result(candles)
-                    break
+                self._resolve_history_response(data)
             except Exception as exc:
                 if self.enable_logging:
                     logger.error(f"Error processing candles data: {exc}")
-                for _, future in list(self._candle_requests.items()):
-                    if not future.done():
-                        future.set_result([])
-                        break
 
         await self._emit_event("candles_received", data)
 
@@ -1784,8 +2235,6 @@ class AsyncPocketOptionClient:
         try:
             asset = self._normalize_asset_name_for_payout(data.get("asset"))
             period = int(data.get("period"))
-            request_id = self._make_candle_cache_key(asset, period)
-
             candles = self._parse_stream_candles(data, asset, period)
             if not candles:
                 return
@@ -1798,11 +2247,8 @@ class AsyncPocketOptionClient:
             latest = merged[-1]
             self._latest_candles[cache_key] = latest
 
-            if hasattr(self, "_candle_requests") and request_id in self._candle_requests:
-                future = self._candle_requests[request_id]
-                if not future.done():
-                    future.set_result(merged)
-                del self._candle_requests[request_id]
+            if self._history_requests.is_pending(asset, period):
+                self._history_requests.resolve(asset, period, merged)
 
             payload = {
                 "event": "candle_update",
@@ -1826,30 +2272,18 @@ class AsyncPocketOptionClient:
                 logger.error(f"Error handling candles stream: {exc}")
 
     async def _on_keep_alive_connected(self, data: Any = None) -> None:
+        # Os dados iniciais são pedidos por _start_persistent_connection depois do successauth
         logger.info("Keep-alive connection established")
-        await self._initialize_data()
         await self._emit_event("connected", data or {"persistent": True})
 
     async def _on_keep_alive_reconnected(self, data: Any = None) -> None:
         logger.info("Keep-alive connection re-established")
-        await self._initialize_data()
+        await self._initialize_data(wait=False)
         await self._restore_realtime_subscriptions()
         await self._emit_event("reconnected", data or {"persistent": True})
 
     async def _on_keep_alive_message(self, message: Any) -> None:
-        raw_message = message.get("message") if isinstance(message, dict) else message
-        if not isinstance(raw_message, str):
-            return
-
-        if raw_message.startswith("42"):
-            try:
-                data_str = raw_message[2:]
-                data = json.loads(data_str)
-                if isinstance(data, list) and len(data) >= 2:
-                    await self._handle_json_message(data)
-            except Exception as exc:
-                logger.error(f"Error processing keep-alive message: {exc}")
-
+        # O frame já foi decodificado e roteado pelo keep-alive; aqui só é repassado aos consumidores
         await self._emit_event("message_received", message)
 
     async def _attempt_reconnection(self, max_attempts: int = 3) -> bool:
@@ -1885,35 +2319,6 @@ class AsyncPocketOptionClient:
         logger.error(f"All {max_attempts} reconnection attempts failed")
         return False
 
-    async def _handle_json_message(self, data: List[Any]) -> None:
-        if not data or len(data) < 1:
-            return
-
-        event_type = data[0]
-        event_data = data[1] if len(data) > 1 else {}
-
-        self._extract_broker_state_sections(event_data)
-        self._extract_payouts_from_any_payload(event_data)
-
-        if event_type == "successauth":
-            await self._emit_event("authenticated", event_data)
-        elif event_type == "successupdateBalance":
-            await self._emit_event("balance_updated", event_data)
-        elif event_type == "successopenOrder":
-            await self._emit_event("order_opened", event_data)
-        elif event_type == "successcloseOrder":
-            await self._emit_event("order_closed", event_data)
-        elif event_type == "updateStream":
-            await self._emit_event("stream_update", event_data)
-        elif event_type == "loadHistoryPeriod":
-            await self._emit_event("candles_received", event_data)
-        elif event_type == "updateHistoryNew":
-            await self._emit_event("history_update", event_data)
-        elif event_type in {"assets", "assets_received"}:
-            await self._on_assets_event(event_data)
-        else:
-            await self._emit_event("unknown_event", {"type": event_type, "data": event_data})
-
     # -------------------------------------------------------------------------
     # Asset / payout normalization
     # -------------------------------------------------------------------------
@@ -2210,6 +2615,7 @@ class AsyncPocketOptionClient:
         self._capture_raw_section("assets_event", data)
         self._extract_broker_state_sections(data)
         self._extract_payouts_from_any_payload(data)
+        self._mark_ready("assets")
         await self._emit_event("assets_received", dict(self._asset_status_cache))
 
     async def _on_payout_update(self, data: Dict[str, Any]) -> None:
@@ -2244,6 +2650,7 @@ class AsyncPocketOptionClient:
                 },
             )
 
+            self._mark_ready("assets")
             await self._emit_event("assets_received", dict(self._asset_status_cache))
 
         except Exception as exc:
@@ -2304,6 +2711,7 @@ class AsyncPocketOptionClient:
                 local_timestamp=local_ts,
                 offset=server_ts - local_ts,
             )
+            self._mark_ready("time_synced")
         except Exception:
             pass
 
@@ -2312,17 +2720,27 @@ class AsyncPocketOptionClient:
     # -------------------------------------------------------------------------
 
     async def _wait_for_event(self, event_name: str, timeout: float = 10.0) -> Any:
-        loop = asyncio.get_running_loop()
-        future = loop.create_future()
+        return await self._await_event(event_name, self._expect_event(event_name), timeout)
+
+    def _expect_event(self, event_name: str) -> asyncio.Future:
+        """Registra o future antes do envio do pedido: a resposta pode chegar durante o próprio send."""
+        future = asyncio.get_running_loop().create_future()
         self._pending_event_futures[event_name].append(future)
+        return future
 
+    async def _await_event(self, event_name: str, future: asyncio.Future, timeout: float) -> Any:
         try:
             return await asyncio.wait_for(future, timeout=timeout)
         finally:
-            if event_name in self._pending_event_futures:
-                self._pending_event_futures[event_name] = [
-                    f for f in self._pending_event_futures[event_name] if f is not future
-                ]
+            self._discard_event_future(event_name, future)
+
+    def _discard_event_future(self, event_name: str, future: asyncio.Future) -> None:
+        if not future.done():
+            future.cancel()
+        if event_name in self._pending_event_futures:
+            self._pending_event_futures[event_name] = [
+                f for f in self._pending_event_futures[event_name] if f is not future
+            ]
 
     def _normalize_timeframe(self, timeframe: Union[str, int]) -> int:
         if isinstance(timeframe, int):
@@ -0,0 +1,150 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, com camada de serialização JSON plugável para o parsing de payloads do broker.
+
+Descrição:
+Módulo responsável pela codificação e decodificação JSON de toda a biblioteca. Seleciona automaticamente o backend mais rápido disponível (orjson, msgspec ou json da biblioteca padrão) e oferece uma interface única para todos os pontos de parse e serialização, incluindo decodificação direta de frames binários (bytes, bytearray, memoryview) sem conversão intermediária para str.
+
+O que ele faz:
+- Detecta orjson e msgspec quando instalados
+- Faz fallback transparente para o json da biblioteca padrão
+- Decodifica str, bytes, bytearray e memoryview diretamente
+- Serializa objetos em JSON compacto (str ou bytes)
+- Permite forçar o backend via variável de ambiente ou em tempo de execução
+
+Características:
+- Interface única: codec.loads / codec.dumps / codec.dumps_bytes
+- Backend configurável por POCKETOPTION_JSON_BACKEND (orjson, msgspec, json)
+- Fallback para stdlib quando o backend rápido não suporta um objeto
+- Exceção unificada de decodificação (codec.DecodeError)
+
+Requisitos:
+- Python 3.10+
+- json
+- orjson (opcional)
+- msgspec (opcional)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable, Dict, Tuple, Type
+
+try:
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+try:
+    import msgspec  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - dependência opcional
+    msgspec = None
+
+BytesLike = (bytes, bytearray, memoryview)
+
+# -----------------------------------------------------------------------------
+# Implementações por backend
+# -----------------------------------------------------------------------------
+
+
+def _stdlib_loads(data: Any) -> Any:
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def _stdlib_dumps_bytes(obj: Any) -> bytes:
+    return _stdlib_dumps(obj).encode("utf-8")
+
+
+def _orjson_dumps_bytes(obj: Any) -> bytes:
+    try:
+        return orjson.dumps(obj)
+    except TypeError:
+        return _stdlib_dumps_bytes(obj)
+
+
+def _orjson_dumps(obj: Any) -> str:
+    return _orjson_dumps_bytes(obj).decode("utf-8")
+
+
+def _msgspec_loads(data: Any) -> Any:
+    return _msgspec_decoder.decode(data)
+
+
+def _msgspec_dumps_bytes(obj: Any) -> bytes:
+    try:
+        return _msgspec_encoder.encode(obj)
+    except TypeError:
+        return _stdlib_dumps_bytes(obj)
+
+
+def _msgspec_dumps(obj: Any) -> str:
+    return _msgspec_dumps_bytes(obj).decode("utf-8")
+
+
+_BACKENDS: Dict[str, Tuple[Callable[[Any], Any], Callable[[Any], str], Callable[[Any], bytes]]] = {
+    "json": (_stdlib_loads, _stdlib_dumps, _stdlib_dumps_bytes),
+}
+
+_decode_errors: Tuple[Type[BaseException], ...] = (ValueError,)
+
+if orjson is not None:
+    _BACKENDS["orjson"] = (orjson.loads, _orjson_dumps, _orjson_dumps_bytes)
+    _decode_errors += (orjson.JSONDecodeError,)
+
+if msgspec is not None:
+    _msgspec_decoder = msgspec.json.Decoder()
+    _msgspec_encoder = msgspec.json.Encoder()
+    _BACKENDS["msgspec"] = (_msgspec_loads, _msgspec_dumps, _msgspec_dumps_bytes)
+    _decode_errors += (msgspec.DecodeError,)
+
+# Exceções levantadas por loads em qualquer backend
+DecodeError: Tuple[Type[BaseException], ...] = _decode_errors
+
+# -----------------------------------------------------------------------------
+# Seleção de backend
+# -----------------------------------------------------------------------------
+
+BACKEND: str = "json"
+loads: Callable[[Any], Any] = _stdlib_loads
+dumps: Callable[[Any], str] = _stdlib_dumps
+dumps_bytes: Callable[[Any], bytes] = _stdlib_dumps_bytes
+
+
+def available_backends() -> Tuple[str, ...]:
+    """Retorna os backends JSON disponíveis neste ambiente."""
+    return tuple(_BACKENDS.keys())
+
+
+def use_backend(name: str) -> str:
+    """Troca o backend ativo (orjson, msgspec ou json) e retorna o nome efetivo."""
+    global BACKEND, loads, dumps, dumps_bytes
+
+    name = str(name or "").strip().lower()
+    if name not in _BACKENDS:
+        raise ValueError(
+            f"JSON backend '{name}' is not available (available: {', '.join(_BACKENDS)})"
+        )
+
+    BACKEND = name
+    loads, dumps, dumps_bytes = _BACKENDS[name]
+    return BACKEND
+
+
+def _select_default_backend() -> str:
+    forced = os.getenv("POCKETOPTION_JSON_BACKEND", "").strip().lower()
+    if forced in _BACKENDS:
+        return forced
+    for candidate in ("orjson", "msgspec", "json"):
+        if candidate in _BACKENDS:
+            return candidate
+    return "json"
+
+
+use_backend(_select_default_backend())
@@ -10,15 +10,20 @@ O que ele faz:
 - Executa handshake Socket.IO e autenticação inicial com SSID
 - Mantém a sessão viva com envio periódico de ping
 - Monitora recebimento de mensagens e estado do WebSocket
+- Decodifica cada frame uma única vez pelo roteador compartilhado com o cliente regular (payouts [[5,...]] e binários 451- incluídos)
 - Detecta quedas de conexão e tenta reconectar automaticamente
 - Emite eventos de conexão, reconexão, autenticação e recebimento de mensagens
 - Coleta estatísticas operacionais da sessão
+- Grava opcionalmente o tráfego no mesmo arquivo de captura do cliente regular
+- Envia pelo mesmo escritor de saída do cliente regular (faixas de prioridade, limites de taxa e coalescência)
 - Fornece fluxo de desligamento limpo com cancelamento das tarefas em segundo plano
 
 Características:
 - Arquitetura assíncrona baseada em asyncio
 - Keep-alive contínuo com ping manual
-- Reconexão automática com rotação entre endpoints
+- Reconexão automática com rotação entre endpoints, ordenados pelo placar de latência por região
+- Contexto TLS reutilizado com retomada de sessão nas reconexões
+- Modo de compressão permessage-deflate configurável com estatísticas por conexão
 - Monitoramento de saúde da conexão
 - Interface baseada em eventos
 - Compatibilidade com padrões da API antiga
@@ -33,24 +38,51 @@ Requisitos:
 - Módulos internos do projeto:
   - models
   - constants
+  - events
+  - frames
+  - outbound
+  - recorder
+  - router
+  - scoreboard
+  - transport
 """
 
 import asyncio
-from typing import Optional, List, Callable, Dict, Any
+import time
+from typing import Optional, List, Callable, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from loguru import logger
 from websockets.exceptions import ConnectionClosed
-from websockets.legacy.client import connect, WebSocketClientProtocol
-
-from models import ConnectionInfo, ConnectionStatus
-from constants import REGIONS
+from websockets.legacy.client import WebSocketClientProtocol
+
+from .models import ConnectionInfo, ConnectionStatus
+from .constants import CONNECTION_SETTINGS, REGIONS
+from .events import ErrorCallback, EventBus
+from .frames import FRAME_OPEN, FRAME_PING, Frame
+from .outbound import HEARTBEAT_MESSAGE, OutboundWriter
+from .recorder import TrafficRecorder, create_traffic_recorder
+from .router import EventRoute, FrameRouter
+from .scoreboard import region_scoreboard
+from .transport import (
+    create_client_ssl_context,
+    meter_compression,
+    open_websocket,
+    remember_tls_session,
+    validate_compression_mode,
+)
 
 class ConnectionKeepAlive:
     """
     Gerenciador avançado de conexão keep-alive baseado em padrões da API antiga
     """
 
-    def __init__(self, ssid: str, is_demo: bool = True):
+    def __init__(
+        self,
+        ssid: str,
+        is_demo: bool = True,
+        route_table: Optional[Dict[str, EventRoute]] = None,
+        recorder: Optional[TrafficRecorder] = None,
+    ):
         self.ssid = ssid
         self.is_demo = is_demo
 
@@ -73,7 +105,23 @@ class ConnectionKeepAlive:
         self.current_reconnect_attempts = 0
 
         # Manipuladores de eventos
-        self._event_handlers: Dict[str, List[Callable]] = {}
+        self._event_handlers = EventBus(
+            error_template="Erro: Erro no manipulador de eventos para {event}: {error}"
+        )
+
+        # Mesmo pipeline de decodificação/roteamento do cliente regular
+        self._router = FrameRouter(
+            emit=self._emit_event,
+            control=self._on_control_frame,
+            on_authenticated=self._on_router_authenticated,
+            route_table=route_table,
+        )
+
+        # Escritor único de saída: ordens não esperam atrás de rajadas de assinaturas
+        self._writer = OutboundWriter(
+            flush_interval=CONNECTION_SETTINGS["send_flush_interval"],
+            rate_limits=CONNECTION_SETTINGS["send_rate_limits"],
+        )
 
         # Pool de conexões com múltiplas regiões
         self.available_urls = (
@@ -81,6 +129,13 @@ class ConnectionKeepAlive:
         )
         self.current_url_index = 0
 
+        # Contexto TLS único: reconexões reapresentam a sessão do host
+        self._ssl_context = create_client_ssl_context()
+        self.compression_mode = validate_compression_mode(CONNECTION_SETTINGS["compression"])
+        # Gravador de tráfego (compartilhado com o cliente quando fornecido)
+        self.recorder = recorder or create_traffic_recorder()
+        self._compression_stats = None
+
         # Estatísticas
         self.connection_stats = {
             "total_connections": 0,
@@ -90,6 +145,7 @@ class ConnectionKeepAlive:
             "last_pong_time": None,
             "total_messages_sent": 0,
             "total_messages_received": 0,
+            "last_connect_phases": {},
         }
 
         logger.info(
@@ -142,11 +198,15 @@ class ConnectionKeepAlive:
                     pass
 
         # Fechar conexão
+        await self._writer.stop(ConnectionError("Conexão persistente parada"))
         if self.websocket:
             await self.websocket.close()
             self.websocket = None
 
         self.is_connected = False
+        await region_scoreboard.flush()
+        if self.recorder is not None:
+            await self.recorder.flush()
         logger.info("Sucesso: Conexão persistente parada")
 
     async def _establish_connection(self) -> bool:
@@ -155,35 +215,34 @@ class ConnectionKeepAlive:
         """
         for attempt in range(len(self.available_urls)):
             url = self.available_urls[self.current_url_index]
+            started = time.perf_counter()
+            phases: Dict[str, float] = {}
+            self.connection_stats["last_connect_phases"] = phases
 
             try:
                 logger.info(
                     f"Conectando: Tentando conexão com {url} (tentativa {attempt + 1})"
                 )
 
-                # Contexto SSL (como na API antiga)
-                import ssl
-
-                ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-                ssl_context.check_hostname = False
-                ssl_context.verify_mode = ssl.CERT_NONE
-
-                # Conectar com cabeçalhos (como na API antiga)
-                self.websocket = await asyncio.wait_for(
-                    connect(
-                        url,
-                        ssl=ssl_context,
-                        extra_headers={
-                            "Origin": "https://pocketoption.com",
-                            "Cache-Control": "no-cache",
-                            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                        },
-                        ping_interval=None,  # Gerenciamos pings manualmente
-                        ping_timeout=None,
-                        close_timeout=10,
-                    ),
-                    timeout=15.0,
+                # Conectar com cabeçalhos (como na API antiga), reaproveitando o contexto TLS
+                self.websocket = await open_websocket(
+                    url,
+                    self._ssl_context,
+                    phases,
+                    15.0,
+                    compression=self.compression_mode,
+                    recorder=self.recorder,
+                    extra_headers={
+                        "Origin": "https://pocketoption.com",
+                        "Cache-Control": "no-cache",
+                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+                    },
+                    ping_interval=None,  # Gerenciamos pings manualmente
+                    ping_timeout=None,
+                    close_timeout=10,
                 )
+                self._compression_stats = meter_compression(self.websocket, self.compression_mode)
+                self._router.reset()
 
                 # Atualizar informações de conexão
                 region = self._extract_region_from_url(url)
@@ -201,7 +260,12 @@ class ConnectionKeepAlive:
                 self.connection_stats["successful_connections"] += 1
 
                 # Enviar handshake inicial (como na API antiga)
+                handshake_started = time.perf_counter()
                 await self._send_handshake()
+                phases["eio"] = time.perf_counter() - handshake_started
+                remember_tls_session(self.websocket, self._ssl_context)
+                region_scoreboard.record_connect(url, handshake=time.perf_counter() - started)
+                self._writer.start(self.websocket)
 
                 logger.success(f"Sucesso: Conectado à região {region} com sucesso")
                 await self._emit_event("connected", {"url": url, "region": region})
@@ -210,6 +274,8 @@ class ConnectionKeepAlive:
 
             except Exception as e:
                 logger.warning(f"Atenção: Falha ao conectar a {url}: {e}")
+                region_scoreboard.record_failure(url)
+                await self._writer.stop(ConnectionError(f"Falha ao conectar a {url}"))
 
                 # Tentar próxima URL
                 self.current_url_index = (self.current_url_index + 1) % len(
@@ -285,11 +351,12 @@ class ConnectionKeepAlive:
             try:
                 if self.is_connected and self.websocket:
                     # Enviar mensagem de ping (formato exato da API antiga)
-                    await self.websocket.send('42["ps"]')
+                    await self._send(HEARTBEAT_MESSAGE)
                     self.connection_stats["last_ping_time"] = datetime.now()
                     self.connection_stats["total_messages_sent"] += 1
 
                     logger.debug("Ping: Ping enviado")
+                    await self._measure_ping_rtt()
 
                 await asyncio.sleep(self.ping_interval)
 
@@ -302,6 +369,23 @@ class ConnectionKeepAlive:
                 self.is_connected = False
                 break
 
+    async def _measure_ping_rtt(self):
+        """Mede o RTT com um ping de controle do WebSocket e alimenta o placar de regiões"""
+        if not self.websocket or not self.connection_info:
+            return
+
+        try:
+            started = time.perf_counter()
+            pong_waiter = await self.websocket.ping()
+            await asyncio.wait_for(pong_waiter, timeout=10.0)
+            region_scoreboard.record_ping(
+                self.connection_info.url, time.perf_counter() - started
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Ping: Falha ao medir RTT: {e}")
+
     async def _message_loop(self):
         """
         Loop contínuo de recebimento de mensagens (como o websocket_listener da API antiga)
@@ -391,7 +475,8 @@ class ConnectionKeepAlive:
                             f"Persistente: Tentativa de reconexão {self.current_reconnect_attempts}/{self.max_reconnect_attempts}"
                         )
 
-                        # Limpar conexão atual
+                        # Limpar conexão atual (envios pendentes falham em vez de ir para o socket morto)
+                        await self._writer.stop(ConnectionError("Conexão perdida, reconectando"))
                         if self.websocket:
                             try:
                                 await self.websocket.close()
@@ -432,39 +517,50 @@ class ConnectionKeepAlive:
                 logger.error(f"Erro: Erro no monitor de reconexão: {e}")
 
     async def _process_message(self, message):
-        """Processar mensagens recebidas (como o on_message da API antiga)"""
+        """Processar mensagens recebidas pelo mesmo roteador do cliente regular"""
         try:
-            # Converter bytes para string se necessário
-            if isinstance(message, bytes):
-                message = message.decode("utf-8")
-
-            logger.debug(f"Mensagem: Recebida: {message[:100]}...")
-
-            # Tratar ping-pong (como na API antiga)
+            # Tratar ping-pong (como na API antiga), sem passar pelo roteador
             if message == "2":
-                if self.websocket:
-                    await self.websocket.send("3")
-                    self.connection_stats["last_pong_time"] = datetime.now()
-                    logger.debug("Ping: Pong enviado")
+                await self._send_pong()
                 return
 
-            # Tratar sucesso de autenticação (como na API antiga)
-            if "successauth" in message:
-                logger.success("Sucesso: Autenticação bem-sucedida")
-                await self._emit_event("authenticated", {})
-                return
+            if isinstance(message, str) and self._event_handlers.has_handlers("message_received"):
+                await self._emit_event("message_received", {"message": message})
 
-            # Tratar outros tipos de mensagens
-            await self._emit_event("message_received", {"message": message})
+            # Pareamento de anexos 451-, decodificação única e eventos normalizados
+            await self._router.process(message)
 
         except Exception as e:
             logger.error(f"Erro: Erro ao processar mensagem: {e}")
 
+    async def _on_control_frame(self, frame: Frame):
+        """Frames de controle Engine.IO/Socket.IO recebidos após o handshake"""
+        if frame.kind == FRAME_PING:
+            await self._send_pong()
+        elif frame.kind == FRAME_OPEN and self.websocket:
+            await self._send("40")
+
+    async def _send_pong(self):
+        if self.websocket:
+            await self._send("3")
+            self.connection_stats["last_pong_time"] = datetime.now()
+            logger.debug("Ping: Pong enviado")
+
+    def _on_router_authenticated(self):
+        logger.success("Sucesso: Autenticação bem-sucedida")
+
+    async def _send(self, message: str):
+        """Enviar pelo escritor de saída (ou direto no socket antes de ele iniciar)"""
+        if self._writer.running:
+            await self._writer.send(message)
+        else:
+            await self.websocket.send(message)
+
     async def send_message(self, message: str) -> bool:
         """Enviar mensagem com verificação de conexão"""
         try:
             if self.is_connected and self.websocket:
-                await self.websocket.send(message)
+                await self._send(message)
                 self.connection_stats["total_messages_sent"] += 1
                 logger.debug(f"Mensagem: Enviada: {message[:50]}...")
                 return True
@@ -476,23 +572,36 @@ class ConnectionKeepAlive:
             self.is_connected = False
             return False
 
+    def configure_outbound(
+        self,
+        flush_interval: Optional[float] = None,
+        rate_limits: Optional[Dict[str, Tuple[float, Optional[float]]]] = None,
+    ):
+        """Ajustar o prazo de coalescência e os limites de taxa por classe (rate None remove o limite)"""
+        if flush_interval is not None:
+            self._writer.flush_interval = max(0.0, float(flush_interval))
+        for message_class, (rate, burst) in (rate_limits or {}).items():
+            self._writer.set_rate_limit(message_class, rate, burst)
+
+    def get_outbound_stats(self) -> Dict[str, Any]:
+        """Estatísticas do escritor de saída (espera por classe e ordem enqueue-to-wire)"""
+        return self._writer.get_stats()
+
     def add_event_handler(self, event: str, handler: Callable):
         """Adicionar manipulador de eventos"""
-        if event not in self._event_handlers:
-            self._event_handlers[event] = []
-        self._event_handlers[event].append(handler)
+        self._event_handlers.subscribe(event, handler)
+
+    def remove_event_handler(self, event: str, handler: Callable):
+        """Remover manipulador de eventos"""
+        self._event_handlers.unsubscribe(event, handler)
+
+    def set_handler_error_callback(self, callback: Optional[ErrorCallback]):
+        """Repassar (evento, exceção) de cada manipulador que falhar"""
+        self._event_handlers.on_error = callback
 
     async def _emit_event(self, event: str, data: Any):
         """Emitir evento para manipuladores"""
-        if event in self._event_handlers:
-            for handler in self._event_handlers[event]:
-                try:
-                    if asyncio.iscoroutinefunction(handler):
-                        await handler(data)
-                    else:
-                        handler(data)
-                except Exception as e:
-                    logger.error(f"Erro: Erro no manipulador de eventos para {event}: {e}")
+        await self._event_handlers.emit(event, data)
 
     def _extract_region_from_url(self, url: str) -> str:
         """Extrair nome da região da URL"""
@@ -523,6 +632,12 @@ class ConnectionKeepAlive:
                 else timedelta()
             ),
             "available_regions": len(self.available_urls),
+            "tls": self._ssl_context.session_cache.get_stats(),
+            "compression": self._compression_stats.get_stats()
+            if self._compression_stats
+            else {"mode": self.compression_mode, "negotiated": None},
+            "recorder": self.recorder.get_stats() if self.recorder else None,
+            "outbound": self._writer.get_stats(),
         }
 
     async def connect_with_keep_alive(
@@ -531,8 +646,18 @@ class ConnectionKeepAlive:
         """Estabelecer uma conexão persistente com keep-alive, opcionalmente usando uma lista de regiões."""
         # Opcionalmente atualizar available_urls se regiões forem fornecidas
         if regions:
-            # Assumir que regiões são URLs ou nomes de regiões; adaptar conforme necessário
-            self.available_urls = regions
+            # Nomes de região viram URLs (como no modo regular); URLs explícitas são mantidas
+            urls: List[str] = []
+            for region in regions:
+                url = region if "://" in region else REGIONS.get_region(region)
+                if url and url not in urls:
+                    urls.append(url)
+                elif not url:
+                    logger.warning(f"Atenção: Região desconhecida ignorada: {region}")
+            if not urls:
+                logger.error(f"Erro: Nenhuma região válida em {regions}")
+                return False
+            self.available_urls = urls
             self.current_url_index = 0
         return await self.start_persistent_connection()
 
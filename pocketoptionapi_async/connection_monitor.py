@@ -35,19 +35,21 @@ Requisitos:
 - pandas (opcional para exportação avançada)
 - Módulos internos do projeto:
   - client
+  - events
 """
 
 import asyncio
 import time
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable
 from dataclasses import dataclass, asdict
 from collections import deque, defaultdict
 import statistics
 from loguru import logger
 
-from client import AsyncPocketOptionClient
+from .client import AsyncPocketOptionClient
+from .events import EventBus
 
 @dataclass
 class ConnectionMetrics:
@@ -99,7 +101,9 @@ class ConnectionMonitor:
         self.ping_times: deque = deque(maxlen=100)
 
         # Manipuladores de eventos
-        self.event_handlers: Dict[str, List[Callable]] = defaultdict(list)
+        self.event_handlers = EventBus(
+            error_template="Erro: Erro no manipulador de eventos para {event}: {error}"
+        )
 
         # Rastreamento de desempenho
         self.response_times: deque = deque(maxlen=100)
@@ -395,15 +399,7 @@ class ConnectionMonitor:
 
     async def _emit_event(self, event_type: str, data: Any):
         """Emitir evento para manipuladores registrados"""
-        if event_type in self.event_handlers:
-            for handler in self.event_handlers[event_type]:
-                try:
-                    if asyncio.iscoroutinefunction(handler):
-                        await handler(data)
-                    else:
-                        handler(data)
-                except Exception as e:
-                    logger.error(f"Erro: Erro no manipulador de eventos para {event_type}: {e}")
+        await self.event_handlers.emit(event_type, data)
 
     # Métodos de manipuladores de eventos
     async def _on_connected(self, data):
@@ -441,7 +437,7 @@ class ConnectionMonitor:
 
     def add_event_handler(self, event_type: str, handler: Callable):
         """Adicionar manipulador de eventos para eventos de monitoramento"""
-        self.event_handlers[event_type].append(handler)
+        self.event_handlers.subscribe(event_type, handler)
 
     def get_real_time_stats(self) -> Dict[str, Any]:
         """Obter estatísticas em tempo real atuais"""
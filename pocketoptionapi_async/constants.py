@@ -22,20 +22,25 @@ Características:
 - Compatibilidade com eventos brutos e aliases do broker
 - Catálogo mínimo pronto para fallback e validação
 - Helpers reutilizáveis de normalização sem dependência externa
-- Classe dedicada para gerenciamento de regiões WebSocket
+- Classe dedicada para gerenciamento de regiões WebSocket, ordenadas pelo placar de latência
 - Estrutura extensível para novos ativos, eventos e endpoints
 
 Requisitos:
 - Python 3.10+
 - typing
 - random
+- Módulos internos do projeto:
+  - scoreboard
 """
 
 from __future__ import annotations
 
+import os
 import random
 from typing import Any, Dict, List, Optional
 
+from .scoreboard import region_scoreboard
+
 # -----------------------------------------------------------------------------
 # Headers / connection defaults
 # -----------------------------------------------------------------------------
@@ -60,6 +65,27 @@ CONNECTION_SETTINGS: Dict[str, Any] = {
     "reconnect_delay": 5,
     "handshake_timeout": 10,
     "connect_timeout": 10,
+    "auth_timeout": 10,
+    # permessage-deflate: off | negotiate (aceita se o servidor oferecer) | require (recusa links sem compressão)
+    "compression": "negotiate",
+    # Atraso entre o início de tentativas paralelas de conexão (happy eyeballs)
+    "connect_stagger": 0.25,
+    # Pipeline de entrada: leitora -> fila limitada -> workers de despacho
+    "ingress_queue_size": 2048,
+    "ingress_overflow_policy": "block",  # block | drop_oldest | conflate
+    "ingress_workers": 1,
+    # Escritor único de saída: prazo máximo (s) que heartbeats/assinaturas aguardam para coalescer
+    "send_flush_interval": 0.005,
+    # Limites por classe de saída: classe -> (mensagens/s, rajada). Ordens e controle não são limitados
+    "send_rate_limits": {
+        "subscription": (20, 20),
+        "snapshot": (3, 3),
+    },
+    # Gravação do tráfego WebSocket (arquivo de captura); vazio desativa
+    "capture_path": os.getenv("POCKETOPTION_CAPTURE_PATH") or None,
+    "capture_compress": True,
+    "capture_max_bytes": 64 * 1024 * 1024,
+    "capture_backups": 5,
 }
 
 # -----------------------------------------------------------------------------
@@ -101,6 +127,19 @@ API_LIMITS: Dict[str, Any] = {
     "max_concurrent_orders": 50,
 }
 
+# Backfill paginado de candles (loadHistoryPeriod)
+HISTORY_SETTINGS: Dict[str, Any] = {
+    # Candles por página (a janela pedida é page_size * período)
+    "page_size": 500,
+    # Páginas pedidas em paralelo enquanto as anteriores ainda não chegaram
+    "max_in_flight": 4,
+    "page_timeout": 10.0,
+    "page_retries": 1,
+    # Lacuna sem candles (s) que encerra o backfill como início do histórico disponível;
+    # maior que fins de semana e feriados dos ativos que não são OTC
+    "max_gap": 7 * 24 * 3600,
+}
+
 # -----------------------------------------------------------------------------
 # Catálogo base mínimo compatível
 # Observação:
@@ -453,22 +492,28 @@ class Regions:
         return cls._REGIONS.get(str(name).upper())
 
     @classmethod
-    def get_all(cls, randomize: bool = True) -> List[str]:
+    def get_all(cls, randomize: bool = True, ordered: bool = True) -> List[str]:
         urls = list(cls._REGIONS.values())
         if randomize:
             random.shuffle(urls)
-        return urls
+        return cls._order_by_latency(urls) if ordered else urls
 
     @classmethod
-    def get_demo_regions(cls) -> List[str]:
-        return [v for k, v in cls._REGIONS.items() if "DEMO" in k.upper()]
+    def get_demo_regions(cls, ordered: bool = True) -> List[str]:
+        urls = [v for k, v in cls._REGIONS.items() if "DEMO" in k.upper()]
+        return cls._order_by_latency(urls) if ordered else urls
 
     @classmethod
-    def get_live_regions(cls, randomize: bool = True) -> List[str]:
+    def get_live_regions(cls, randomize: bool = True, ordered: bool = True) -> List[str]:
         urls = [v for k, v in cls._REGIONS.items() if "DEMO" not in k.upper()]
         if randomize:
             random.shuffle(urls)
-        return urls
+        return cls._order_by_latency(urls) if ordered else urls
+
+    @staticmethod
+    def _order_by_latency(urls: List[str]) -> List[str]:
+        # Regiões medidas vêm primeiro, da menor latência esperada; as demais mantêm a ordem (aleatória)
+        return region_scoreboard.order(urls)
 
     @classmethod
     def has_region(cls, name: str) -> bool:
@@ -476,6 +521,15 @@ class Regions:
             return False
         return str(name).upper() in cls._REGIONS
 
+    @classmethod
+    def register_region(cls, name: str, url: str) -> None:
+        """Registra (ou substitui) uma região, ex.: o servidor local de testes."""
+        cls._REGIONS[str(name).upper()] = url
+
+    @classmethod
+    def unregister_region(cls, name: str) -> None:
+        cls._REGIONS.pop(str(name).upper(), None)
+
 REGIONS = Regions()
 
 # -----------------------------------------------------------------------------
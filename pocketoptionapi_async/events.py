@@ -0,0 +1,170 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, com barramento de eventos compartilhado e despacho pré-compilado de handlers.
+
+Descrição:
+Módulo responsável pelo registro e emissão de eventos entre as camadas da biblioteca (transporte, cliente, keep-alive e monitor). Cada handler é classificado como síncrono ou assíncrono uma única vez, no registro, e guardado em uma tupla imutável substituída a cada alteração (copy-on-write). A emissão percorre a tupla diretamente, sem copiar listas nem inspecionar funções a cada frame.
+
+O que ele faz:
+- Registra e remove handlers por nome de evento
+- Classifica cada handler (sync/async) no momento do registro
+- Emite eventos sem cópia de lista nem iscoroutinefunction por emissão
+- Executa handlers assíncronos independentes em paralelo quando solicitado
+- Isola falhas: um handler com erro não interrompe os demais
+- Repassa as falhas a um callback opcional (on_error) para que o dono do barramento reaja a elas
+
+Características:
+- Tuplas copy-on-write: registrar/remover durante uma emissão é seguro
+- Modo sequencial (padrão) preserva a ordem de execução dos handlers
+- Modo concorrente via asyncio.gather para handlers assíncronos
+- Suporte a handlers síncronos que retornam awaitables
+- Mensagem de erro configurável por componente
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- loguru
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from loguru import logger
+
+EventHandler = Callable[[Any], Union[None, Awaitable[None]]]
+ErrorCallback = Callable[[str, BaseException], None]
+
+# (handler, é_assíncrono)
+_Entry = Tuple[EventHandler, bool]
+
+
+def is_async_handler(handler: Any) -> bool:
+    """Detecta funções async, partials de funções async e objetos com __call__ assíncrono."""
+    target = handler
+    while isinstance(target, functools.partial):
+        target = target.func
+
+    if inspect.iscoroutinefunction(target):
+        return True
+
+    call = getattr(target, "__call__", None)
+    return call is not None and inspect.iscoroutinefunction(call)
+
+
+class EventBus:
+    """Barramento de eventos com handlers pré-classificados em tuplas copy-on-write."""
+
+    __slots__ = ("_handlers", "concurrent", "log_errors", "on_error", "_error_template")
+
+    def __init__(
+        self,
+        concurrent: bool = False,
+        error_template: str = "Error in event handler for {event}: {error}",
+        log_errors: bool = True,
+        on_error: Optional[ErrorCallback] = None,
+    ):
+        self._handlers: Dict[str, Tuple[_Entry, ...]] = {}
+        self.concurrent = concurrent
+        self.log_errors = log_errors
+        # Chamado com (evento, exceção) a cada handler que falha, além do log
+        self.on_error = on_error
+        self._error_template = error_template
+
+    # -------------------------------------------------------------------------
+    # Registro
+    # -------------------------------------------------------------------------
+
+    def subscribe(self, event: str, handler: EventHandler) -> None:
+        entry = (handler, is_async_handler(handler))
+        self._handlers[event] = self._handlers.get(event, ()) + (entry,)
+
+    def unsubscribe(self, event: str, handler: EventHandler) -> bool:
+        entries = self._handlers.get(event)
+        if not entries:
+            return False
+
+        for index, (registered, _) in enumerate(entries):
+            if registered == handler:
+                remaining = entries[:index] + entries[index + 1:]
+                if remaining:
+                    self._handlers[event] = remaining
+                else:
+                    del self._handlers[event]
+                return True
+        return False
+
+    def clear(self, event: Optional[str] = None) -> None:
+        if event is None:
+            self._handlers = {}
+        else:
+            self._handlers.pop(event, None)
+
+    def has_handlers(self, event: str) -> bool:
+        return event in self._handlers
+
+    def handlers(self, event: str) -> Tuple[EventHandler, ...]:
+        return tuple(handler for handler, _ in self._handlers.get(event, ()))
+
+    def events(self) -> Tuple[str, ...]:
+        return tuple(self._handlers.keys())
+
+    # -------------------------------------------------------------------------
+    # Emissão
+    # -------------------------------------------------------------------------
+
+    async def emit(self, event: str, data: Any, concurrent: Optional[bool] = None) -> None:
+        entries = self._handlers.get(event)
+        if not entries:
+            return
+
+        if concurrent is None:
+            concurrent = self.concurrent
+
+        if concurrent and len(entries) > 1:
+            await self._emit_concurrent(event, entries, data)
+            return
+
+        for handler, is_async in entries:
+            try:
+                if is_async:
+                    await handler(data)
+                else:
+                    result = handler(data)
+                    if result is not None and inspect.isawaitable(result):
+                        await result
+            except Exception as exc:
+                self._handle_error(event, exc)
+
+    async def _emit_concurrent(self, event: str, entries: Tuple[_Entry, ...], data: Any) -> None:
+        pending = []
+        for handler, is_async in entries:
+            try:
+                if is_async:
+                    pending.append(handler(data))
+                else:
+                    result = handler(data)
+                    if result is not None and inspect.isawaitable(result):
+                        pending.append(result)
+            except Exception as exc:
+                self._handle_error(event, exc)
+
+        if not pending:
+            return
+
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self._handle_error(event, result)
+
+    def _handle_error(self, event: str, exc: BaseException) -> None:
+        if self.log_errors:
+            logger.error(self._error_template.format(event=event, error=exc))
+        if self.on_error is not None:
+            try:
+                self.on_error(event, exc)
+            except Exception as callback_exc:
+                logger.error(f"Error in event error callback for {event}: {callback_exc}")
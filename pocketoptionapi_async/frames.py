@@ -0,0 +1,336 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, com decodificação de frames Engine.IO/Socket.IO em passagem única para o caminho quente de recepção.
+
+Descrição:
+Módulo responsável pela classificação e decodificação dos frames recebidos do broker. Cada frame é inspecionado uma única vez pelo seu tipo de pacote Engine.IO/Socket.IO e encaminhado, via tabela de prefixos pré-compilada, para um decodificador dedicado. O payload JSON é decodificado no máximo uma vez por frame, evitando cadeias de startswith, varreduras de substring e parses repetidos.
+
+O que ele faz:
+- Classifica frames Engine.IO (open, close, ping, pong, message)
+- Classifica pacotes Socket.IO (connect, disconnect, event, ack, error, binary event)
+- Reconhece JSON bruto fora do envelope Socket.IO, incluindo lotes de payout [[5, ...]]
+- Decodifica o payload JSON de cada frame uma única vez
+- Decodifica frames binários direto de bytes/memoryview, sem conversão para str
+- Remonta eventos binários Socket.IO (451-) com seus anexos, substituindo os placeholders
+- Expõe o resultado como um objeto Frame leve com tipo, nome do evento e dados
+
+Características:
+- Dispatch O(1) por prefixo via dicionários pré-compilados
+- Decodificadores sem dependência de estado de conexão (funções puras)
+- Remontagem de anexos isolada em um objeto leve por conexão (AttachmentAssembler)
+- Reutilizável por qualquer transporte da biblioteca
+- Falhas de parse viram frames "unknown" em vez de exceções
+
+Requisitos:
+- Python 3.10+
+- Módulos internos do projeto:
+  - codec
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional
+
+from . import codec
+
+# -----------------------------------------------------------------------------
+# Tipos de frame
+# -----------------------------------------------------------------------------
+
+FRAME_OPEN = "open"
+FRAME_CLOSE = "close"
+FRAME_PING = "ping"
+FRAME_PONG = "pong"
+FRAME_CONNECT = "connect"
+FRAME_DISCONNECT = "disconnect"
+FRAME_EVENT = "event"
+FRAME_ACK = "ack"
+FRAME_ERROR = "error"
+FRAME_BINARY_EVENT = "binary_event"
+FRAME_JSON = "json"
+FRAME_PAYOUT_BATCH = "payout_batch"
+FRAME_UNKNOWN = "unknown"
+
+
+class Frame:
+    """Frame classificado e decodificado (payload decodificado no máximo uma vez)."""
+
+    __slots__ = ("kind", "data", "event", "raw", "attachments")
+
+    def __init__(
+        self,
+        kind: str,
+        data: Any = None,
+        event: Optional[str] = None,
+        raw: Optional[str] = None,
+        attachments: int = 0,
+    ):
+        self.kind = kind
+        self.data = data
+        self.event = event
+        self.raw = raw
+        self.attachments = attachments
+
+    def __repr__(self) -> str:
+        return f"Frame(kind={self.kind!r}, event={self.event!r})"
+
+
+# -----------------------------------------------------------------------------
+# Decodificadores por tipo de pacote
+# -----------------------------------------------------------------------------
+
+
+def _decode_event_payload(kind: str, text: str, payload: str) -> Frame:
+    try:
+        data = codec.loads(payload)
+    except codec.DecodeError:
+        return Frame(FRAME_UNKNOWN, raw=text)
+
+    if isinstance(data, list) and data and isinstance(data[0], str):
+        return Frame(kind, data=data, event=data[0], raw=text)
+
+    return Frame(FRAME_JSON, data=data, raw=text)
+
+
+def _decode_open(text: str) -> Frame:
+    if "sid" not in text:
+        return Frame(FRAME_UNKNOWN, raw=text)
+    return Frame(FRAME_OPEN, raw=text)
+
+
+def _decode_close(text: str) -> Frame:
+    return Frame(FRAME_CLOSE, raw=text)
+
+
+def _decode_ping(text: str) -> Frame:
+    if len(text) != 1:
+        return Frame(FRAME_UNKNOWN, raw=text)
+    return Frame(FRAME_PING, raw=text)
+
+
+def _decode_pong(text: str) -> Frame:
+    return Frame(FRAME_PONG, raw=text)
+
+
+def _decode_sio_connect(text: str) -> Frame:
+    return Frame(FRAME_CONNECT, raw=text)
+
+
+def _decode_sio_disconnect(text: str) -> Frame:
+    return Frame(FRAME_DISCONNECT, raw=text)
+
+
+def _decode_sio_event(text: str) -> Frame:
+    return _decode_event_payload(FRAME_EVENT, text, text[2:])
+
+
+def _decode_sio_ack(text: str) -> Frame:
+    start = text.find("[", 2)
+    data = None
+    if start != -1:
+        try:
+            data = codec.loads(text[start:])
+        except codec.DecodeError:
+            data = None
+    return Frame(FRAME_ACK, data=data, raw=text)
+
+
+def _decode_sio_error(text: str) -> Frame:
+    payload = text[2:]
+    if not payload:
+        return Frame(FRAME_ERROR, raw=text)
+    try:
+        data = codec.loads(payload)
+    except codec.DecodeError:
+        data = payload
+    return Frame(FRAME_ERROR, data=data, raw=text)
+
+
+def _decode_sio_binary_event(text: str) -> Frame:
+    # Formato: 45<n>-["evento", {"_placeholder": true, "num": 0}], seguido de n frames binários
+    separator = text.find("-", 2)
+    if separator == -1:
+        return Frame(FRAME_UNKNOWN, raw=text)
+
+    count = text[2:separator]
+    if not count.isdigit():
+        return Frame(FRAME_UNKNOWN, raw=text)
+
+    frame = _decode_event_payload(FRAME_BINARY_EVENT, text, text[separator + 1:])
+    if frame.kind == FRAME_BINARY_EVENT:
+        frame.attachments = int(count)
+    return frame
+
+
+_SOCKETIO_DECODERS: Dict[str, Callable[[str], Frame]] = {
+    "0": _decode_sio_connect,
+    "1": _decode_sio_disconnect,
+    "2": _decode_sio_event,
+    "3": _decode_sio_ack,
+    "4": _decode_sio_error,
+    "5": _decode_sio_binary_event,
+    "6": _decode_sio_ack,
+}
+
+
+def _decode_message(text: str) -> Frame:
+    decoder = _SOCKETIO_DECODERS.get(text[1:2])
+    if decoder is None:
+        return Frame(FRAME_UNKNOWN, raw=text)
+    return decoder(text)
+
+
+def _decode_json_array(text: str) -> Frame:
+    try:
+        data = codec.loads(text)
+    except codec.DecodeError:
+        return Frame(FRAME_UNKNOWN, raw=text)
+
+    # Lotes de payout chegam como [[5, [...]], [5, [...]], ...]
+    if text.startswith("[[5,"):
+        return Frame(FRAME_PAYOUT_BATCH, data=data, raw=text)
+
+    if data and isinstance(data[0], str):
+        return Frame(FRAME_EVENT, data=data, event=data[0], raw=text)
+
+    return Frame(FRAME_JSON, data=data, raw=text)
+
+
+def _decode_json_object(text: str) -> Frame:
+    try:
+        data = codec.loads(text)
+    except codec.DecodeError:
+        return Frame(FRAME_UNKNOWN, raw=text)
+    return Frame(FRAME_JSON, data=data, raw=text)
+
+
+_PREFIX_DECODERS: Dict[str, Callable[[str], Frame]] = {
+    "0": _decode_open,
+    "1": _decode_close,
+    "2": _decode_ping,
+    "3": _decode_pong,
+    "4": _decode_message,
+    "[": _decode_json_array,
+    "{": _decode_json_object,
+}
+
+
+# -----------------------------------------------------------------------------
+# API pública
+# -----------------------------------------------------------------------------
+
+
+def decode_frame(text: str) -> Frame:
+    """Classifica um frame textual pelo tipo de pacote e decodifica seu payload uma vez."""
+    if not text:
+        return Frame(FRAME_UNKNOWN, raw=text)
+
+    decoder = _PREFIX_DECODERS.get(text[0])
+    if decoder is None:
+        return Frame(FRAME_UNKNOWN, raw=text)
+    return decoder(text)
+
+
+def decode_binary_frame(data: Any) -> Frame:
+    """Decodifica um frame binário (bytes, bytearray ou memoryview) direto, sem passar por str."""
+    try:
+        value = codec.loads(data)
+    except codec.DecodeError:
+        return Frame(FRAME_UNKNOWN)
+
+    if isinstance(value, list) and value:
+        first = value[0]
+        if isinstance(first, str):
+            return Frame(FRAME_EVENT, data=value, event=first)
+        if isinstance(first, list) and len(first) >= 2 and first[0] == 5:
+            return Frame(FRAME_PAYOUT_BATCH, data=value)
+
+    return Frame(FRAME_JSON, data=value)
+
+
+# -----------------------------------------------------------------------------
+# Remontagem de anexos binários (451-)
+# -----------------------------------------------------------------------------
+
+
+def decode_attachment(data: Any) -> Any:
+    """Decodifica um anexo binário direto dos bytes; se não for JSON, devolve os bytes crus."""
+    try:
+        return codec.loads(data)
+    except codec.DecodeError:
+        return bytes(data)
+
+
+def _fill_placeholders(value: Any, attachments: List[Any]) -> Any:
+    if isinstance(value, dict):
+        if value.get("_placeholder") is True:
+            num = value.get("num")
+            if isinstance(num, int) and 0 <= num < len(attachments):
+                return attachments[num]
+            return value
+        return {key: _fill_placeholders(item, attachments) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [_fill_placeholders(item, attachments) for item in value]
+
+    return value
+
+
+class AttachmentAssembler:
+    """
+    Pareia o cabeçalho de um evento binário Socket.IO com os frames binários seguintes.
+
+    Um objeto por conexão: o protocolo garante que os anexos chegam logo após o
+    cabeçalho, então basta guardar um único evento pendente.
+    """
+
+    __slots__ = ("_header", "_attachments", "dropped")
+
+    def __init__(self) -> None:
+        self._header: Optional[Frame] = None
+        self._attachments: List[Any] = []
+        self.dropped = 0
+
+    @property
+    def pending(self) -> bool:
+        return self._header is not None
+
+    def begin(self, frame: Frame) -> Optional[Frame]:
+        """Registra um cabeçalho 45N-; retorna o frame pronto se não houver anexos a esperar."""
+        if self._header is not None:
+            # Cabeçalho novo antes de completar o anterior: o evento incompleto é descartado
+            self.dropped += 1
+        self._attachments = []
+
+        if frame.attachments <= 0:
+            self._header = None
+            return frame
+
+        self._header = frame
+        return None
+
+    def feed(self, data: Any) -> Optional[Frame]:
+        """Adiciona um anexo binário; retorna o evento remontado quando todos chegarem."""
+        header = self._header
+        if header is None:
+            return None
+
+        self._attachments.append(decode_attachment(data))
+        if len(self._attachments) < header.attachments:
+            return None
+
+        attachments = self._attachments
+        self._header = None
+        self._attachments = []
+        return Frame(
+            FRAME_EVENT,
+            data=_fill_placeholders(header.data, attachments),
+            event=header.event,
+            raw=header.raw,
+        )
+
+    def reset(self) -> None:
+        if self._header is not None:
+            self.dropped += 1
+        self._header = None
+        self._attachments = []
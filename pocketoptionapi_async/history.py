@@ -0,0 +1,213 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, com correlação de respostas de histórico de candles para pedidos concorrentes e backfill paginado.
+
+Descrição:
+Módulo responsável por casar as respostas de histórico (loadHistoryPeriod / updateHistoryNew) com os pedidos em voo. O broker responde de forma multiplexada no mesmo socket, então cada resposta é associada pelo ativo, período e, quando presente, pelo índice do pedido, nunca pela ordem de chegada. Pedidos idênticos feitos enquanto um já está em voo entram como ouvintes do mesmo pedido (single-flight): só o primeiro envia a mensagem e todos recebem a mesma resposta.
+
+O backfill (CandleHistoryPager) percorre o histórico de trás para frente a partir de end_time em janelas de tempo fixas, mantendo várias páginas em voo ao mesmo tempo. As páginas são entregues em ordem (da mais recente para a mais antiga) assim que chegam, sem acumular o histórico inteiro em memória.
+
+O que ele faz:
+- Registra pedidos de histórico por (ativo, período, índice)
+- Coalesce chamadores concorrentes do mesmo pedido em uma única mensagem ao broker
+- Entrega cada resposta apenas aos ouvintes do ativo/período/índice correspondentes
+- Permite que um ouvinte desista (timeout/cancelamento) sem afetar os demais
+- Falha todos os pedidos pendentes na desconexão
+- Mantém contadores de pedidos enviados, coalescidos e resolvidos
+- Gera índices únicos para pedidos loadHistoryPeriod
+- Pagina o histórico em janelas de page_size candles com até max_in_flight páginas em voo
+- Remove sobreposições entre páginas e pede de novo o trecho que faltou quando o broker corta uma página
+- Atravessa fins de semana e feriados sem dados; encerra só quando a sequência de janelas vazias cobre mais de max_gap segundos (início do histórico disponível)
+
+Características:
+- Um future por ouvinte: timeout ou cancelamento de um chamador não cancela os outros
+- Custo O(1) por resposta (lookup em dict)
+- Memória do backfill limitada a max_in_flight páginas, independente do total pedido
+- Sem dependências externas
+
+Requisitos:
+- Python 3.10+
+- asyncio
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from .models import Candle
+
+HistoryKey = Tuple[str, int, Optional[int]]
+# fetch(end_ts, span_seconds) -> candles com início em [end_ts - span_seconds, end_ts)
+PageFetcher = Callable[[int, int], Awaitable[List[Candle]]]
+
+
+class CandleRequestRegistry:
+    """Pedidos de histórico em voo, correlacionados por ativo, período e índice."""
+
+    def __init__(self) -> None:
+        self._waiters: Dict[HistoryKey, List[asyncio.Future]] = {}
+        self._sequence = itertools.count()
+        self.stats: Dict[str, int] = {
+            "sent": 0,
+            "coalesced": 0,
+            "resolved": 0,
+        }
+
+    @staticmethod
+    def make_key(asset: str, period: int, index: Optional[int] = None) -> HistoryKey:
+        return (str(asset), int(period), None if index is None else int(index))
+
+    def next_index(self, end_ts: int) -> int:
+        """Índice de correlação no formato do broker (timestamp seguido de dois dígitos)."""
+        return int(end_ts) * 100 + next(self._sequence) % 100
+
+    def join(self, asset: str, period: int, index: Optional[int] = None) -> Tuple[asyncio.Future, bool]:
+        """
+        Entra no pedido em voo para a chave.
+
+        Devolve o future do chamador e True se ele é o primeiro (e portanto quem
+        deve enviar a mensagem ao broker); os demais apenas aguardam a resposta.
+        """
+        key = self.make_key(asset, period, index)
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.get(key)
+        if waiters:
+            waiters.append(future)
+            self.stats["coalesced"] += 1
+            return future, False
+        self._waiters[key] = [future]
+        self.stats["sent"] += 1
+        return future, True
+
+    def leave(self, asset: str, period: int, future: asyncio.Future, index: Optional[int] = None) -> None:
+        key = self.make_key(asset, period, index)
+        waiters = self._waiters.get(key)
+        if waiters is None:
+            return
+        remaining = [f for f in waiters if f is not future]
+        if remaining:
+            self._waiters[key] = remaining
+        else:
+            del self._waiters[key]
+
+    def is_pending(self, asset: str, period: int, index: Optional[int] = None) -> bool:
+        return self.make_key(asset, period, index) in self._waiters
+
+    def resolve(self, asset: str, period: int, value: Any, index: Optional[int] = None) -> int:
+        """Entrega a resposta aos ouvintes da chave; devolve quantos foram atendidos."""
+        waiters = self._waiters.pop(self.make_key(asset, period, index), None)
+        if not waiters:
+            return 0
+        delivered = 0
+        for future in waiters:
+            if not future.done():
+                future.set_result(value)
+                delivered += 1
+        self.stats["resolved"] += 1
+        return delivered
+
+    def fail(self, asset: str, period: int, error: BaseException, index: Optional[int] = None) -> None:
+        for future in self._waiters.pop(self.make_key(asset, period, index), None) or []:
+            if not future.done():
+                future.set_exception(error)
+
+    def fail_all(self, error: BaseException) -> None:
+        pending, self._waiters = self._waiters, {}
+        for waiters in pending.values():
+            for future in waiters:
+                if not future.done():
+                    future.set_exception(error)
+
+    def __len__(self) -> int:
+        return len(self._waiters)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "in_flight": len(self._waiters)}
+
+
+class CandleHistoryPager:
+    """Backfill de candles de end_ts para trás, em janelas de tempo com várias páginas em voo."""
+
+    def __init__(
+        self,
+        fetch: PageFetcher,
+        period: int,
+        count: int,
+        end_ts: float,
+        page_size: int = 500,
+        max_in_flight: int = 4,
+        max_gap: float = 7 * 24 * 3600,
+    ):
+        self.fetch = fetch
+        self.period = max(1, int(period))
+        self.count = max(0, int(count))
+        self.page_size = max(1, int(page_size))
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.max_gap = max(float(self.period), float(max_gap))
+        # Limite exclusivo alinhado ao período: inclui o candle que contém end_ts
+        self.end_ts = int(end_ts) // self.period * self.period + self.period
+
+        self.stats: Dict[str, int] = {
+            "pages": 0,
+            "refills": 0,
+            "empty_pages": 0,
+            "candles": 0,
+            "discarded": 0,
+        }
+
+    async def pages(self) -> AsyncIterator[List[Candle]]:
+        """Páginas da mais recente para a mais antiga; cada página em ordem crescente de horário."""
+        span = self.page_size * self.period
+        next_end = self.end_ts
+        boundary = self.end_ts
+        remaining = self.count
+        # (início da janela, fim da janela, é reenvio de trecho cortado, tarefa)
+        in_flight: Deque[Tuple[int, int, bool, asyncio.Task]] = deque()
+
+        try:
+            while remaining > 0:
+                while len(in_flight) < self.max_in_flight and len(in_flight) * self.page_size < remaining:
+                    start = next_end - span
+                    in_flight.append((start, next_end, False, asyncio.ensure_future(self.fetch(next_end, span))))
+                    next_end = start
+
+                start, end, is_refill, task = in_flight.popleft()
+                candles = await task
+                self.stats["pages"] += 1
+
+                upper = min(end, boundary)
+                fresh = [c for c in candles if start <= c.timestamp.timestamp() < upper]
+                self.stats["discarded"] += len(candles) - len(fresh)
+
+                if not fresh:
+                    if not is_refill:
+                        self.stats["empty_pages"] += 1
+                        # Lacuna medida do candle mais antigo já entregue até o início desta janela vazia
+                        if boundary - start > self.max_gap:
+                            break
+                    continue
+
+                fresh.sort(key=lambda c: c.timestamp)
+                oldest = int(fresh[0].timestamp.timestamp())
+                if len(fresh) > remaining:
+                    fresh = fresh[-remaining:]
+                elif oldest - start >= self.period and len(fresh) < remaining:
+                    # Página cortada pelo broker (ou lacuna de mercado): pede o trecho que faltou antes das próximas
+                    self.stats["refills"] += 1
+                    in_flight.appendleft(
+                        (start, oldest, True, asyncio.ensure_future(self.fetch(oldest, oldest - start)))
+                    )
+
+                boundary = int(fresh[0].timestamp.timestamp())
+                remaining -= len(fresh)
+                self.stats["candles"] += len(fresh)
+                yield fresh
+        finally:
+            tasks = [entry[3] for entry in in_flight]
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,201 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, com pipeline de entrada limitado que desacopla a leitura do socket da execução dos handlers.
+
+Descrição:
+Módulo responsável pela fila de entrada (ingress) entre a tarefa leitora do WebSocket e os workers de decodificação/despacho. A leitora apenas puxa frames do socket e os enfileira; os workers consomem a fila, decodificam e executam os handlers. Assim, um callback lento não bloqueia o recv() nem atrasa a resposta aos pings do servidor.
+
+O que ele faz:
+- Mantém uma fila limitada de frames brutos ou já remontados
+- Aplica a política de overflow configurada (block, drop_oldest, conflate)
+- Conflaciona frames de alta frequência pela chave (evento + ativo)
+- Mede profundidade da fila, descartes, conflações e idade do frame no despacho
+
+Características:
+- Sem dependências externas (apenas asyncio)
+- Chave de conflação extraída por fatiamento, sem parse JSON na leitora
+- Frames sem chave de conflação nunca são substituídos
+- Métricas prontas para exposição em get_connection_stats()
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- Módulos internos do projeto:
+  - frames
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from .frames import Frame
+
+# -----------------------------------------------------------------------------
+# Políticas de overflow
+# -----------------------------------------------------------------------------
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_CONFLATE = "conflate"
+
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_CONFLATE)
+
+# Eventos em que só o valor mais recente importa (por ativo, quando aplicável)
+CONFLATABLE_EVENTS = frozenset({"updateStream", "successupdateBalance", "updateAssets"})
+
+KeyFunction = Callable[[Any], Optional[str]]
+
+
+def _asset_from_ticks(ticks: Any) -> Optional[str]:
+    if isinstance(ticks, list) and ticks:
+        first = ticks[0]
+        if isinstance(first, list) and first and isinstance(first[0], str):
+            return first[0]
+    return None
+
+
+def default_conflation_key(item: Any) -> Optional[str]:
+    """Chave de conflação barata: nome do evento (+ ativo para updateStream)."""
+    if isinstance(item, Frame):
+        if item.event not in CONFLATABLE_EVENTS:
+            return None
+        data = item.data
+        asset = _asset_from_ticks(data[1]) if isinstance(data, list) and len(data) > 1 else None
+        return f"{item.event}:{asset}" if asset else item.event
+
+    if isinstance(item, str) and item.startswith('42["'):
+        end = item.find('"', 4)
+        if end == -1:
+            return None
+        event = item[4:end]
+        if event not in CONFLATABLE_EVENTS:
+            return None
+        if event == "updateStream" and item.startswith('[["', end + 2):
+            asset_end = item.find('"', end + 5)
+            if asset_end != -1:
+                return f"{event}:{item[end + 5:asset_end]}"
+        return event
+
+    return None
+
+
+# -----------------------------------------------------------------------------
+# Fila de entrada
+# -----------------------------------------------------------------------------
+
+
+class IngressQueue:
+    """Fila limitada entre a leitora do socket e os workers de despacho."""
+
+    def __init__(
+        self,
+        maxsize: int = 2048,
+        policy: str = OVERFLOW_BLOCK,
+        key_function: Optional[KeyFunction] = None,
+    ):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Invalid ingress overflow policy '{policy}' (expected one of: {', '.join(OVERFLOW_POLICIES)})"
+            )
+
+        self.maxsize = max(1, int(maxsize))
+        self.policy = policy
+        self._key_function = key_function or default_conflation_key
+
+        # Cada entrada é uma lista mutável [enfileirado_em, item, chave] para permitir conflação in-place
+        self._items: Deque[List[Any]] = deque()
+        self._keyed: Dict[str, List[Any]] = {}
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+        self.enqueued = 0
+        self.dispatched = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.blocked = 0
+        self.max_depth = 0
+        self.last_age = 0.0
+        self.max_age = 0.0
+        self.avg_age = 0.0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def put(self, item: Any) -> None:
+        key = self._key_function(item) if self.policy == OVERFLOW_CONFLATE else None
+
+        if key is not None:
+            entry = self._keyed.get(key)
+            if entry is not None:
+                # Mantém a posição na fila, mas com o payload mais recente
+                entry[1] = item
+                self.conflated += 1
+                return
+
+        if len(self._items) >= self.maxsize:
+            if self.policy == OVERFLOW_DROP_OLDEST:
+                self._discard(self._items.popleft())
+                self.dropped += 1
+            else:
+                # block, ou conflate sem entrada substituível: aplica backpressure na leitora
+                self.blocked += 1
+                while len(self._items) >= self.maxsize:
+                    self._not_full.clear()
+                    await self._not_full.wait()
+
+        entry = [time.monotonic(), item, key]
+        self._items.append(entry)
+        if key is not None:
+            self._keyed[key] = entry
+
+        self.enqueued += 1
+        if len(self._items) > self.max_depth:
+            self.max_depth = len(self._items)
+        self._not_empty.set()
+
+    async def get(self) -> Any:
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        entry = self._items.popleft()
+        self._discard(entry)
+        self._not_full.set()
+
+        age = time.monotonic() - entry[0]
+        self.dispatched += 1
+        self.last_age = age
+        if age > self.max_age:
+            self.max_age = age
+        self.avg_age = age if self.dispatched == 1 else self.avg_age * 0.9 + age * 0.1
+        return entry[1]
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._keyed.clear()
+        self._not_full.set()
+
+    def _discard(self, entry: List[Any]) -> None:
+        key = entry[2]
+        if key is not None and self._keyed.get(key) is entry:
+            del self._keyed[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "maxsize": self.maxsize,
+            "depth": len(self._items),
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "dispatched": self.dispatched,
+            "dropped": self.dropped,
+            "conflated": self.conflated,
+            "blocked": self.blocked,
+            "last_age_ms": round(self.last_age * 1000.0, 3),
+            "avg_age_ms": round(self.avg_age * 1000.0, 3),
+            "max_age_ms": round(self.max_age * 1000.0, 3),
+        }
@@ -0,0 +1,313 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, com histogramas de latência no estilo HDR para medir caudas (p99/p99.9) sem perder picos.
+
+Descrição:
+Módulo responsável pelo registro de latências compartilhado entre as ferramentas de benchmark e a instrumentação do cliente. Os valores são medidos em nanossegundos (time.perf_counter_ns) e guardados em histogramas com buckets logarítmicos (mesmo esquema do HdrHistogram: precisão relativa fixa em qualquer ordem de grandeza), com correção de coordinated omission para cenários de taxa fixa e arquivos JSON que podem ser somados entre execuções, processos ou máquinas.
+
+O que ele faz:
+- Registra latências em histogramas esparsos com 2 ou 3 dígitos significativos
+- Calcula p50/p90/p99/p99.9/máx, média e contagem
+- Corrige coordinated omission (record_corrected) preenchendo as amostras que um stall impediu de medir
+- Agenda operações em taxa fixa (FixedRateSchedule) medindo a partir do início pretendido
+- Agrupa histogramas por nome (LatencyRegistry) com medição via context manager
+- Salva, carrega e soma histogramas em arquivos JSON
+
+Características:
+- Custo de registro constante (operações de bits + dict), sem alocação de listas de amostras
+- Erro relativo máximo de ~0,8% (2 dígitos) ou ~0,1% (3 dígitos) em qualquer faixa de valores
+- Histogramas com a mesma precisão podem ser somados sem perda
+- Sem dependências externas
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- time
+- Módulos internos do projeto:
+  - codec
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from . import codec
+
+HISTOGRAM_FORMAT = "pocketoption-latency/1"
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """Histograma HDR esparso de latências em nanossegundos."""
+
+    def __init__(self, significant_digits: int = 2):
+        if significant_digits not in (1, 2, 3):
+            raise ValueError("significant_digits must be 1, 2 or 3")
+        self.significant_digits = significant_digits
+        largest_single_unit = 2 * 10 ** significant_digits
+        self._sub_bucket_bits = (largest_single_unit - 1).bit_length()
+        self._half_bits = self._sub_bucket_bits - 1
+        self._half_count = 1 << self._half_bits
+        self._sub_bucket_mask = (1 << self._sub_bucket_bits) - 1
+
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.min_value: Optional[int] = None
+        self.max_value = 0
+        self._sum = 0
+
+    # -------------------------------------------------------------------------
+    # Buckets
+    # -------------------------------------------------------------------------
+
+    def _index_for(self, value: int) -> int:
+        bucket = (value | self._sub_bucket_mask).bit_length() - self._sub_bucket_bits
+        sub_bucket = value >> bucket
+        return ((bucket + 1) << self._half_bits) + sub_bucket - self._half_count
+
+    def _value_for(self, index: int) -> int:
+        """Menor valor representado pelo índice."""
+        bucket = (index >> self._half_bits) - 1
+        sub_bucket = (index & (self._half_count - 1)) + self._half_count
+        if bucket < 0:
+            sub_bucket -= self._half_count
+            bucket = 0
+        return sub_bucket << bucket
+
+    def _highest_equivalent(self, index: int) -> int:
+        bucket = max(0, (index >> self._half_bits) - 1)
+        return self._value_for(index) + (1 << bucket) - 1
+
+    # -------------------------------------------------------------------------
+    # Registro
+    # -------------------------------------------------------------------------
+
+    def record(self, value_ns: int, count: int = 1) -> None:
+        value = int(value_ns)
+        if value < 0:
+            value = 0
+        index = self._index_for(value)
+        counts = self.counts
+        counts[index] = counts.get(index, 0) + count
+        self.total_count += count
+        self._sum += value * count
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if value > self.max_value:
+            self.max_value = value
+
+    def record_corrected(self, value_ns: int, expected_interval_ns: int) -> None:
+        """
+        Registra com correção de coordinated omission.
+
+        Em um cenário de taxa fixa, uma operação que demorou N intervalos impediu N-1
+        medições; elas são registradas com as latências que teriam observado.
+        """
+        self.record(value_ns)
+        interval = int(expected_interval_ns)
+        if interval <= 0:
+            return
+        missing = int(value_ns) - interval
+        while missing >= interval:
+            self.record(missing)
+            missing -= interval
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        if other.significant_digits != self.significant_digits:
+            raise ValueError("Cannot merge histograms with different significant_digits")
+        counts = self.counts
+        for index, count in other.counts.items():
+            counts[index] = counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self._sum += other._sum
+        if other.min_value is not None and (self.min_value is None or other.min_value < self.min_value):
+            self.min_value = other.min_value
+        self.max_value = max(self.max_value, other.max_value)
+        return self
+
+    def reset(self) -> None:
+        self.counts.clear()
+        self.total_count = 0
+        self.min_value = None
+        self.max_value = 0
+        self._sum = 0
+
+    # -------------------------------------------------------------------------
+    # Consulta
+    # -------------------------------------------------------------------------
+
+    def percentile(self, percentile: float) -> int:
+        """Valor (ns) no percentil pedido; o maior valor equivalente do bucket, como no HdrHistogram."""
+        if not self.total_count:
+            return 0
+        target = max(1, int(round(self.total_count * min(max(percentile, 0.0), 100.0) / 100.0)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max_value)
+        return self.max_value
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.total_count if self.total_count else 0.0
+
+    def summary(self, unit: str = "ms", percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, float]:
+        scale = {"ns": 1.0, "us": 1e3, "ms": 1e6, "s": 1e9}[unit]
+        result: Dict[str, float] = {"count": self.total_count}
+        for value in percentiles:
+            result[f"p{value:g}"] = self.percentile(value) / scale
+        result["max"] = self.max_value / scale
+        result["min"] = (self.min_value or 0) / scale
+        result["mean"] = self.mean / scale
+        return result
+
+    # -------------------------------------------------------------------------
+    # Serialização
+    # -------------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "significant_digits": self.significant_digits,
+            "total_count": self.total_count,
+            "min": self.min_value,
+            "max": self.max_value,
+            "sum": self._sum,
+            "counts": {str(index): count for index, count in sorted(self.counts.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(int(data.get("significant_digits", 2)))
+        histogram.counts = {int(index): int(count) for index, count in (data.get("counts") or {}).items()}
+        histogram.total_count = int(data.get("total_count", sum(histogram.counts.values())))
+        histogram.min_value = data.get("min")
+        histogram.max_value = int(data.get("max", 0))
+        histogram._sum = int(data.get("sum", 0))
+        return histogram
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(time.perf_counter_ns() - started)
+
+
+class LatencyRegistry:
+    """Conjunto de histogramas nomeados (um por operação)."""
+
+    def __init__(self, significant_digits: int = 2):
+        self.significant_digits = significant_digits
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = LatencyHistogram(self.significant_digits)
+        return histogram
+
+    def record(self, name: str, value_ns: int) -> None:
+        self.histogram(name).record(value_ns)
+
+    def record_corrected(self, name: str, value_ns: int, expected_interval_ns: int) -> None:
+        self.histogram(name).record_corrected(value_ns, expected_interval_ns)
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Mede o bloco (inclusive awaits) e registra só se terminar sem exceção."""
+        started = time.perf_counter_ns()
+        yield
+        self.histogram(name).record(time.perf_counter_ns() - started)
+
+    def names(self) -> List[str]:
+        return sorted(self._histograms)
+
+    def merge(self, other: "LatencyRegistry") -> "LatencyRegistry":
+        for name, histogram in other._histograms.items():
+            self.histogram(name).merge(histogram)
+        return self
+
+    def reset(self) -> None:
+        for histogram in self._histograms.values():
+            histogram.reset()
+
+    def summary(self, unit: str = "ms") -> Dict[str, Dict[str, float]]:
+        return {name: self._histograms[name].summary(unit) for name in self.names() if self._histograms[name].total_count}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": HISTOGRAM_FORMAT,
+            "unit": "ns",
+            "significant_digits": self.significant_digits,
+            "histograms": {name: self._histograms[name].to_dict() for name in self.names()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyRegistry":
+        if data.get("format") != HISTOGRAM_FORMAT:
+            raise ValueError(f"Unsupported latency histogram format: {data.get('format')!r}")
+        registry = cls(int(data.get("significant_digits", 2)))
+        for name, payload in (data.get("histograms") or {}).items():
+            registry._histograms[name] = LatencyHistogram.from_dict(payload)
+        return registry
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(codec.dumps_bytes(self.to_dict()))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "LatencyRegistry":
+        with open(path, "rb") as handle:
+            return cls.from_dict(codec.loads(handle.read()))
+
+
+def merge_histogram_files(paths: Iterable[str]) -> LatencyRegistry:
+    """Soma arquivos de histogramas (de execuções, processos ou máquinas diferentes)."""
+    merged: Optional[LatencyRegistry] = None
+    for path in paths:
+        registry = LatencyRegistry.load(path)
+        merged = registry if merged is None else merged.merge(registry)
+    return merged if merged is not None else LatencyRegistry()
+
+
+class FixedRateSchedule:
+    """
+    Agenda de taxa fixa (open loop) para benchmarks.
+
+    wait() dorme até o próximo horário pretendido e devolve esse horário em ns; a
+    latência deve ser medida a partir dele (since()), e não do início real. Assim um
+    stall que atrasa as operações seguintes aparece nas latências delas, em vez de
+    simplesmente reduzir o número de amostras (coordinated omission).
+    """
+
+    def __init__(self, rate_per_second: float):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        self.interval_ns = int(1e9 / rate_per_second)
+        self._next_ns: Optional[int] = None
+
+    async def wait(self) -> int:
+        now = time.perf_counter_ns()
+        if self._next_ns is None:
+            self._next_ns = now
+        intended = self._next_ns
+        self._next_ns += self.interval_ns
+        delay = intended - now
+        if delay > 0:
+            await asyncio.sleep(delay / 1e9)
+        return intended
+
+    @staticmethod
+    def since(intended_ns: int) -> int:
+        return time.perf_counter_ns() - intended_ns
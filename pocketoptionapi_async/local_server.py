@@ -0,0 +1,468 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, com servidor local compatível para testes de carga e latência sem rede.
+
+Descrição:
+Módulo responsável por um servidor asyncio local que fala o mesmo handshake Engine.IO/Socket.IO esperado pelo cliente (0{sid}, 40, auth, successauth) e serve fluxos roteirizados de saldo, ativos/payouts, candles, ticks e ordens. Latência, jitter, taxa de ticks e tamanho dos payloads são configuráveis, permitindo rodar benchmarks de throughput e latência em um notebook, sem SSID real e sem conexão com o broker.
+
+O que ele faz:
+- Aceita conexões WebSocket e executa o handshake Socket.IO do broker
+- Valida a sessão do auth (opcionalmente contra uma lista) e responde successauth ou NotAuthorized
+- Responde getBalance, assets (getAssets/loadAssets são contados e ignorados), changeSymbol (histórico + ticks) e openOrder
+- Responde loadHistoryPeriod por janela de tempo (time/offset/index), com limite opcional de candles por resposta
+- Fecha ordens após a expiração (com escala de tempo configurável) e atualiza o saldo
+- Envia pings Engine.IO periódicos e publica ticks updateStream por ativo assinado
+- Aplica latência + jitter a cada resposta preservando a ordem dos frames
+- Coleta estatísticas de conexões, mensagens e ordens
+
+Características:
+- ws://127.0.0.1 com porta livre escolhida pelo sistema (port=0)
+- Ticks em texto (42["updateStream",...]) ou binários (451- + anexo), como o broker
+- successauth em texto ou como evento binário 451- + anexo (binary_auth), a forma usada pelo broker real
+- Preenchimento opcional dos payloads para simular mensagens grandes
+- Resultados de ordens determinísticos com seed
+- Histórico paginado determinístico: a mesma janela devolve sempre os mesmos candles
+- Pode ser usado como context manager assíncrono
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- websockets
+- loguru
+- Módulos internos do projeto:
+  - codec
+  - constants
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+from websockets.exceptions import ConnectionClosed
+from websockets.legacy.server import WebSocketServerProtocol, serve
+
+from . import codec
+from .constants import REGIONS
+
+DEFAULT_LOCAL_ASSETS: Dict[str, float] = {
+    "EURUSD_otc": 1.0850,
+    "GBPUSD_otc": 1.2650,
+    "USDJPY_otc": 151.20,
+    "AUDCAD_otc": 0.8950,
+    "BTCUSD": 64000.0,
+    "#AAPL_otc": 190.0,
+}
+
+
+class _LocalSession:
+    """Estado de uma conexão do servidor local (fila ordenada de saída + assinaturas)."""
+
+    def __init__(self, server: "LocalBrokerServer", websocket: WebSocketServerProtocol):
+        self.server = server
+        self.websocket = websocket
+        self.sid = uuid.uuid4().hex[:20]
+        self.authenticated = False
+        self.subscriptions: Set[str] = set()
+        self.tasks: List[asyncio.Task] = []
+        self._queue: "asyncio.Queue[Any]" = asyncio.Queue()
+        self._last_due = 0.0
+
+    def send(self, *messages: Any) -> None:
+        """Enfileira frames respeitando latência + jitter sem reordenar."""
+        loop = asyncio.get_running_loop()
+        delay = self.server.latency
+        if self.server.jitter:
+            delay += self.server.rng.uniform(0.0, self.server.jitter)
+        due = max(self._last_due, loop.time() + delay)
+        self._last_due = due
+        for message in messages:
+            self._queue.put_nowait((due, message))
+
+    async def sender(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            due, message = await self._queue.get()
+            wait = due - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            await self.websocket.send(message)
+            self.server.stats["messages_sent"] += 1
+
+
+class LocalBrokerServer:
+    """Servidor local compatível com o protocolo WebSocket da Pocket Option."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        tick_rate: float = 2.0,
+        binary_ticks: bool = False,
+        binary_auth: bool = False,
+        candle_count: int = 100,
+        history_page_limit: int = 0,
+        payload_padding: int = 0,
+        balance: float = 10_000.0,
+        payout: int = 92,
+        win_rate: float = 0.5,
+        order_time_scale: float = 1.0,
+        ping_interval: float = 25.0,
+        valid_sessions: Optional[Iterable[str]] = None,
+        assets: Optional[Dict[str, float]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = max(0.0, float(latency))
+        self.jitter = max(0.0, float(jitter))
+        self.tick_rate = max(0.0, float(tick_rate))
+        self.binary_ticks = binary_ticks
+        self.binary_auth = binary_auth
+        self.candle_count = max(0, int(candle_count))
+        # Máximo de candles por resposta de loadHistoryPeriod (0 = janela inteira), como o corte do broker
+        self.history_page_limit = max(0, int(history_page_limit))
+        self.payload_padding = max(0, int(payload_padding))
+        self.balance = float(balance)
+        self.payout = int(payout)
+        self.win_rate = min(max(float(win_rate), 0.0), 1.0)
+        self.order_time_scale = max(0.0, float(order_time_scale))
+        self.ping_interval = max(0.05, float(ping_interval))
+        self.valid_sessions = set(valid_sessions) if valid_sessions is not None else None
+        self.prices = dict(assets or DEFAULT_LOCAL_ASSETS)
+        self._base_prices = dict(self.prices)
+        self.rng = random.Random(seed)
+
+        self._server: Any = None
+        self._sessions: Set[_LocalSession] = set()
+        self.stats: Dict[str, Any] = {
+            "connections": 0,
+            "active_connections": 0,
+            "auth_failures": 0,
+            "messages_received": 0,
+            "messages_sent": 0,
+            "ticks_sent": 0,
+            "orders_opened": 0,
+            "orders_closed": 0,
+            "history_pages": 0,
+            "events": {},
+        }
+
+    # -------------------------------------------------------------------------
+    # Ciclo de vida
+    # -------------------------------------------------------------------------
+
+    async def start(self) -> str:
+        self._server = await serve(self._handle_connection, self.host, self.port, compression=None)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Local broker server listening on {self.url}")
+        return self.url
+
+    async def stop(self) -> None:
+        for session in list(self._sessions):
+            for task in session.tasks:
+                task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "LocalBrokerServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/socket.io/?EIO=4&transport=websocket"
+
+    def register_region(self, name: str = "LOCAL_DEMO") -> str:
+        """Registra a URL do servidor em REGIONS para uso com client.connect(regions=[name])."""
+        REGIONS.register_region(name, self.url)
+        return name.upper()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["events"] = dict(self.stats["events"])
+        stats["active_connections"] = len(self._sessions)
+        return stats
+
+    # -------------------------------------------------------------------------
+    # Conexão
+    # -------------------------------------------------------------------------
+
+    async def _handle_connection(self, websocket: WebSocketServerProtocol, path: Optional[str] = None) -> None:
+        session = _LocalSession(self, websocket)
+        self._sessions.add(session)
+        self.stats["connections"] += 1
+        session.tasks.append(asyncio.create_task(session.sender()))
+
+        open_packet = {
+            "sid": session.sid,
+            "upgrades": [],
+            "pingInterval": int(self.ping_interval * 1000),
+            "pingTimeout": 20000,
+        }
+        session.send("0" + codec.dumps(open_packet))
+
+        try:
+            async for message in websocket:
+                self.stats["messages_received"] += 1
+                await self._handle_message(session, message)
+        except ConnectionClosed:
+            pass
+        finally:
+            for task in session.tasks:
+                task.cancel()
+            self._sessions.discard(session)
+
+    async def _handle_message(self, session: _LocalSession, message: Any) -> None:
+        if not isinstance(message, str):
+            return
+        if message == "40":
+            session.send("40" + codec.dumps({"sid": session.sid}))
+            return
+        if message in ("2", "3"):
+            if message == "2":
+                session.send("3")
+            return
+        if not message.startswith("42"):
+            return
+
+        try:
+            data = codec.loads(message[2:])
+        except codec.DecodeError:
+            return
+        if not isinstance(data, list) or not data:
+            return
+
+        event = data[0]
+        payload = data[1] if len(data) > 1 else None
+        events = self.stats["events"]
+        events[event] = events.get(event, 0) + 1
+
+        handler = self._handlers.get(event)
+        if handler is not None:
+            handler(self, session, payload)
+
+    # -------------------------------------------------------------------------
+    # Fluxos roteirizados
+    # -------------------------------------------------------------------------
+
+    def _on_auth(self, session: _LocalSession, payload: Any) -> None:
+        session_id = payload.get("session") if isinstance(payload, dict) else None
+        if self.valid_sessions is not None and session_id not in self.valid_sessions:
+            self.stats["auth_failures"] += 1
+            session.send('42["NotAuthorized",{}]')
+            return
+
+        session.authenticated = True
+        if self.binary_auth:
+            session.send(
+                '451-["successauth",{"_placeholder":true,"num":0}]',
+                codec.dumps_bytes({"id": session.sid}),
+            )
+        else:
+            session.send(self._event("successauth", {"id": session.sid}))
+        session.tasks.append(asyncio.create_task(self._ping_loop(session)))
+        session.tasks.append(asyncio.create_task(self._tick_loop(session)))
+
+    def _on_balance(self, session: _LocalSession, payload: Any) -> None:
+        session.send(self._balance_event())
+
+    def _on_assets(self, session: _LocalSession, payload: Any) -> None:
+        items = [
+            {"id": index, "symbol": asset, "name": asset.replace("_otc", " OTC"), "type": "currency",
+             "payout": self.payout, "is_open": True}
+            for index, asset in enumerate(self.prices)
+        ]
+        batch = [[5, [item["id"], item["symbol"], item["name"], "currency", 1, self.payout]] for item in items]
+        session.send(codec.dumps(batch), self._event("assets", {"assets": items}))
+
+    def _on_change_symbol(self, session: _LocalSession, payload: Any) -> None:
+        if not isinstance(payload, dict):
+            return
+        asset = str(payload.get("asset", ""))
+        period = int(payload.get("period", 60) or 60)
+        self.prices.setdefault(asset, 1.0)
+        session.subscriptions.add(asset)
+        session.send(
+            self._event(
+                "loadHistoryPeriod",
+                {"asset": asset, "period": period, "candles": self._history(asset, period)},
+            )
+        )
+
+    def _on_load_history_period(self, session: _LocalSession, payload: Any) -> None:
+        if not isinstance(payload, dict):
+            return
+        asset = str(payload.get("asset", ""))
+        period = max(1, int(payload.get("period", 60) or 60))
+        end = int(payload.get("time") or time.time())
+        offset = max(0, int(payload.get("offset", period * self.candle_count) or 0))
+        # Candles com início em [end - offset, end), limitados ao horário atual
+        first = -(-(end - offset) // period) * period
+        last = min(end, int(time.time()) // period * period + period)
+        times = range(first, last, period)
+        if self.history_page_limit:
+            times = times[-self.history_page_limit:]
+        self.stats["history_pages"] += 1
+        session.send(
+            self._event(
+                "loadHistoryPeriod",
+                {
+                    "asset": asset,
+                    "index": payload.get("index"),
+                    "period": period,
+                    "data": [self._historical_candle(asset, ts, period) for ts in times],
+                },
+            )
+        )
+
+    def _on_open_order(self, session: _LocalSession, payload: Any) -> None:
+        if not isinstance(payload, dict):
+            return
+        request_id = str(payload.get("requestId") or uuid.uuid4())
+        asset = str(payload.get("asset", ""))
+        amount = float(payload.get("amount", 0) or 0)
+        duration = int(payload.get("time", 60) or 60)
+        command = 0 if str(payload.get("action", "call")).lower() == "call" else 1
+        open_price = self.prices.get(asset, 1.0)
+
+        self.balance -= amount
+        self.stats["orders_opened"] += 1
+        session.send(
+            self._event(
+                "successopenOrder",
+                {
+                    "id": request_id,
+                    "requestId": request_id,
+                    "asset": asset,
+                    "amount": amount,
+                    "command": command,
+                    "time": duration,
+                    "openPrice": open_price,
+                    "openTimestamp": time.time(),
+                    "payout": self.payout,
+                },
+            ),
+            self._balance_event(),
+        )
+        session.tasks.append(
+            asyncio.create_task(self._close_order(session, request_id, amount, duration * self.order_time_scale))
+        )
+
+    _handlers = {
+        "auth": _on_auth,
+        "getBalance": _on_balance,
+        "assets": _on_assets,
+        "changeSymbol": _on_change_symbol,
+        "loadHistoryPeriod": _on_load_history_period,
+        "openOrder": _on_open_order,
+    }
+
+    async def _close_order(self, session: _LocalSession, request_id: str, amount: float, delay: float) -> None:
+        await asyncio.sleep(delay)
+        win = self.rng.random() < self.win_rate
+        profit = round(amount * self.payout / 100.0, 2) if win else -amount
+        if win:
+            self.balance += amount + profit
+        self.stats["orders_closed"] += 1
+        session.send(
+            self._event(
+                "successcloseOrder",
+                {
+                    "profit": profit,
+                    "deals": [{"id": request_id, "profit": profit, "payout": self.payout, "closeTimestamp": time.time()}],
+                },
+            ),
+            self._balance_event(),
+        )
+
+    # -------------------------------------------------------------------------
+    # Tarefas periódicas
+    # -------------------------------------------------------------------------
+
+    async def _ping_loop(self, session: _LocalSession) -> None:
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            session.send("2")
+
+    async def _tick_loop(self, session: _LocalSession) -> None:
+        if self.tick_rate <= 0:
+            return
+        interval = 1.0 / self.tick_rate
+        while True:
+            await asyncio.sleep(interval)
+            for asset in list(session.subscriptions):
+                tick = [[asset, round(time.time(), 3), self._next_price(asset)]]
+                if self.binary_ticks:
+                    session.send('451-["updateStream",{"_placeholder":true,"num":0}]', codec.dumps_bytes(tick))
+                else:
+                    session.send(self._event("updateStream", tick))
+                self.stats["ticks_sent"] += 1
+
+    # -------------------------------------------------------------------------
+    # Payloads
+    # -------------------------------------------------------------------------
+
+    def _event(self, name: str, payload: Any) -> str:
+        if self.payload_padding and isinstance(payload, dict):
+            payload = dict(payload, _padding="x" * self.payload_padding)
+        return "42" + codec.dumps([name, payload])
+
+    def _balance_event(self) -> str:
+        return self._event("successupdateBalance", {"balance": round(self.balance, 2), "isDemo": 1, "currency": "USD"})
+
+    def _next_price(self, asset: str) -> float:
+        price = self.prices.get(asset, 1.0)
+        price = round(price * (1.0 + self.rng.gauss(0.0, 0.0002)), 5)
+        self.prices[asset] = price
+        return price
+
+    def _historical_price(self, asset: str, ts: float) -> float:
+        # Função determinística do horário: páginas sobrepostas devolvem exatamente os mesmos valores
+        base = self._base_prices.get(asset, 1.0)
+        phase = (sum(map(ord, asset)) % 360) * math.pi / 180.0
+        return base * (1.0 + 0.02 * math.sin(ts / 43_200.0 + phase) + 0.002 * math.sin(ts / 977.0))
+
+    def _historical_candle(self, asset: str, ts: int, period: int) -> Dict[str, Any]:
+        open_price = self._historical_price(asset, ts)
+        close_price = self._historical_price(asset, ts + period)
+        return {
+            "time": ts,
+            "open": round(open_price, 5),
+            "high": round(max(open_price, close_price) * 1.0003, 5),
+            "low": round(min(open_price, close_price) * 0.9997, 5),
+            "close": round(close_price, 5),
+        }
+
+    def _history(self, asset: str, period: int) -> List[Dict[str, Any]]:
+        price = self.prices.get(asset, 1.0)
+        now = int(time.time()) // period * period
+        candles: List[Dict[str, Any]] = []
+        for index in range(self.candle_count, 0, -1):
+            open_price = price
+            close_price = round(open_price * (1.0 + self.rng.gauss(0.0, 0.001)), 5)
+            high = max(open_price, close_price) * (1.0 + abs(self.rng.gauss(0.0, 0.0005)))
+            low = min(open_price, close_price) * (1.0 - abs(self.rng.gauss(0.0, 0.0005)))
+            candles.append(
+                {
+                    "time": now - index * period,
+                    "open": open_price,
+                    "high": round(high, 5),
+                    "low": round(low, 5),
+                    "close": close_price,
+                }
+            )
+            price = close_price
+        return candles
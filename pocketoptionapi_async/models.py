@@ -395,8 +395,11 @@ class Candle(PocketBaseModel):
     def validate_ohlc(self) -> "Candle":
         actual_high = max(self.open, self.high, self.low, self.close)
         actual_low = min(self.open, self.high, self.low, self.close)
-        self.high = actual_high
-        self.low = actual_low
+        # Modelo congelado: a correção do OHLC precisa contornar o __setattr__ do pydantic
+        if actual_high != self.high:
+            object.__setattr__(self, "high", actual_high)
+        if actual_low != self.low:
+            object.__setattr__(self, "low", actual_low)
         return self
 
 
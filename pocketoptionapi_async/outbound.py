@@ -0,0 +1,417 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, com escritor único de saída, faixas de prioridade e coalescência de envios.
+
+Descrição:
+Módulo responsável pelo caminho de saída do WebSocket. Em vez de várias corrotinas chamarem websocket.send() ao mesmo tempo, todas enfileiram a mensagem em uma fila de envio consumida por uma única tarefa escritora. As mensagens são separadas por classe e atendidas por faixa de prioridade: ordens e frames de controle primeiro, depois assinaturas, por último snapshots e heartbeats. Assim, uma rajada de reassinaturas após reconexão nunca atrasa uma ordem ao vivo. Enquanto a mensagem aguarda, envios redundantes são coalescidos: heartbeats '42["ps"]' duplicados são descartados e changeSymbol repetidos para o mesmo ativo/período viram um só.
+
+O que ele faz:
+- Mantém uma fila por classe de mensagem consumida por uma única tarefa escritora
+- Atende as classes por faixa de prioridade (ordens > assinaturas > snapshots/heartbeats)
+- Aplica limite de taxa por classe (token bucket) sem bloquear as demais classes
+- Descarta heartbeats duplicados ainda pendentes
+- Colapsa changeSymbol repetidos para o mesmo ativo e período
+- Segura mensagens coalescíveis por no máximo flush_interval; as demais disparam o flush imediato
+- Mede o tempo de espera na fila e o tempo até o socket (enqueue-to-wire) por classe
+
+Características:
+- Quem chama send() aguarda a entrega real e recebe o erro do socket, como no envio direto
+- Envios coalescidos compartilham o mesmo resultado de entrega
+- Cancelar um chamador não cancela a entrega dos demais que compartilham a mensagem
+- FIFO preservado dentro da mesma faixa de prioridade
+- Classificação por fatiamento do prefixo, com parse JSON apenas para changeSymbol
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- loguru
+- Módulos internos do projeto:
+  - codec
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from loguru import logger
+
+from . import codec
+
+HEARTBEAT_MESSAGE = '42["ps"]'
+
+# Classes de mensagem usadas no agendamento e nas métricas de espera
+CLASS_CONTROL = "control"
+CLASS_ORDER = "order"
+CLASS_SUBSCRIPTION = "subscription"
+CLASS_OTHER = "other"
+CLASS_SNAPSHOT = "snapshot"
+CLASS_HEARTBEAT = "heartbeat"
+
+ORDER_EVENTS = frozenset({"openOrder", "openPendingOrder", "cancelOrder", "cancelPendingOrder"})
+SUBSCRIPTION_EVENTS = frozenset({"changeSymbol", "subfor", "unsubfor", "loadHistoryPeriod"})
+SNAPSHOT_EVENTS = frozenset({"assets", "getAssets", "loadAssets"})
+
+# Faixas de prioridade: menor número é atendido primeiro
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+CLASS_PRIORITIES: Dict[str, int] = {
+    CLASS_CONTROL: PRIORITY_HIGH,
+    CLASS_ORDER: PRIORITY_HIGH,
+    CLASS_SUBSCRIPTION: PRIORITY_NORMAL,
+    CLASS_OTHER: PRIORITY_NORMAL,
+    CLASS_SNAPSHOT: PRIORITY_LOW,
+    CLASS_HEARTBEAT: PRIORITY_LOW,
+}
+
+# Classes que podem esperar o prazo de flush para dar chance à coalescência
+DEFERRABLE_CLASSES = frozenset({CLASS_HEARTBEAT, CLASS_SUBSCRIPTION})
+
+RateLimits = Dict[str, Tuple[float, Optional[float]]]
+
+
+def _event_name(message: str) -> Optional[str]:
+    if not message.startswith('42["'):
+        return None
+    end = message.find('"', 4)
+    return message[4:end] if end != -1 else None
+
+
+def classify_message(message: Any) -> Tuple[str, Optional[str]]:
+    """Retorna (classe, chave de coalescência) de uma mensagem de saída."""
+    if not isinstance(message, str):
+        return CLASS_OTHER, None
+    if message == HEARTBEAT_MESSAGE:
+        return CLASS_HEARTBEAT, HEARTBEAT_MESSAGE
+
+    event = _event_name(message)
+    if event is None:
+        return CLASS_CONTROL, None
+    if event in ORDER_EVENTS:
+        return CLASS_ORDER, None
+    if event in SNAPSHOT_EVENTS:
+        return CLASS_SNAPSHOT, None
+    if event not in SUBSCRIPTION_EVENTS:
+        return CLASS_OTHER, None
+
+    if event == "changeSymbol":
+        try:
+            payload = codec.loads(message[2:])[1]
+            return CLASS_SUBSCRIPTION, f"changeSymbol:{payload['asset']}:{payload['period']}"
+        except Exception:
+            pass
+    return CLASS_SUBSCRIPTION, None
+
+
+class _Outgoing:
+    __slots__ = ("message", "message_class", "key", "sequence", "enqueued_at", "future")
+
+    def __init__(
+        self,
+        message: Any,
+        message_class: str,
+        key: Optional[str],
+        sequence: int,
+        future: asyncio.Future,
+    ):
+        self.message = message
+        self.message_class = message_class
+        self.key = key
+        self.sequence = sequence
+        self.enqueued_at = time.monotonic()
+        self.future = future
+
+
+class _TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst if burst is not None else rate))
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+
+    def delay(self, now: float) -> float:
+        """Segundos até haver uma ficha disponível (0 se já houver)."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1.0
+
+
+class OutboundWriter:
+    """Fila de envio com uma única tarefa escritora, faixas de prioridade e coalescência."""
+
+    def __init__(
+        self,
+        flush_interval: float = 0.005,
+        batch_size: int = 32,
+        rate_limits: Optional[RateLimits] = None,
+    ):
+        self.flush_interval = max(0.0, float(flush_interval))
+        self.batch_size = max(1, int(batch_size))
+
+        self._websocket: Any = None
+        self._task: Optional[asyncio.Task] = None
+        self._queues: Dict[str, Deque[_Outgoing]] = {name: deque() for name in CLASS_PRIORITIES}
+        self._lanes = tuple(
+            tuple(name for name, priority in CLASS_PRIORITIES.items() if priority == lane)
+            for lane in sorted(set(CLASS_PRIORITIES.values()))
+        )
+        self._keyed: Dict[str, _Outgoing] = {}
+        self._limits: Dict[str, _TokenBucket] = {}
+        self._sequence = itertools.count()
+        self._depth = 0
+        self._wakeup = asyncio.Event()
+        self._flush_now = False
+
+        self.max_depth = 0
+        self.rate_limited = 0
+        self._class_stats: Dict[str, Dict[str, float]] = {}
+
+        for message_class, (rate, burst) in (rate_limits or {}).items():
+            self.set_rate_limit(message_class, rate, burst)
+
+    # -------------------------------------------------------------------------
+    # Ciclo de vida
+    # -------------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, websocket: Any) -> None:
+        self._websocket = websocket
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, error: Optional[BaseException] = None) -> None:
+        task, self._task = self._task, None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                pass
+
+        self._fail_pending(error or ConnectionError("WebSocket writer stopped"))
+        self._websocket = None
+
+    def set_rate_limit(self, message_class: str, rate: Optional[float], burst: Optional[float] = None) -> None:
+        """Limita a classe a `rate` mensagens/s (rajada de até `burst`); rate None remove o limite."""
+        if message_class not in CLASS_PRIORITIES:
+            raise ValueError(
+                f"Unknown outbound message class '{message_class}' "
+                f"(expected one of: {', '.join(CLASS_PRIORITIES)})"
+            )
+        if rate is None or rate <= 0:
+            self._limits.pop(message_class, None)
+        else:
+            self._limits[message_class] = _TokenBucket(rate, burst)
+        self._wakeup.set()
+
+    # -------------------------------------------------------------------------
+    # Envio
+    # -------------------------------------------------------------------------
+
+    async def send(self, message: Any) -> None:
+        message_class, key = classify_message(message)
+
+        if key is not None:
+            queued = self._keyed.get(key)
+            if queued is not None:
+                queued.message = message
+                self._class_entry(message_class)["coalesced"] += 1
+                await asyncio.shield(queued.future)
+                return
+
+        item = _Outgoing(
+            message,
+            message_class,
+            key,
+            next(self._sequence),
+            asyncio.get_running_loop().create_future(),
+        )
+        self._queues[message_class].append(item)
+        if key is not None:
+            self._keyed[key] = item
+
+        self._depth += 1
+        if self._depth > self.max_depth:
+            self.max_depth = self._depth
+        if message_class not in DEFERRABLE_CLASSES or self._depth >= self.batch_size:
+            self._flush_now = True
+        self._wakeup.set()
+
+        await asyncio.shield(item.future)
+
+    async def _run(self) -> None:
+        while True:
+            item, delay = self._next_ready()
+            if item is None:
+                self._wakeup.clear()
+                if delay is None:
+                    await self._wakeup.wait()
+                else:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                continue
+
+            await self._write(item)
+
+    def _next_ready(self) -> Tuple[Optional[_Outgoing], Optional[float]]:
+        """Próxima mensagem enviável, ou (None, segundos até a próxima ficar pronta)."""
+        if not self._depth:
+            self._flush_now = False
+            return None, None
+
+        now = time.monotonic()
+        earliest: Optional[float] = None
+
+        for lane in self._lanes:
+            chosen: Optional[_Outgoing] = None
+            for message_class in lane:
+                queue = self._queues[message_class]
+                if not queue:
+                    continue
+                head = queue[0]
+
+                wait = 0.0
+                if message_class in DEFERRABLE_CLASSES and not self._flush_now:
+                    wait = head.enqueued_at + self.flush_interval - now
+                bucket = self._limits.get(message_class)
+                if bucket is not None:
+                    throttle = bucket.delay(now)
+                    if throttle > 0:
+                        self.rate_limited += 1
+                        wait = max(wait, throttle)
+
+                if wait > 0:
+                    earliest = wait if earliest is None else min(earliest, wait)
+                    continue
+                if chosen is None or head.sequence < chosen.sequence:
+                    chosen = head
+
+            if chosen is not None:
+                self._take(chosen)
+                return chosen, None
+
+        return None, earliest
+
+    def _take(self, item: _Outgoing) -> None:
+        self._queues[item.message_class].popleft()
+        self._depth -= 1
+        if item.key is not None and self._keyed.get(item.key) is item:
+            del self._keyed[item.key]
+        bucket = self._limits.get(item.message_class)
+        if bucket is not None:
+            bucket.take()
+
+    async def _write(self, item: _Outgoing) -> None:
+        if item.future.done():
+            return
+
+        wait = time.monotonic() - item.enqueued_at
+        entry = self._class_entry(item.message_class)
+        entry["sent"] += 1
+        entry["total_wait"] += wait
+        if wait > entry["max_wait"]:
+            entry["max_wait"] = wait
+
+        try:
+            await self._websocket.send(item.message)
+        except asyncio.CancelledError:
+            item.future.set_exception(ConnectionError("WebSocket writer stopped"))
+            item.future.exception()
+            raise
+        except Exception as exc:
+            logger.debug(f"Outbound write failed: {exc}")
+            item.future.set_exception(exc)
+            return
+
+        wire = time.monotonic() - item.enqueued_at
+        entry["total_wire"] += wire
+        entry["last_wire"] = wire
+        if wire > entry["max_wire"]:
+            entry["max_wire"] = wire
+        item.future.set_result(None)
+
+    def _fail_pending(self, error: BaseException) -> None:
+        for queue in self._queues.values():
+            while queue:
+                item = queue.popleft()
+                if not item.future.done():
+                    item.future.set_exception(error)
+                    # Evita "exception was never retrieved" quando o chamador já desistiu
+                    item.future.exception()
+        self._keyed.clear()
+        self._depth = 0
+        self._flush_now = False
+
+    # -------------------------------------------------------------------------
+    # Métricas
+    # -------------------------------------------------------------------------
+
+    def _class_entry(self, message_class: str) -> Dict[str, float]:
+        entry = self._class_stats.get(message_class)
+        if entry is None:
+            entry = {
+                "sent": 0,
+                "coalesced": 0,
+                "total_wait": 0.0,
+                "max_wait": 0.0,
+                "total_wire": 0.0,
+                "max_wire": 0.0,
+                "last_wire": 0.0,
+            }
+            self._class_stats[message_class] = entry
+        return entry
+
+    def get_stats(self) -> Dict[str, Any]:
+        classes: Dict[str, Dict[str, Any]] = {}
+        for message_class, entry in self._class_stats.items():
+            sent = entry["sent"]
+            bucket = self._limits.get(message_class)
+            classes[message_class] = {
+                "priority": CLASS_PRIORITIES[message_class],
+                "sent": int(sent),
+                "coalesced": int(entry["coalesced"]),
+                "pending": len(self._queues[message_class]),
+                "rate_limit": bucket.rate if bucket else None,
+                "avg_wait_ms": round(entry["total_wait"] / sent * 1000.0, 3) if sent else 0.0,
+                "max_wait_ms": round(entry["max_wait"] * 1000.0, 3),
+                "avg_wire_ms": round(entry["total_wire"] / sent * 1000.0, 3) if sent else 0.0,
+                "max_wire_ms": round(entry["max_wire"] * 1000.0, 3),
+            }
+
+        order_entry = self._class_stats.get(CLASS_ORDER)
+        order_latency = None
+        if order_entry and order_entry["sent"]:
+            order_latency = {
+                "last_ms": round(order_entry["last_wire"] * 1000.0, 3),
+                "avg_ms": classes[CLASS_ORDER]["avg_wire_ms"],
+                "max_ms": classes[CLASS_ORDER]["max_wire_ms"],
+            }
+
+        return {
+            "running": self.running,
+            "flush_interval_ms": round(self.flush_interval * 1000.0, 3),
+            "depth": self._depth,
+            "max_depth": self.max_depth,
+            "rate_limited": self.rate_limited,
+            "order_enqueue_to_wire": order_latency,
+            "classes": classes,
+        }
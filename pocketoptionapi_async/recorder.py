@@ -0,0 +1,369 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, com gravação do tráfego WebSocket em formato compacto para profiling e replay offline.
+
+Descrição:
+Módulo responsável por capturar, na fronteira do transporte, cada frame WebSocket recebido e enviado, com timestamp monotônico em nanossegundos, direção, opcode e bytes brutos. Os frames são acumulados em memória pelo caminho quente (uma tupla por frame) e gravados por uma tarefa em segundo plano em um arquivo append-only de blocos com prefixo de tamanho, opcionalmente comprimidos com zlib, com rotação por tamanho.
+
+O que ele faz:
+- Intercepta send/recv no protocolo WebSocket (RecordingClientProtocol), inclusive durante o handshake
+- Acumula frames sem serializar nada no loop de eventos
+- Serializa, comprime e grava blocos em thread separada
+- Rotaciona o arquivo por tamanho mantendo N arquivos anteriores
+- Lê capturas de volta como uma sequência de CapturedFrame para replay e benchmarks
+
+Características:
+- Formato: cabeçalho POCAP1 + blocos [flags u8][tamanho u32][corpo]
+- Corpo do bloco: registros [ts_ns u64][direção u8][opcode u8][tamanho u32][bytes]
+- Blocos independentes: um arquivo truncado perde no máximo o último bloco
+- Buffer limitado: com o disco atrasado, frames excedentes são descartados e contados
+- Um mesmo gravador pode ser compartilhado pelo cliente, pelo pool e pelo keep-alive
+- Ativação por POCKETOPTION_CAPTURE_PATH ou start_recording() no transporte
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- struct
+- zlib
+- websockets
+- loguru
+- Módulos internos do projeto:
+  - constants
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+from websockets.legacy.client import WebSocketClientProtocol
+
+from .constants import CONNECTION_SETTINGS
+
+CAPTURE_MAGIC = b"POCAP1\n"
+
+DIRECTION_IN = 0
+DIRECTION_OUT = 1
+
+OPCODE_TEXT = 1
+OPCODE_BINARY = 2
+
+BLOCK_FLAG_ZLIB = 0x01
+BLOCK_RECORDS = 4096
+
+_BLOCK_HEADER = struct.Struct("<BI")
+_RECORD_HEADER = struct.Struct("<QBBI")
+
+
+class CapturedFrame:
+    """Frame lido de uma captura: texto como str, binário como bytes."""
+
+    __slots__ = ("timestamp_ns", "direction", "opcode", "data")
+
+    def __init__(self, timestamp_ns: int, direction: int, opcode: int, data: Any):
+        self.timestamp_ns = timestamp_ns
+        self.direction = direction
+        self.opcode = opcode
+        self.data = data
+
+    @property
+    def inbound(self) -> bool:
+        return self.direction == DIRECTION_IN
+
+    def __repr__(self) -> str:
+        arrow = "<-" if self.inbound else "->"
+        return f"CapturedFrame({self.timestamp_ns} {arrow} {len(self.data)} bytes)"
+
+
+class TrafficRecorder:
+    """Gravador append-only de frames WebSocket com escrita em segundo plano."""
+
+    def __init__(
+        self,
+        path: str,
+        compress: bool = True,
+        max_bytes: int = 64 * 1024 * 1024,
+        backups: int = 5,
+        flush_interval: float = 0.5,
+        max_pending: int = 100_000,
+        compression_level: int = 1,
+    ):
+        self.path = path
+        self.compress = compress
+        self.max_bytes = max(0, int(max_bytes))
+        self.backups = max(0, int(backups))
+        self.flush_interval = max(0.01, float(flush_interval))
+        self.max_pending = max(1, int(max_pending))
+        self.compression_level = compression_level
+
+        self._pending: List[Tuple[int, int, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._file: Any = None
+        self._file_lock = threading.Lock()
+        self._closed = False
+
+        self._stats: Dict[str, Any] = {
+            "frames_recorded": 0,
+            "frames_dropped": 0,
+            "frames_written": 0,
+            "blocks_written": 0,
+            "payload_bytes": 0,
+            "file_bytes": 0,
+            "rotations": 0,
+            "write_errors": 0,
+        }
+
+    # -------------------------------------------------------------------------
+    # Caminho quente
+    # -------------------------------------------------------------------------
+
+    def record(self, direction: int, message: Any) -> None:
+        """Registra um frame; não bloqueia nem serializa (a gravação ocorre na tarefa de fundo)."""
+        if self._closed:
+            return
+        if len(self._pending) >= self.max_pending:
+            self._stats["frames_dropped"] += 1
+            return
+
+        self._pending.append((time.monotonic_ns(), direction, message))
+        self._stats["frames_recorded"] += 1
+        if self._task is None:
+            self._start_writer()
+        elif len(self._pending) >= self.max_pending // 2 and self._wakeup is not None:
+            self._wakeup.set()
+
+    def record_inbound(self, message: Any) -> None:
+        self.record(DIRECTION_IN, message)
+
+    def record_outbound(self, message: Any) -> None:
+        self.record(DIRECTION_OUT, message)
+
+    # -------------------------------------------------------------------------
+    # Ciclo de vida
+    # -------------------------------------------------------------------------
+
+    async def flush(self) -> None:
+        """Grava imediatamente os frames pendentes."""
+        batch = self._take_pending()
+        if batch:
+            await asyncio.get_running_loop().run_in_executor(None, self._write_batch, batch)
+
+    async def close(self) -> None:
+        """Para a tarefa de fundo, grava o restante e fecha o arquivo."""
+        self._closed = True
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        await asyncio.get_running_loop().run_in_executor(None, self._close_file)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats.update(
+            {
+                "path": self.path,
+                "compress": self.compress,
+                "pending": len(self._pending),
+                "running": self._task is not None and not self._task.done(),
+                "ratio": (stats["file_bytes"] / stats["payload_bytes"]) if stats["payload_bytes"] else None,
+            }
+        )
+        return stats
+
+    # -------------------------------------------------------------------------
+    # Escrita em segundo plano
+    # -------------------------------------------------------------------------
+
+    def _start_writer(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Fora do loop (ex.: testes síncronos): os frames ficam pendentes até flush()/close()
+            return
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._writer_loop())
+
+    async def _writer_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        wakeup = self._wakeup
+        while True:
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+
+            batch = self._take_pending()
+            if batch:
+                await loop.run_in_executor(None, self._write_batch, batch)
+
+    def _take_pending(self) -> List[Tuple[int, int, Any]]:
+        batch, self._pending = self._pending, []
+        return batch
+
+    def _write_batch(self, batch: List[Tuple[int, int, Any]]) -> None:
+        # Blocos limitados: uma captura truncada perde no máximo BLOCK_RECORDS frames
+        for start in range(0, len(batch), BLOCK_RECORDS):
+            self._write_block(batch[start:start + BLOCK_RECORDS])
+
+    def _write_block(self, batch: List[Tuple[int, int, Any]]) -> None:
+        try:
+            body, payload_bytes = _encode_records(batch)
+            flags = 0
+            if self.compress:
+                body = zlib.compress(body, self.compression_level)
+                flags |= BLOCK_FLAG_ZLIB
+
+            block = _BLOCK_HEADER.pack(flags, len(body)) + body
+            # Uma escrita cancelada no loop continua na thread; o lock evita intercalar blocos
+            with self._file_lock:
+                handle = self._open_for_append(len(block))
+                handle.write(block)
+                handle.flush()
+
+            self._stats["frames_written"] += len(batch)
+            self._stats["blocks_written"] += 1
+            self._stats["payload_bytes"] += payload_bytes
+            self._stats["file_bytes"] += len(block)
+        except Exception as exc:
+            self._stats["write_errors"] += 1
+            logger.warning(f"Unable to write traffic capture to {self.path}: {exc}")
+
+    def _close_file(self) -> None:
+        with self._file_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _open_for_append(self, incoming: int) -> Any:
+        if self._file is not None and self.max_bytes and self._file.tell() + incoming > self.max_bytes:
+            self._file.close()
+            self._file = None
+            self._rotate()
+
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "ab")
+            if self._file.tell() == 0:
+                self._file.write(CAPTURE_MAGIC)
+        return self._file
+
+    def _rotate(self) -> None:
+        if self.backups <= 0:
+            os.remove(self.path)
+        else:
+            for index in range(self.backups - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self._stats["rotations"] += 1
+
+
+def create_traffic_recorder(path: Optional[str] = None) -> Optional[TrafficRecorder]:
+    """Cria um gravador com as opções de CONNECTION_SETTINGS; sem caminho configurado retorna None."""
+    path = path or CONNECTION_SETTINGS["capture_path"]
+    if not path:
+        return None
+    return TrafficRecorder(
+        path,
+        compress=CONNECTION_SETTINGS["capture_compress"],
+        max_bytes=CONNECTION_SETTINGS["capture_max_bytes"],
+        backups=CONNECTION_SETTINGS["capture_backups"],
+    )
+
+
+def _encode_records(batch: List[Tuple[int, int, Any]]) -> Tuple[bytes, int]:
+    parts: List[bytes] = []
+    payload_bytes = 0
+    pack = _RECORD_HEADER.pack
+    for timestamp_ns, direction, message in batch:
+        if isinstance(message, str):
+            opcode = OPCODE_TEXT
+            data = message.encode("utf-8")
+        else:
+            opcode = OPCODE_BINARY
+            data = bytes(message)
+        parts.append(pack(timestamp_ns, direction, opcode, len(data)))
+        parts.append(data)
+        payload_bytes += len(data)
+    return b"".join(parts), payload_bytes
+
+
+# -----------------------------------------------------------------------------
+# Leitura
+# -----------------------------------------------------------------------------
+
+
+def read_capture(path: str, decode_text: bool = True) -> Iterator[CapturedFrame]:
+    """Lê uma captura bloco a bloco; um bloco final truncado é ignorado."""
+    with open(path, "rb") as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"Not a traffic capture file: {path}")
+
+        while True:
+            header = f.read(_BLOCK_HEADER.size)
+            if len(header) < _BLOCK_HEADER.size:
+                return
+            flags, length = _BLOCK_HEADER.unpack(header)
+            body = f.read(length)
+            if len(body) < length:
+                logger.warning(f"Truncated block at the end of {path}")
+                return
+            if flags & BLOCK_FLAG_ZLIB:
+                body = zlib.decompress(body)
+            yield from _decode_records(body, decode_text)
+
+
+def _decode_records(body: bytes, decode_text: bool) -> Iterator[CapturedFrame]:
+    view = memoryview(body)
+    offset = 0
+    size = _RECORD_HEADER.size
+    unpack_from = _RECORD_HEADER.unpack_from
+    while offset + size <= len(body):
+        timestamp_ns, direction, opcode, length = unpack_from(body, offset)
+        offset += size
+        data: Any = bytes(view[offset:offset + length])
+        offset += length
+        if decode_text and opcode == OPCODE_TEXT:
+            data = data.decode("utf-8", errors="replace")
+        yield CapturedFrame(timestamp_ns, direction, opcode, data)
+
+
+# -----------------------------------------------------------------------------
+# Gancho no protocolo WebSocket
+# -----------------------------------------------------------------------------
+
+
+class RecordingClientProtocol(WebSocketClientProtocol):
+    """Protocolo cliente que repassa cada mensagem enviada/recebida ao gravador, quando houver um."""
+
+    def __init__(self, *args: Any, recorder: Optional[TrafficRecorder] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.recorder = recorder
+
+    async def read_message(self) -> Any:
+        message = await super().read_message()
+        recorder = self.recorder
+        if recorder is not None and message is not None:
+            recorder.record(DIRECTION_IN, message)
+        return message
+
+    async def send(self, message: Any) -> None:
+        recorder = self.recorder
+        if recorder is not None and isinstance(message, (str, bytes, bytearray, memoryview)):
+            recorder.record(DIRECTION_OUT, message)
+        await super().send(message)
@@ -0,0 +1,217 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, com replay determinístico de tráfego gravado para benchmarks e reprodução de incidentes offline.
+
+Descrição:
+Módulo responsável por reproduzir capturas do recorder contra o pipeline completo do cliente, sem rede. O ReplayWebSocketClient substitui o AsyncWebSocketClient (parâmetro transport do AsyncPocketOptionClient): aceita connect/send sem abrir socket e recebe os frames gravados diretamente em _process_message. O ReplayEngine controla o ritmo (original, N× ou o mais rápido possível) e produz um relatório com frames/s, tempo por estágio e o estado final do broker.
+
+O que ele faz:
+- Lê capturas gravadas (read_capture) ou listas de frames em memória
+- Alimenta apenas os frames recebidos; os enviados na captura servem de referência e são contados
+- Respeita o intervalo original entre frames, dividido pelo fator de velocidade
+- Mede o tempo de decodificação/roteamento e o tempo dos handlers por evento normalizado
+- Guarda as mensagens que o cliente tentou enviar durante o replay
+- Retorna o estado final de get_all_broker_state() para comparar execuções
+
+Características:
+- Determinístico: mesma captura e mesmo ritmo produzem a mesma sequência de eventos
+- Sem rede, sem SSID válido e sem alterar o placar de regiões persistido
+- speed=None (ou 0) processa o mais rápido possível; speed=1.0 reproduz o ritmo original
+- Atraso máximo em relação ao cronograma reportado (lag) para identificar picos de CPU
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- loguru
+- Módulos internos do projeto:
+  - client
+  - models
+  - recorder
+  - scoreboard
+  - websocket_client
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from loguru import logger
+
+from .models import ConnectionInfo, ConnectionStatus
+from .recorder import DIRECTION_IN, CapturedFrame, read_capture
+from .scoreboard import RegionScoreboard
+from .websocket_client import AsyncWebSocketClient
+
+REPLAY_URL = "replay://capture"
+REPLAY_SSID = '42["auth",{"session":"replay","isDemo":1,"uid":0,"platform":1}]'
+
+ReplaySource = Union[str, Iterable[Any]]
+
+
+class _ReplaySocket:
+    """Socket falso: guarda o que o cliente envia e nunca fecha sozinho."""
+
+    def __init__(self, sent: List[Any]):
+        self._sent = sent
+        self.closed = False
+
+    async def send(self, message: Any) -> None:
+        self._sent.append(message)
+
+    async def ping(self) -> Any:
+        waiter = asyncio.get_running_loop().create_future()
+        waiter.set_result(None)
+        return waiter
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class ReplayWebSocketClient(AsyncWebSocketClient):
+    """Transporte substituto do AsyncWebSocketClient alimentado por frames gravados."""
+
+    def __init__(self, **kwargs: Any):
+        # Placar em memória: o replay não deve influenciar a ordenação real das regiões
+        kwargs.setdefault("scoreboard", RegionScoreboard(path=None))
+        super().__init__(**kwargs)
+        self.sent: List[Any] = []
+        self._event_time: Dict[str, float] = defaultdict(float)
+        self._event_calls: Dict[str, int] = defaultdict(int)
+
+    async def connect(self, urls: List[str], ssid: str, race: bool = True) -> bool:
+        self.websocket = _ReplaySocket(self.sent)  # type: ignore[assignment]
+        self.connection_info = ConnectionInfo(
+            url=REPLAY_URL,
+            region="REPLAY",
+            status=ConnectionStatus.CONNECTED,
+            connected_at=datetime.now(),
+        )
+        if ssid:
+            self.sent.append(ssid)
+        return True
+
+    async def disconnect(self) -> None:
+        self._router.reset()
+        if self.websocket is not None:
+            await self.websocket.close()
+            self.websocket = None
+        if self.connection_info:
+            self.connection_info = ConnectionInfo(
+                url=self.connection_info.url,
+                region=self.connection_info.region,
+                status=ConnectionStatus.DISCONNECTED,
+                connected_at=self.connection_info.connected_at,
+            )
+
+    async def feed(self, message: Any) -> None:
+        """Entrega um frame recebido ao pipeline (pareamento, decodificação, roteamento e handlers)."""
+        await self._process_message(message)
+
+    async def _emit_event(self, event: str, data: Any) -> None:
+        started = time.perf_counter()
+        await super()._emit_event(event, data)
+        self._event_time[event] += time.perf_counter() - started
+        self._event_calls[event] += 1
+
+    def get_handler_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            event: {"calls": self._event_calls[event], "time": self._event_time[event]}
+            for event in sorted(self._event_time, key=self._event_time.get, reverse=True)
+        }
+
+    def reset_handler_stats(self) -> None:
+        self._event_time.clear()
+        self._event_calls.clear()
+
+
+def create_replay_client(ssid: str = REPLAY_SSID, **kwargs: Any) -> Any:
+    """Cria um AsyncPocketOptionClient cujo transporte é um ReplayWebSocketClient."""
+    from .client import AsyncPocketOptionClient
+
+    kwargs.setdefault("transport", ReplayWebSocketClient())
+    return AsyncPocketOptionClient(ssid, **kwargs)
+
+
+class ReplayEngine:
+    """Reproduz uma captura contra um AsyncPocketOptionClient ligado a um ReplayWebSocketClient."""
+
+    def __init__(self, client: Any, speed: Optional[float] = None):
+        transport = getattr(client, "_websocket", None)
+        if not isinstance(transport, ReplayWebSocketClient):
+            raise ValueError("Client must be created with transport=ReplayWebSocketClient() (see create_replay_client)")
+        self.client = client
+        self.transport = transport
+        self.speed = float(speed) if speed else None
+
+    async def run(self, source: ReplaySource, include_state: bool = True) -> Dict[str, Any]:
+        frames = read_capture(source) if isinstance(source, str) else source
+        if not self.transport.is_connected:
+            await self.transport.connect([REPLAY_URL], "")
+        self.transport.reset_handler_stats()
+
+        inbound = 0
+        outbound = 0
+        max_lag = 0.0
+        process_time = 0.0
+        first_ts: Optional[int] = None
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        for item in frames:
+            if isinstance(item, CapturedFrame):
+                if item.direction != DIRECTION_IN:
+                    outbound += 1
+                    continue
+                message: Any = item.data
+                timestamp_ns: Optional[int] = item.timestamp_ns
+            else:
+                message = item
+                timestamp_ns = None
+
+            if self.speed is not None and timestamp_ns is not None:
+                if first_ts is None:
+                    first_ts = timestamp_ns
+                due = started + (timestamp_ns - first_ts) / 1e9 / self.speed
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    max_lag = max(max_lag, -delay)
+
+            mark = time.perf_counter()
+            await self.transport.feed(message)
+            process_time += time.perf_counter() - mark
+            inbound += 1
+
+        elapsed = loop.time() - started
+        handlers = self.transport.get_handler_stats()
+        handler_time = sum(entry["time"] for entry in handlers.values())
+
+        report: Dict[str, Any] = {
+            "frames": inbound,
+            "outbound_frames_skipped": outbound,
+            "speed": self.speed,
+            "elapsed": elapsed,
+            "frames_per_second": inbound / elapsed if elapsed > 0 else 0.0,
+            "processing_frames_per_second": inbound / process_time if process_time > 0 else 0.0,
+            "max_lag": max_lag,
+            "stages": {
+                "decode_route": max(0.0, process_time - handler_time),
+                "handlers": handler_time,
+                "total": process_time,
+            },
+            "handlers": handlers,
+            "sent": list(self.transport.sent),
+        }
+        if include_state:
+            report["state"] = await self.client.get_all_broker_state()
+
+        logger.info(
+            f"Replay finished: {inbound} frames in {elapsed:.3f}s "
+            f"({report['frames_per_second']:,.0f} frames/s, max lag {max_lag * 1000:.1f} ms)"
+        )
+        return report
@@ -0,0 +1,444 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, com pipeline único de decodificação e roteamento de frames compartilhado entre os modos de conexão.
+
+Descrição:
+Módulo responsável por transformar frames brutos do broker em eventos normalizados da biblioteca. O mesmo roteador é usado pelo cliente WebSocket regular e pelo gerenciador keep-alive (modo persistente), de modo que cada frame é pareado com seus anexos binários, decodificado uma única vez e convertido nos mesmos eventos (json_data, authenticated, balance_updated, payout_update, ...) independentemente do modo de conexão.
+
+O que ele faz:
+- Pareia cabeçalhos 451- com seus anexos binários antes do despacho
+- Decodifica cada frame uma única vez (texto ou binário)
+- Encaminha frames de controle (ping, open, connect) para o dono da conexão
+- Normaliza eventos Socket.IO, JSON avulso e lotes de payout [[5, ...]]
+- Roteia eventos Socket.IO por tabela compilada a partir de constants.BROKER_EVENT_MAP
+- Aplica decodificadores plugáveis por evento antes da emissão
+- Emite eventos desconhecidos preservando o payload e o frame bruto
+
+Características:
+- Sem estado de conexão além do montador de anexos
+- Lookup O(1) com nomes de eventos internados; evento desconhecido custa um único miss no dicionário
+- Dependências injetadas por callables (emissão, controle, raw, autenticação)
+- Mesma semântica de eventos nos modos regular e persistente
+- Falhas de processamento são registradas sem derrubar a leitura
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- loguru
+- Módulos internos do projeto:
+  - constants
+  - frames
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+from loguru import logger
+
+from .constants import BROKER_EVENT_MAP
+from .frames import (
+    FRAME_BINARY_EVENT,
+    FRAME_CONNECT,
+    FRAME_EVENT,
+    FRAME_JSON,
+    FRAME_OPEN,
+    FRAME_PAYOUT_BATCH,
+    FRAME_PING,
+    FRAME_UNKNOWN,
+    AttachmentAssembler,
+    Frame,
+    decode_binary_frame,
+    decode_frame,
+)
+
+EmitFunction = Callable[[str, Any], Awaitable[None]]
+ControlFunction = Callable[[Frame], Awaitable[None]]
+RawFunction = Callable[[Any], Awaitable[None]]
+DecoderFunction = Callable[[Any], Any]
+
+# Frames de controle Engine.IO/Socket.IO tratados pelo dono da conexão
+CONTROL_FRAMES = frozenset({FRAME_PING, FRAME_OPEN, FRAME_CONNECT})
+
+# Eventos internos que, por compatibilidade, também são emitidos com um alias
+EVENT_FANOUT: Dict[str, Tuple[str, ...]] = {
+    "balance_updated": ("balance_updated", "balance_data"),
+    "assets": ("assets", "assets_received"),
+}
+
+# Evento interno que confirma a sessão (libera quem aguarda a autenticação)
+AUTH_EVENT = "authenticated"
+
+
+class EventRoute:
+    """Rota compilada de um evento do broker: eventos emitidos e decodificador opcional."""
+
+    __slots__ = ("broker_event", "event", "emits", "decoder", "authenticates")
+
+    def __init__(self, broker_event: str, event: str, decoder: Optional[DecoderFunction] = None):
+        self.broker_event = sys.intern(broker_event)
+        self.event = sys.intern(event)
+        self.emits = tuple(sys.intern(name) for name in EVENT_FANOUT.get(event, (event,)))
+        self.decoder = decoder
+        self.authenticates = event == AUTH_EVENT
+
+    def __repr__(self) -> str:
+        return f"EventRoute({self.broker_event!r} -> {self.event!r})"
+
+
+def compile_routes(
+    mapping: Optional[Mapping[str, str]] = None,
+    decoders: Optional[Mapping[str, DecoderFunction]] = None,
+) -> Dict[str, EventRoute]:
+    """Compila o mapa nome do broker -> evento interno em uma tabela de rotas com lookup O(1)."""
+    mapping = BROKER_EVENT_MAP if mapping is None else mapping
+    decoders = decoders or {}
+    return {
+        sys.intern(broker_event): EventRoute(broker_event, event, decoders.get(broker_event))
+        for broker_event, event in mapping.items()
+    }
+
+
+def coerce_message_to_text(message: Any) -> str:
+    if isinstance(message, memoryview):
+        return bytes(message).decode("utf-8", errors="ignore")
+    if isinstance(message, (bytes, bytearray)):
+        return message.decode("utf-8", errors="ignore")
+    return str(message)
+
+
+def message_preview(message: Any, limit: int = 800) -> str:
+    try:
+        text = str(message)
+    except Exception:
+        text = repr(message)
+
+    text = text.replace("\n", " ").replace("\r", " ")
+    if len(text) > limit:
+        return text[:limit] + "..."
+    return text
+
+
+class FrameRouter:
+    """Pareia, decodifica e converte frames do broker em eventos normalizados."""
+
+    def __init__(
+        self,
+        emit: EmitFunction,
+        control: Optional[ControlFunction] = None,
+        raw: Optional[RawFunction] = None,
+        raw_enabled: Optional[Callable[[], bool]] = None,
+        on_authenticated: Optional[Callable[[], None]] = None,
+        route_table: Optional[Dict[str, EventRoute]] = None,
+    ):
+        self._emit_event = emit
+        self._control = control
+        self._raw = raw
+        self._raw_enabled = raw_enabled
+        self._on_authenticated = on_authenticated
+        self.attachments = AttachmentAssembler()
+        self.frames_dispatched = 0
+        # A tabela pode ser compartilhada entre roteadores (pool, keep-alive) para que rotas extras valham em todos
+        self._routes = route_table if route_table is not None else compile_routes()
+
+        self._frame_handlers: Dict[str, Callable[[Frame], Awaitable[None]]] = {
+            FRAME_EVENT: self._on_event_frame,
+            FRAME_BINARY_EVENT: self._on_event_frame,
+            FRAME_JSON: self._on_json_frame,
+            FRAME_PAYOUT_BATCH: self._on_payout_batch_frame,
+        }
+        if control is not None:
+            for kind in CONTROL_FRAMES:
+                self._frame_handlers[kind] = control
+
+    # -------------------------------------------------------------------------
+    # Entrada
+    # -------------------------------------------------------------------------
+
+    def feed(self, message: Any) -> Any:
+        """Pareia cabeçalhos 45N- com seus anexos; retorna None enquanto o evento está incompleto."""
+        if isinstance(message, str):
+            if not message.startswith("45"):
+                return message
+            frame = decode_frame(message)
+            if frame.kind == FRAME_BINARY_EVENT:
+                # Cabeçalho 45N-: aguarda os N anexos binários antes de despachar
+                return self.attachments.begin(frame)
+            return frame
+
+        if self.attachments.pending:
+            return self.attachments.feed(message)
+        return message
+
+    async def process(self, message: Any) -> None:
+        """Pareamento, decodificação e despacho inline de um frame bruto."""
+        item = self.feed(message)
+        if item is not None:
+            await self.dispatch(item)
+
+    async def dispatch(self, item: Any) -> None:
+        try:
+            if isinstance(item, Frame):
+                frame = item
+                message: Any = item.raw
+            elif isinstance(item, str):
+                frame = decode_frame(item)
+                message = item
+            else:
+                # Frames binários avulsos são decodificados direto dos bytes
+                frame = decode_binary_frame(item)
+                message = item
+
+            self.frames_dispatched += 1
+            if self._raw is not None and (self._raw_enabled is None or self._raw_enabled()):
+                await self._raw(message)
+            logger.opt(lazy=True).debug(
+                "Received websocket message: {}",
+                lambda: message_preview(coerce_message_to_text(message), 400),
+            )
+
+            handler = self._frame_handlers.get(frame.kind)
+            if handler is not None:
+                await handler(frame)
+            elif frame.kind == FRAME_UNKNOWN:
+                logger.opt(lazy=True).debug(
+                    "Unhandled websocket frame: {}",
+                    lambda: message_preview(coerce_message_to_text(message), 200),
+                )
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error(f"Error while processing websocket message: {exc}")
+
+    def reset(self) -> None:
+        self.attachments.reset()
+
+    # -------------------------------------------------------------------------
+    # Tabela de rotas
+    # -------------------------------------------------------------------------
+
+    def add_route(self, broker_event: str, event: str, decoder: Optional[DecoderFunction] = None) -> None:
+        """Roteia um nome de evento do broker para um evento interno (substitui a rota existente)."""
+        current = self._routes.get(broker_event)
+        if decoder is None and current is not None:
+            decoder = current.decoder
+        self._routes[sys.intern(broker_event)] = EventRoute(broker_event, event, decoder)
+
+    def set_decoder(self, broker_event: str, decoder: Optional[DecoderFunction]) -> None:
+        """Define o decodificador aplicado ao payload de um evento roteado antes da emissão."""
+        route = self._routes.get(broker_event)
+        if route is None:
+            raise KeyError(f"No route for broker event: {broker_event}")
+        route.decoder = decoder
+
+    @property
+    def route_table(self) -> Dict[str, EventRoute]:
+        return self._routes
+
+    # -------------------------------------------------------------------------
+    # Frames de dados
+    # -------------------------------------------------------------------------
+
+    async def _on_event_frame(self, frame: Frame) -> None:
+        if frame.event == "NotAuthorized":
+            logger.error("PocketOption auth failed: invalid SSID")
+            await self._emit_event("auth_error", {"message": "SSID inválido"})
+            return
+
+        await self._handle_json_message(frame.data, raw_message=frame.raw)
+
+    async def _on_json_frame(self, frame: Frame) -> None:
+        await self._handle_json_like_payload(frame.data, raw_message=frame.raw)
+
+    async def _on_payout_batch_frame(self, frame: Frame) -> None:
+        await self._handle_payout_batch(frame.data)
+
+    async def _handle_json_like_payload(self, data: Any, raw_message: Optional[str] = None) -> None:
+        if isinstance(data, list):
+            # Standard socket event format: ["event", payload]
+            if len(data) >= 1 and isinstance(data[0], str):
+                await self._handle_json_message(data, raw_message=raw_message)
+                return
+
+            # Array payload that may contain multiple [5, ...] entries or mixed chunks
+            if self._looks_like_payout_batch(data):
+                await self._handle_payout_batch(data)
+                return
+
+            await self._emit_event(
+                "json_data",
+                {
+                    "_event": "list_payload",
+                    "payload": data,
+                    "_raw_message": raw_message,
+                },
+            )
+            return
+
+        if isinstance(data, dict):
+            payload = dict(data)
+            if raw_message is not None:
+                payload.setdefault("_raw_message", raw_message)
+
+            await self._emit_event("json_data", payload)
+
+            if "balance" in payload:
+                balance_data = {
+                    "balance": payload.get("balance"),
+                    "currency": payload.get("currency", "USD"),
+                    "is_demo": bool(payload.get("isDemo", payload.get("is_demo", 1))),
+                    "uid": payload.get("uid"),
+                }
+                await self._emit_event("balance_data", balance_data)
+                await self._emit_event("balance_updated", balance_data)
+
+            if self._looks_like_assets_payload(payload):
+                await self._emit_event("assets", payload)
+                await self._emit_event("assets_received", payload)
+
+            if self._looks_like_single_payout_payload(payload):
+                await self._emit_event("payout_update", self._normalize_single_payout_payload(payload))
+
+            return
+
+        await self._emit_event(
+            "unknown_event",
+            {
+                "type": "unhandled_json_payload",
+                "data": data,
+                "raw_message": raw_message,
+            },
+        )
+
+    async def _handle_json_message(self, data: List[Any], raw_message: Optional[str] = None) -> None:
+        if not data:
+            return
+
+        event_type = data[0]
+        event_data = data[1] if len(data) > 1 else {}
+
+        route = self._routes.get(event_type)
+        if route is None:
+            # payload desconhecido, mas preservado (json_data segue valendo para todo evento)
+            await self._emit_json_data(event_type, event_data, raw_message)
+            await self._emit_event(
+                "unknown_event",
+                {
+                    "type": event_type,
+                    "data": event_data,
+                    "raw_message": raw_message,
+                },
+            )
+            return
+
+        if route.decoder is not None:
+            event_data = route.decoder(event_data)
+
+        await self._emit_json_data(route.broker_event, event_data, raw_message)
+
+        if route.authenticates and self._on_authenticated is not None:
+            self._on_authenticated()
+
+        for event in route.emits:
+            await self._emit_event(event, event_data)
+
+    async def _emit_json_data(self, event_type: Any, event_data: Any, raw_message: Optional[str]) -> None:
+        if isinstance(event_data, dict):
+            payload = dict(event_data)
+            payload.setdefault("_event", event_type)
+            if raw_message is not None:
+                payload.setdefault("_raw_message", raw_message)
+            await self._emit_event("json_data", payload)
+        else:
+            await self._emit_event(
+                "json_data",
+                {
+                    "_event": event_type,
+                    "payload": event_data,
+                    "_raw_message": raw_message,
+                },
+            )
+
+    async def _handle_payout_batch(self, parsed: Any) -> None:
+        if not isinstance(parsed, list):
+            return
+
+        for item in parsed:
+            normalized = self._normalize_payout_entry(item)
+            if normalized is not None:
+                await self._emit_event("payout_update", normalized)
+
+    def _normalize_payout_entry(self, item: Any) -> Optional[Dict[str, Any]]:
+        try:
+            if not isinstance(item, list) or len(item) < 2:
+                return None
+
+            if item[0] != 5:
+                return None
+
+            inner = item[1]
+            if not isinstance(inner, list) or len(inner) < 6:
+                return None
+
+            return {
+                "id": inner[0],
+                "symbol": inner[1] if len(inner) > 1 else None,
+                "name": inner[2] if len(inner) > 2 else None,
+                "type": inner[3] if len(inner) > 3 else None,
+                "is_open": inner[4] if len(inner) > 4 else None,
+                "payout": inner[5] if len(inner) > 5 else None,
+                "raw": inner,
+            }
+        except Exception:
+            return None
+
+    # -------------------------------------------------------------------------
+    # Heuristics for unknown payloads
+    # -------------------------------------------------------------------------
+
+    def _looks_like_assets_payload(self, payload: Dict[str, Any]) -> bool:
+        if not isinstance(payload, dict):
+            return False
+
+        if any(key in payload for key in ("assets", "asset", "symbols", "instruments")):
+            return True
+
+        if "data" in payload and isinstance(payload["data"], list):
+            sample = payload["data"][0] if payload["data"] else None
+            if isinstance(sample, dict) and any(k in sample for k in ("symbol", "asset", "name", "payout")):
+                return True
+
+        return False
+
+    def _looks_like_single_payout_payload(self, payload: Dict[str, Any]) -> bool:
+        if not isinstance(payload, dict):
+            return False
+
+        has_asset = any(key in payload for key in ("symbol", "asset", "name"))
+        has_payout = any(key in payload for key in ("payout", "profit", "rate"))
+        return has_asset and has_payout
+
+    def _normalize_single_payout_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": payload.get("id"),
+            "symbol": payload.get("symbol") or payload.get("asset"),
+            "name": payload.get("name"),
+            "type": payload.get("type"),
+            "is_open": payload.get("is_open", payload.get("open", payload.get("available"))),
+            "payout": payload.get("payout", payload.get("profit", payload.get("rate"))),
+            "raw": payload,
+        }
+
+    def _looks_like_payout_batch(self, data: List[Any]) -> bool:
+        if not isinstance(data, list) or not data:
+            return False
+
+        first = data[0]
+        return (
+            isinstance(first, list)
+            and len(first) >= 2
+            and first[0] == 5
+        )
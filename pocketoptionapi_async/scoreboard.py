@@ -0,0 +1,283 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, com placar persistente de latência por região para priorizar os endpoints mais rápidos.
+
+Descrição:
+Módulo responsável por medir e lembrar, entre execuções, o desempenho de cada endpoint WebSocket do broker. Mantém médias móveis exponenciais (EWMA) do tempo de handshake, do tempo de autenticação, do RTT de ping e da taxa de falhas por URL, persistidas em disco em JSON. A partir delas calcula a latência esperada de cada região e ordena as listas de endpoints usadas pelo cliente, pelo pool e pelo keep-alive.
+
+O que ele faz:
+- Registra handshake, autenticação, RTT de ping e falhas por endpoint
+- Mantém EWMA de cada métrica com fator de suavização configurável
+- Calcula a latência esperada penalizando endpoints instáveis
+- Ordena listas de URLs da mais rápida para a mais lenta
+- Persiste o placar em disco com escrita atômica e o recarrega na inicialização
+- Agrupa as gravações (debounce) e grava fora do event loop com asyncio.to_thread
+- Opcionalmente ignora endpoints de loopback (ignore_loopback=True)
+
+Características:
+- Arquivo padrão em ~/.pocketoptionapi/region_scoreboard.json
+- Caminho configurável por POCKETOPTION_SCOREBOARD_PATH (vazio desativa a persistência)
+- No máximo uma gravação a cada save_interval segundos enquanto o loop estiver rodando
+- Endpoints nunca medidos mantêm a ordem original e ficam após os já medidos
+- Falhas de leitura/escrita do arquivo nunca interrompem a conexão
+- Instância global compartilhada (region_scoreboard) e instâncias isoladas para testes
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- json
+- os
+- loguru
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+DEFAULT_SCOREBOARD_PATH = os.path.join(os.path.expanduser("~"), ".pocketoptionapi", "region_scoreboard.json")
+
+METRICS = ("handshake", "auth", "ping_rtt")
+
+
+def _default_path() -> Optional[str]:
+    configured = os.getenv("POCKETOPTION_SCOREBOARD_PATH")
+    if configured is None:
+        return DEFAULT_SCOREBOARD_PATH
+    configured = configured.strip()
+    return os.path.expanduser(configured) if configured else None
+
+
+def is_loopback_url(url: str) -> bool:
+    """True para endpoints locais (ex.: servidor de testes em porta efêmera)."""
+    try:
+        host = urlsplit(url).hostname
+    except ValueError:
+        return False
+    if not host:
+        return False
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class RegionScoreboard:
+    """Placar EWMA de latência e falhas por endpoint, persistido em JSON."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        alpha: float = 0.3,
+        autosave: bool = True,
+        save_interval: float = 5.0,
+        ignore_loopback: bool = False,
+    ):
+        self.path = path
+        self.alpha = min(max(float(alpha), 0.01), 1.0)
+        self.autosave = autosave
+        self.save_interval = max(0.0, float(save_interval))
+        # Para não acumular portas efêmeras de servidores locais em um placar de produção
+        self.ignore_loopback = ignore_loopback
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._save_task: Optional[asyncio.Task] = None
+        self.load()
+
+    # -------------------------------------------------------------------------
+    # Registro de medições
+    # -------------------------------------------------------------------------
+
+    def record_connect(self, url: str, handshake: Optional[float] = None, auth: Optional[float] = None) -> None:
+        if self._ignored(url):
+            return
+        entry = self._entry(url)
+        if handshake is not None:
+            self._update(entry, "handshake", handshake)
+        if auth is not None:
+            self._update(entry, "auth", auth)
+        self._update(entry, "failure_rate", 0.0)
+        entry["successes"] += 1
+        self._touch(entry)
+
+    def record_failure(self, url: str) -> None:
+        if self._ignored(url):
+            return
+        entry = self._entry(url)
+        self._update(entry, "failure_rate", 1.0)
+        entry["failures"] += 1
+        self._touch(entry)
+
+    def record_ping(self, url: str, rtt: float) -> None:
+        if self._ignored(url):
+            return
+        entry = self._entry(url)
+        self._update(entry, "ping_rtt", rtt)
+        # Ping é frequente: grava em disco junto com o próximo connect/falha ou em save()
+        entry["updated_at"] = time.time()
+        self._dirty = True
+
+    # -------------------------------------------------------------------------
+    # Consulta e ordenação
+    # -------------------------------------------------------------------------
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(url)
+        return dict(entry) if entry else None
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {url: dict(entry) for url, entry in self._entries.items()}
+
+    def expected_latency(self, url: str) -> Optional[float]:
+        """Latência esperada (s) até uma sessão utilizável, penalizada pela taxa de falhas."""
+        entry = self._entries.get(url)
+        if not entry or entry["successes"] == 0:
+            return None
+
+        latency = sum(entry.get(metric) or 0.0 for metric in METRICS)
+        failure_rate = min(entry.get("failure_rate") or 0.0, 0.95)
+        return latency / (1.0 - failure_rate)
+
+    def order(self, urls: Iterable[str]) -> List[str]:
+        """Ordena pela latência esperada; endpoints sem medição mantêm a ordem original, depois os medidos."""
+        indexed = list(enumerate(urls))
+
+        def sort_key(item: Any) -> Any:
+            index, url = item
+            expected = self.expected_latency(url)
+            if expected is not None:
+                return (0, expected, index)
+            if url in self._entries:
+                # Só falhou até agora
+                return (2, 0.0, index)
+            return (1, 0.0, index)
+
+        return [url for _, url in sorted(indexed, key=sort_key)]
+
+    def clear(self) -> None:
+        self._entries = {}
+        self._dirty = True
+        if self.autosave:
+            self._schedule_save()
+
+    # -------------------------------------------------------------------------
+    # Persistência
+    # -------------------------------------------------------------------------
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            entries = data.get("regions", {}) if isinstance(data, dict) else {}
+            self._entries = {
+                str(url): self._normalize_entry(entry)
+                for url, entry in entries.items()
+                if isinstance(entry, dict)
+            }
+        except Exception as exc:
+            logger.warning(f"Unable to load region scoreboard from {self.path}: {exc}")
+
+    def save(self) -> None:
+        """Grava o placar agora, de forma síncrona (fora de um event loop ou no encerramento)."""
+        if not self.path or not self._dirty:
+            return
+        self._dirty = False
+        if not self._write(self.path, self._payload()):
+            self._dirty = True
+
+    async def flush(self) -> None:
+        """Cancela a gravação agendada e grava as pendências em uma thread."""
+        task, self._save_task = self._save_task, None
+        if task is not None and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+        if not self.path or not self._dirty:
+            return
+        self._dirty = False
+        # O snapshot é montado no loop; só a escrita em disco vai para a thread
+        if not await asyncio.to_thread(self._write, self.path, self._payload()):
+            self._dirty = True
+
+    # -------------------------------------------------------------------------
+    # Internos
+    # -------------------------------------------------------------------------
+
+    def _ignored(self, url: str) -> bool:
+        return self.ignore_loopback and is_loopback_url(url)
+
+    def _payload(self) -> Dict[str, Any]:
+        return {"version": 1, "regions": self.snapshot()}
+
+    @staticmethod
+    def _write(path: str, payload: Dict[str, Any]) -> bool:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as exc:
+            logger.warning(f"Unable to save region scoreboard to {path}: {exc}")
+            return False
+
+    def _schedule_save(self) -> None:
+        if not self.path:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Sem event loop (scripts, testes síncronos): grava direto
+            self.save()
+            return
+        if self._save_task is None or self._save_task.done():
+            self._save_task = loop.create_task(self._save_later())
+
+    async def _save_later(self) -> None:
+        await asyncio.sleep(self.save_interval)
+        await self.flush()
+
+    def _entry(self, url: str) -> Dict[str, Any]:
+        entry = self._entries.get(url)
+        if entry is None:
+            entry = self._normalize_entry({})
+            self._entries[url] = entry
+        return entry
+
+    def _normalize_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "handshake": entry.get("handshake"),
+            "auth": entry.get("auth"),
+            "ping_rtt": entry.get("ping_rtt"),
+            "failure_rate": entry.get("failure_rate"),
+            "successes": int(entry.get("successes") or 0),
+            "failures": int(entry.get("failures") or 0),
+            "updated_at": entry.get("updated_at"),
+        }
+
+    def _update(self, entry: Dict[str, Any], metric: str, value: float) -> None:
+        previous = entry.get(metric)
+        value = float(value)
+        entry[metric] = value if previous is None else previous + self.alpha * (value - previous)
+
+    def _touch(self, entry: Dict[str, Any]) -> None:
+        entry["updated_at"] = time.time()
+        self._dirty = True
+        if self.autosave:
+            self._schedule_save()
+
+
+# Instância global utilizada por Regions, pelo transporte e pelo keep-alive
+region_scoreboard = RegionScoreboard(path=_default_path())
@@ -0,0 +1,366 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, com transporte TLS reutilizável, retomada de sessão nas reconexões e compressão permessage-deflate configurável.
+
+Descrição:
+Módulo responsável pela abertura dos sockets WebSocket usados pelo cliente, pelo pool e pelo keep-alive. Cada cliente mantém um único SSLContext pré-configurado e um cache de sessões TLS por host; ao reconectar, a sessão anterior é oferecida ao servidor para que o handshake seja retomado (abbreviated handshake) em vez de refeito por completo. A abertura é feita em fases (DNS, TCP e TLS + upgrade HTTP) para que o ganho fique visível nas métricas de conexão.
+
+O que ele faz:
+- Cria um SSLContext cliente por instância, reutilizado em todas as tentativas e reconexões
+- Guarda a última sessão TLS de cada host e a reapresenta no próximo handshake
+- Resolve DNS e abre o TCP manualmente, medindo cada fase
+- Entrega o socket já conectado ao websockets para o TLS e o upgrade HTTP
+- Contabiliza sessões oferecidas e efetivamente retomadas
+- Controla a extensão permessage-deflate (off, negotiate, require)
+- Mede bytes no fio vs. bytes decodificados e o tempo de CPU gasto inflando/comprimindo
+
+Características:
+- Mesma política de verificação da API legada (sem verificação de hostname/certificado)
+- Injeção da sessão via SSLContext.wrap_bio, ponto usado pelo asyncio ao iniciar o TLS
+- Sessões capturadas após a autenticação, quando os tickets TLS 1.3 já chegaram
+- URLs ws:// funcionam sem TLS (útil para servidores locais de teste)
+- Medição por conexão via extensão passthrough, inclusive com a compressão desligada
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- socket
+- ssl
+- zlib (via websockets)
+- websockets
+- loguru
+- Módulos internos do projeto:
+  - exceptions
+  - recorder
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import socket
+import ssl
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import websockets
+from loguru import logger
+from websockets.extensions.base import Extension
+from websockets.frames import CTRL_OPCODES, OP_CONT, Frame
+from websockets.legacy.client import WebSocketClientProtocol
+
+from .exceptions import WebSocketError
+from .recorder import RecordingClientProtocol, TrafficRecorder
+
+# -----------------------------------------------------------------------------
+# Modos de compressão (permessage-deflate)
+# -----------------------------------------------------------------------------
+
+COMPRESSION_OFF = "off"
+COMPRESSION_NEGOTIATE = "negotiate"
+COMPRESSION_REQUIRE = "require"
+
+COMPRESSION_MODES = (COMPRESSION_OFF, COMPRESSION_NEGOTIATE, COMPRESSION_REQUIRE)
+
+
+def validate_compression_mode(mode: str) -> str:
+    if mode not in COMPRESSION_MODES:
+        raise ValueError(
+            f"Invalid compression mode '{mode}' (expected one of: {', '.join(COMPRESSION_MODES)})"
+        )
+    return mode
+
+
+class TLSSessionCache:
+    """Última sessão TLS por host, com contadores de oferta e retomada."""
+
+    def __init__(self) -> None:
+        self._sessions: Dict[str, ssl.SSLSession] = {}
+        self.offered = 0
+        self.resumed = 0
+        self.full_handshakes = 0
+
+    def get(self, host: Optional[str]) -> Optional[ssl.SSLSession]:
+        if not host:
+            return None
+        return self._sessions.get(host)
+
+    def store(self, host: str, session: Optional[ssl.SSLSession]) -> None:
+        if host and session is not None:
+            self._sessions[host] = session
+
+    def discard(self, host: str) -> None:
+        self._sessions.pop(host, None)
+
+    def clear(self) -> None:
+        self._sessions.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "cached_hosts": len(self._sessions),
+            "offered": self.offered,
+            "resumed": self.resumed,
+            "full_handshakes": self.full_handshakes,
+        }
+
+
+class ResumableSSLContext(ssl.SSLContext):
+    """SSLContext que reapresenta a sessão guardada do host em cada novo handshake."""
+
+    session_cache: TLSSessionCache
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        if session is None and not server_side:
+            session = self.session_cache.get(server_hostname)
+            if session is not None:
+                self.session_cache.offered += 1
+        return super().wrap_bio(
+            incoming,
+            outgoing,
+            server_side=server_side,
+            server_hostname=server_hostname,
+            session=session,
+        )
+
+
+def create_client_ssl_context(session_cache: Optional[TLSSessionCache] = None) -> ResumableSSLContext:
+    context = ResumableSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    context.session_cache = session_cache or TLSSessionCache()
+    return context
+
+
+def remember_tls_session(websocket: WebSocketClientProtocol, context: ResumableSSLContext) -> Optional[bool]:
+    """
+    Guarda a sessão TLS do socket para a próxima reconexão ao mesmo host.
+    Retorna se o handshake atual foi retomado (None para conexões sem TLS).
+    """
+    transport = getattr(websocket, "transport", None)
+    ssl_object = transport.get_extra_info("ssl_object") if transport else None
+    if ssl_object is None:
+        return None
+
+    cache = context.session_cache
+    reused = bool(ssl_object.session_reused)
+    if reused:
+        cache.resumed += 1
+    else:
+        cache.full_handshakes += 1
+
+    try:
+        cache.store(ssl_object.server_hostname, ssl_object.session)
+    except Exception as exc:
+        logger.debug(f"Unable to cache TLS session: {exc}")
+    return reused
+
+
+async def open_websocket(
+    url: str,
+    ssl_context: ResumableSSLContext,
+    timings: Dict[str, float],
+    connect_timeout: float,
+    compression: str = COMPRESSION_NEGOTIATE,
+    recorder: Optional[TrafficRecorder] = None,
+    **connect_kwargs: Any,
+) -> WebSocketClientProtocol:
+    """
+    Abre o WebSocket em fases, preenchendo timings com dns, tcp e tls (TLS + upgrade HTTP).
+    O tempo total é limitado por connect_timeout. Com compression="off" a extensão
+    permessage-deflate não é oferecida ao servidor. O protocolo aceita um gravador de
+    tráfego, já ativo desde o primeiro frame do handshake Socket.IO.
+    """
+    validate_compression_mode(compression)
+    connect_kwargs["compression"] = None if compression == COMPRESSION_OFF else "deflate"
+    connect_kwargs["create_protocol"] = functools.partial(RecordingClientProtocol, recorder=recorder)
+    return await asyncio.wait_for(
+        _open_in_phases(url, ssl_context, timings, connect_kwargs),
+        timeout=connect_timeout,
+    )
+
+
+class CompressionStats:
+    """Contadores de compressão de uma conexão (recebido e enviado)."""
+
+    __slots__ = (
+        "mode",
+        "negotiated",
+        "parameters",
+        "frames_received",
+        "compressed_frames_received",
+        "wire_bytes_received",
+        "decoded_bytes_received",
+        "inflate_cpu_time",
+        "frames_sent",
+        "raw_bytes_sent",
+        "wire_bytes_sent",
+        "deflate_cpu_time",
+    )
+
+    def __init__(self, mode: str, negotiated: bool, parameters: Optional[str] = None):
+        self.mode = mode
+        self.negotiated = negotiated
+        self.parameters = parameters
+        self.frames_received = 0
+        self.compressed_frames_received = 0
+        self.wire_bytes_received = 0
+        self.decoded_bytes_received = 0
+        self.inflate_cpu_time = 0.0
+        self.frames_sent = 0
+        self.raw_bytes_sent = 0
+        self.wire_bytes_sent = 0
+        self.deflate_cpu_time = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        received_ratio = (
+            self.wire_bytes_received / self.decoded_bytes_received if self.decoded_bytes_received else None
+        )
+        sent_ratio = self.wire_bytes_sent / self.raw_bytes_sent if self.raw_bytes_sent else None
+        return {
+            "mode": self.mode,
+            "negotiated": self.negotiated,
+            "parameters": self.parameters,
+            "frames_received": self.frames_received,
+            "compressed_frames_received": self.compressed_frames_received,
+            "wire_bytes_received": self.wire_bytes_received,
+            "decoded_bytes_received": self.decoded_bytes_received,
+            "received_ratio": round(received_ratio, 4) if received_ratio is not None else None,
+            "inflate_cpu_ms": round(self.inflate_cpu_time * 1000.0, 3),
+            "frames_sent": self.frames_sent,
+            "raw_bytes_sent": self.raw_bytes_sent,
+            "wire_bytes_sent": self.wire_bytes_sent,
+            "sent_ratio": round(sent_ratio, 4) if sent_ratio is not None else None,
+            "deflate_cpu_ms": round(self.deflate_cpu_time * 1000.0, 3),
+        }
+
+
+class _MeteredExtension(Extension):
+    """Extensão passthrough que mede os frames antes/depois da extensão de compressão."""
+
+    def __init__(self, inner: Optional[Extension], stats: CompressionStats):
+        self.inner = inner
+        self.stats = stats
+        self._continuing_compressed = False
+
+    @property
+    def name(self) -> str:  # type: ignore[override]
+        return self.inner.name if self.inner is not None else "metered"
+
+    def decode(self, frame: Frame, *, max_size: Optional[int] = None) -> Frame:
+        if frame.opcode in CTRL_OPCODES:
+            return self.inner.decode(frame, max_size=max_size) if self.inner is not None else frame
+
+        stats = self.stats
+        wire = len(frame.data)
+        compressed = frame.rsv1 or (frame.opcode is OP_CONT and self._continuing_compressed)
+        if frame.opcode is not OP_CONT:
+            self._continuing_compressed = frame.rsv1 and not frame.fin
+        elif frame.fin:
+            self._continuing_compressed = False
+
+        if self.inner is not None and compressed:
+            started = time.thread_time()
+            frame = self.inner.decode(frame, max_size=max_size)
+            stats.inflate_cpu_time += time.thread_time() - started
+            stats.compressed_frames_received += 1
+        elif self.inner is not None:
+            frame = self.inner.decode(frame, max_size=max_size)
+
+        stats.frames_received += 1
+        stats.wire_bytes_received += wire
+        stats.decoded_bytes_received += len(frame.data)
+        return frame
+
+    def encode(self, frame: Frame) -> Frame:
+        if self.inner is None:
+            if frame.opcode not in CTRL_OPCODES:
+                self.stats.frames_sent += 1
+                self.stats.raw_bytes_sent += len(frame.data)
+                self.stats.wire_bytes_sent += len(frame.data)
+            return frame
+
+        if frame.opcode in CTRL_OPCODES:
+            return self.inner.encode(frame)
+
+        raw = len(frame.data)
+        started = time.thread_time()
+        frame = self.inner.encode(frame)
+        self.stats.deflate_cpu_time += time.thread_time() - started
+        self.stats.frames_sent += 1
+        self.stats.raw_bytes_sent += raw
+        self.stats.wire_bytes_sent += len(frame.data)
+        return frame
+
+
+def meter_compression(websocket: WebSocketClientProtocol, mode: str) -> CompressionStats:
+    """
+    Instala a medição de compressão na conexão e aplica o modo "require".
+    Levanta WebSocketError se o servidor recusou o permessage-deflate exigido.
+    """
+    extensions = list(getattr(websocket, "extensions", None) or [])
+    deflate = next((ext for ext in extensions if ext.name == "permessage-deflate"), None)
+
+    if mode == COMPRESSION_REQUIRE and deflate is None:
+        raise WebSocketError("Server did not accept permessage-deflate (compression mode 'require')")
+
+    stats = CompressionStats(mode, deflate is not None, repr(deflate) if deflate is not None else None)
+    metered = _MeteredExtension(deflate, stats)
+    if deflate is not None:
+        extensions[extensions.index(deflate)] = metered
+    else:
+        extensions.append(metered)
+    websocket.extensions = extensions
+    return stats
+
+
+async def _open_in_phases(
+    url: str,
+    ssl_context: ResumableSSLContext,
+    timings: Dict[str, float],
+    connect_kwargs: Dict[str, Any],
+) -> WebSocketClientProtocol:
+    loop = asyncio.get_running_loop()
+    parts = urlsplit(url)
+    secure = parts.scheme == "wss"
+    host = parts.hostname or ""
+    port = parts.port or (443 if secure else 80)
+
+    mark = time.perf_counter()
+    addresses = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    timings["dns"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    sock = await _connect_tcp(loop, addresses)
+    timings["tcp"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    try:
+        if secure:
+            connect_kwargs.setdefault("server_hostname", host)
+            websocket = await websockets.connect(url, sock=sock, ssl=ssl_context, **connect_kwargs)
+        else:
+            websocket = await websockets.connect(url, sock=sock, **connect_kwargs)
+    except BaseException:
+        sock.close()
+        raise
+    timings["tls"] = time.perf_counter() - mark
+    return websocket
+
+
+async def _connect_tcp(loop: asyncio.AbstractEventLoop, addresses: Any) -> socket.socket:
+    last_error: Optional[BaseException] = None
+    for family, kind, proto, _, address in addresses:
+        sock = socket.socket(family, kind, proto)
+        sock.setblocking(False)
+        try:
+            await loop.sock_connect(sock, address)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return sock
+        except BaseException as exc:
+            sock.close()
+            if not isinstance(exc, OSError):
+                raise
+            last_error = exc
+
+    raise last_error or OSError("No addresses to connect to")
@@ -32,6 +32,7 @@ Requisitos:
 - pandas
 - loguru
 - Módulos internos do projeto:
+  - codec
   - constants
   - models
 """
@@ -39,7 +40,6 @@ Requisitos:
 from __future__ import annotations
 
 import asyncio
-import json
 import time
 from datetime import datetime, timedelta, timezone
 from functools import wraps
@@ -48,6 +48,7 @@ from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Seq
 import pandas as pd
 from loguru import logger
 
+from . import codec
 from .constants import (
     ASSETS,
     TIMEFRAMES,
@@ -85,7 +86,7 @@ def format_session_id(
     if is_fast_history:
         auth_data["isFastHistory"] = True
 
-    return f'42["auth",{json.dumps(auth_data)}]'
+    return f'42["auth",{codec.dumps(auth_data)}]'
 
 
 def extract_session_id(auth_payload: str) -> str:
@@ -99,7 +100,7 @@ def extract_session_id(auth_payload: str) -> str:
         start = auth_payload.find("{")
         end = auth_payload.rfind("}") + 1
         if start != -1 and end > start:
-            data = json.loads(auth_payload[start:end])
+            data = codec.loads(auth_payload[start:end])
             return str(data.get("session", "")).strip()
     except Exception:
         pass
@@ -6,15 +6,21 @@ Descrição:
 Módulo responsável pela camada de transporte WebSocket da biblioteca. Implementa conexão, handshake Socket.IO, autenticação, envio e leitura contínua de mensagens, processamento de eventos brutos e normalizados, tratamento de payloads desconhecidos, batching opcional, estatísticas por endpoint e mecanismos auxiliares para suporte a reconexão e observabilidade do fluxo de comunicação.
 
 O que ele faz:
-- Estabelece conexão WebSocket com endpoints da Pocket Option
+- Estabelece conexão WebSocket com endpoints da Pocket Option, disputando regiões em paralelo
 - Executa handshake inicial e autenticação via SSID
 - Mantém loops de recepção e ping assíncronos
-- Envia mensagens simples ou otimizadas com batching opcional
+- Desacopla a leitura do socket do despacho via fila de entrada limitada e workers
+- Envia mensagens por um escritor único com faixas de prioridade (ordens primeiro), limites por classe e coalescência
 - Processa mensagens Socket.IO e payloads JSON heterogêneos
+- Remonta eventos binários 451- com seus anexos e os emite com o nome real do evento
+- Classifica cada frame uma única vez e despacha por tabela pré-compilada
 - Normaliza eventos de autenticação, saldo, ordens, candles, ativos e payouts
 - Emite eventos brutos, normalizados e desconhecidos para consumidores externos
+- Emite raw_message apenas quando há consumidores registrados, com amostragem opcional
 - Mantém informações de conexão e estado do transporte
 - Registra estatísticas por endpoint para futura seleção otimizada de conexão
+- Mantém um pool opcional de sockets autenticados com sharding de assinaturas entre regiões
+- Grava opcionalmente todo o tráfego do socket em arquivo de captura compacto (recorder)
 - Trata desconexões e sinaliza possibilidade de recuperação
 
 Características:
@@ -22,8 +28,10 @@ Características:
 - Handshake manual compatível com Socket.IO usado pelo broker
 - Suporte a payloads não padronizados e formatos mistos
 - Emissão separada de eventos raw, json e normalizados
-- Message batching opcional
-- Pool lógico de estatísticas de conexão
+- Escritor único de saída com prazo de flush e métricas de espera por classe de mensagem
+- Pool de conexões com roteamento por dono da assinatura e rebalanceamento em quedas
+- Contexto TLS único por cliente com retomada de sessão nas reconexões e tempos por fase (dns, tcp, tls, eio, auth)
+- Compressão permessage-deflate configurável (off, negotiate, require) com bytes no fio vs. decodificados por conexão
 - Estrutura preparada para reconexão e resiliência
 - Compatibilidade com a camada superior da biblioteca
 
@@ -34,77 +42,166 @@ Requisitos:
 - loguru
 - Módulos internos do projeto:
   - constants
+  - events
   - exceptions
+  - frames
+  - ingress
   - models
+  - outbound
+  - recorder
+  - router
+  - scoreboard
+  - transport
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
-import ssl
+import functools
 import time
-from collections import deque
+from collections import defaultdict, deque
 from datetime import datetime, timezone
-from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple
 
-import websockets
 from loguru import logger
 from websockets.exceptions import ConnectionClosed
 from websockets.legacy.client import WebSocketClientProtocol
 
 from .constants import CONNECTION_SETTINGS, DEFAULT_HEADERS
+from .events import ErrorCallback, EventBus, EventHandler
 from .exceptions import ConnectionError, WebSocketError
+from .frames import (
+    FRAME_BINARY_EVENT,
+    FRAME_CONNECT,
+    FRAME_EVENT,
+    FRAME_OPEN,
+    FRAME_PING,
+    Frame,
+    decode_frame,
+)
+from .ingress import IngressQueue
 from .models import ConnectionInfo, ConnectionStatus, ServerTime
-
-EventHandler = Callable[[Any], Union[None, Awaitable[None]]]
-
-
-class MessageBatcher:
-    """Agrupador simples de mensagens para uso opcional."""
-
-    def __init__(self, batch_size: int = 10, batch_timeout: float = 0.1):
-        self.batch_size = batch_size
-        self.batch_timeout = batch_timeout
-        self.pending_messages: Deque[str] = deque()
-        self._last_batch_time = time.time()
-        self._batch_lock = asyncio.Lock()
-
-    async def add_message(self, message: str) -> List[str]:
-        async with self._batch_lock:
-            self.pending_messages.append(message)
-            current_time = time.time()
-
-            if (
-                len(self.pending_messages) >= self.batch_size
-                or current_time - self._last_batch_time >= self.batch_timeout
-            ):
-                batch = list(self.pending_messages)
-                self.pending_messages.clear()
-                self._last_batch_time = current_time
-                return batch
-
-            return []
-
-    async def flush_batch(self) -> List[str]:
-        async with self._batch_lock:
-            if not self.pending_messages:
-                return []
-            batch = list(self.pending_messages)
-            self.pending_messages.clear()
-            self._last_batch_time = time.time()
-            return batch
+from .outbound import OutboundWriter
+from .recorder import RecordingClientProtocol, TrafficRecorder, create_traffic_recorder
+from .router import DecoderFunction, EventRoute, FrameRouter, coerce_message_to_text, message_preview
+from .scoreboard import RegionScoreboard, region_scoreboard
+from .transport import (
+    CompressionStats,
+    ResumableSSLContext,
+    create_client_ssl_context,
+    meter_compression,
+    open_websocket,
+    remember_tls_session,
+    validate_compression_mode,
+)
+
+class RawMessageSampler:
+    """Amostragem de frames brutos: 1 a cada N frames e/ou no máximo N por segundo."""
+
+    def __init__(self, every_n: Optional[int] = None, per_second: Optional[int] = None):
+        self.every_n = max(1, int(every_n)) if every_n else None
+        self.per_second = max(1, int(per_second)) if per_second else None
+        self._counter = 0
+        self._window_started_at = 0.0
+        self._window_count = 0
+
+    def should_emit(self) -> bool:
+        if self.every_n is not None:
+            self._counter += 1
+            if self._counter % self.every_n:
+                return False
+
+        if self.per_second is not None:
+            now = time.monotonic()
+            if now - self._window_started_at >= 1.0:
+                self._window_started_at = now
+                self._window_count = 0
+            if self._window_count >= self.per_second:
+                return False
+            self._window_count += 1
+
+        return True
+
+
+class _ConnectAttempt:
+    """Resultado de uma tentativa de conexão autenticada (ainda não adotada pelo cliente)."""
+
+    __slots__ = ("websocket", "handshake_frames", "buffered", "timings", "compression")
+
+    def __init__(
+        self,
+        websocket: WebSocketClientProtocol,
+        handshake_frames: List[str],
+        buffered: List[Any],
+        timings: Dict[str, float],
+        compression: Optional[CompressionStats] = None,
+    ):
+        self.websocket = websocket
+        self.handshake_frames = handshake_frames
+        self.buffered = buffered
+        self.timings = timings
+        self.compression = compression
+
+
+# Eventos de dados que os sockets secundários repassam ao barramento do socket principal
+# (json_data incluso: é nele que o cliente extrai payouts e estado do broker dos payloads dict)
+POOL_FORWARDED_EVENTS = (
+    "json_data",
+    "stream_update",
+    "history_update",
+    "candles_received",
+    "payout_update",
+    "assets",
+    "assets_received",
+)
+
+PRIMARY_MEMBER_ID = "primary"
+
+# Eventos do broker que confirmam a autenticação durante a corrida de regiões
+AUTH_SUCCESS_EVENTS = frozenset({"successauth", "authenticated", "auth"})
 
 
 class ConnectionPool:
-    """Pool lógico de estatísticas por URL para futura seleção de melhor endpoint."""
-
-    def __init__(self, max_connections: int = 3):
+    """
+    Pool de sockets autenticados com sharding de assinaturas.
+
+    O socket principal é o próprio AsyncWebSocketClient dono do pool; sockets
+    secundários são abertos com open() e repassam eventos de dados ao principal.
+    Cada assinatura (ex.: changeSymbol de um ativo/timeframe) pertence a um
+    único socket, escolhido pela menor carga, e é reenviada em outro socket
+    se o dono cair. Também mantém estatísticas por URL.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 3,
+        primary: Optional["AsyncWebSocketClient"] = None,
+        scoreboard: Optional[RegionScoreboard] = None,
+    ):
         self.max_connections = max_connections
-        self.active_connections: Dict[str, WebSocketClientProtocol] = {}
+        self.scoreboard = scoreboard or region_scoreboard
+        self.active_connections: Dict[str, "AsyncWebSocketClient"] = {}
         self.connection_stats: Dict[str, Dict[str, Any]] = {}
         self._pool_lock = asyncio.Lock()
 
+        self._primary = primary
+        self._ssid: Optional[str] = None
+        self._urls: List[str] = []
+        self._owners: Dict[str, str] = {}
+        self._subscriptions: Dict[str, str] = {}
+        self._member_sends: Dict[str, int] = defaultdict(int)
+        self._member_forwarders: Dict[str, List[Tuple[str, EventHandler]]] = {}
+        self._reopen_tasks: Dict[str, asyncio.Task] = {}
+        self._rebalances = 0
+        self._primary_hooked = False
+
+        if primary is not None:
+            self.active_connections[PRIMARY_MEMBER_ID] = primary
+
+    # -------------------------------------------------------------------------
+    # Estatísticas por URL
+    # -------------------------------------------------------------------------
+
     async def get_best_connection(self) -> Optional[str]:
         async with self._pool_lock:
             if not self.connection_stats:
@@ -118,7 +215,13 @@ class ConnectionPool:
                 ),
             )
 
-    async def update_stats(self, url: str, response_time: float, success: bool) -> None:
+    async def update_stats(
+        self,
+        url: str,
+        response_time: float,
+        success: bool,
+        phases: Optional[Dict[str, float]] = None,
+    ) -> None:
         async with self._pool_lock:
             if url not in self.connection_stats:
                 self.connection_stats[url] = {
@@ -127,11 +230,17 @@ class ConnectionPool:
                     "failures": 0,
                     "avg_response_time": 0.0,
                     "success_rate": 0.0,
+                    "phases": {},
                 }
 
             stats = self.connection_stats[url]
             stats["response_times"].append(response_time)
 
+            # Tempos por fase da conexão (connect, handshake, auth, total) em média móvel
+            for phase, elapsed in (phases or {}).items():
+                previous = stats["phases"].get(phase)
+                stats["phases"][phase] = elapsed if previous is None else previous * 0.7 + elapsed * 0.3
+
             if success:
                 stats["successes"] += 1
             else:
@@ -145,115 +254,352 @@ class ConnectionPool:
             if total_attempts > 0:
                 stats["success_rate"] = stats["successes"] / total_attempts
 
+    def rank_urls(self, urls: List[str]) -> List[str]:
+        """
+        Ordena as URLs para a próxima conexão pelo placar persistente de regiões:
+        primeiro as medidas, da menor para a maior latência esperada; depois as
+        nunca testadas, na ordem original; por último as que só falharam.
+        """
+        return self.scoreboard.order(urls)
+
+    # -------------------------------------------------------------------------
+    # Membros do pool
+    # -------------------------------------------------------------------------
+
+    @property
+    def size(self) -> int:
+        return len(self.active_connections)
+
+    async def open(self, urls: List[str], ssid: str, size: int, auth_timeout: float = 10.0) -> int:
+        """Abre sockets secundários até o pool ter `size` membros; retorna quantos estão ativos."""
+        self._urls = list(urls)
+        self._ssid = ssid
+        target = max(1, min(int(size), self.max_connections))
+
+        if self._primary is not None and not self._primary_hooked:
+            self._primary.add_event_handler("disconnected", self._on_primary_lost)
+            self._primary_hooked = True
+
+        index = 1
+        while self.size < target and index <= self.max_connections * 2:
+            member_id = f"pool-{index}"
+            index += 1
+            if member_id in self.active_connections:
+                continue
+            await self._open_member(member_id, auth_timeout)
+
+        logger.info(f"Connection pool ready with {self.size} socket(s)")
+        return self.size
+
+    async def _open_member(self, member_id: str, auth_timeout: float = 10.0) -> bool:
+        if not self._urls or self._ssid is None:
+            return False
+
+        # Rotaciona as URLs para espalhar os secundários entre as regiões permitidas
+        offset = len(self.active_connections) % len(self._urls)
+        urls = self._urls[offset:] + self._urls[:offset]
+
+        member = AsyncWebSocketClient(
+            scoreboard=self.scoreboard,
+            ssl_context=self._primary.ssl_context if self._primary else None,
+            compression=self._primary.compression_mode if self._primary else None,
+            route_table=self._primary.event_routes if self._primary else None,
+            recorder=self._primary.recorder if self._primary else None,
+        )
+        try:
+            # Sequencial e sem reordenar pelo placar para respeitar a rotação de regiões entre os membros
+            await member.connect(urls, self._ssid, race=False, rank=False)
+            if not await member.wait_for_authentication(auth_timeout):
+                raise WebSocketError("Pool socket did not authenticate in time")
+        except Exception as exc:
+            logger.warning(f"Unable to open pool socket {member_id}: {exc}")
+            try:
+                await member.disconnect()
+            except Exception:
+                pass
+            return False
+
+        self._attach_member(member_id, member)
+        return True
+
+    def _attach_member(self, member_id: str, member: "AsyncWebSocketClient") -> None:
+        forwarders: List[Tuple[str, EventHandler]] = []
+        if self._primary is not None:
+            for event in POOL_FORWARDED_EVENTS:
+                forward = functools.partial(self._primary._emit_event, event)
+                member.add_event_handler(event, forward)
+                forwarders.append((event, forward))
+
+        async def on_disconnected(_data: Any) -> None:
+            await self._on_member_lost(member_id)
+
+        member.add_event_handler("disconnected", on_disconnected)
+        forwarders.append(("disconnected", on_disconnected))
+
+        self._member_forwarders[member_id] = forwarders
+        self.active_connections[member_id] = member
+        logger.info(f"Pool socket {member_id} connected ({member.connection_info.region if member.connection_info else '?'})")
+
+    def _detach_member(self, member_id: str) -> Optional["AsyncWebSocketClient"]:
+        member = self.active_connections.pop(member_id, None)
+        for event, handler in self._member_forwarders.pop(member_id, []):
+            if member is not None:
+                member.remove_event_handler(event, handler)
+        return member
+
+    def _member_alive(self, member_id: str) -> bool:
+        member = self.active_connections.get(member_id)
+        return member is not None and member.is_connected
+
+    def _member_load(self, member_id: str) -> int:
+        return sum(1 for owner in self._owners.values() if owner == member_id)
+
+    def _least_loaded_member(self, exclude: Optional[str] = None) -> Optional[str]:
+        candidates = [
+            member_id
+            for member_id in self.active_connections
+            if member_id != exclude and self._member_alive(member_id)
+        ]
+        if not candidates:
+            return None
+        # Empate favorece o principal, que já é o destino das demais mensagens
+        return min(candidates, key=lambda member_id: (self._member_load(member_id), member_id != PRIMARY_MEMBER_ID))
+
+    # -------------------------------------------------------------------------
+    # Assinaturas e roteamento
+    # -------------------------------------------------------------------------
+
+    async def subscribe(self, key: str, message: str) -> str:
+        """Envia uma assinatura no socket dono da chave (ou no menos carregado) e registra a posse."""
+        owner = self._owners.get(key)
+        if owner is not None and not self._member_alive(owner):
+            await self._on_member_lost(owner)
+            owner = self._owners.get(key)
+        if owner is None or not self._member_alive(owner):
+            owner = self._least_loaded_member()
+            if owner is None:
+                raise WebSocketError("No connected socket available in pool")
+            self._owners[key] = owner
+
+        self._subscriptions[key] = message
+        await self._send_on(owner, message, key)
+        return owner
+
+    def release(self, key: str) -> None:
+        self._owners.pop(key, None)
+        self._subscriptions.pop(key, None)
+
+    def owner_of(self, key: str) -> Optional[str]:
+        return self._owners.get(key)
+
+    async def send(self, message: str, key: Optional[str] = None) -> None:
+        """Roteia uma mensagem: para o dono da chave, se houver, senão para o socket principal."""
+        owner = self._owners.get(key) if key is not None else None
+        if owner is not None and not self._member_alive(owner):
+            await self._on_member_lost(owner)
+            owner = self._owners.get(key)
+        if owner is None or not self._member_alive(owner):
+            owner = PRIMARY_MEMBER_ID if self._member_alive(PRIMARY_MEMBER_ID) else self._least_loaded_member()
+        if owner is None:
+            raise WebSocketError("No connected socket available in pool")
+        await self._send_on(owner, message, key)
+
+    async def _send_on(self, member_id: str, message: str, key: Optional[str]) -> None:
+        member = self.active_connections[member_id]
+        try:
+            await member.send_message(message)
+            self._member_sends[member_id] += 1
+        except WebSocketError:
+            if self.size == 1:
+                raise
+            await self._on_member_lost(member_id)
+            if key is not None and key in self._subscriptions:
+                # A assinatura já foi reenviada no novo dono durante o rebalanceamento
+                return
+            fallback = self._least_loaded_member(exclude=member_id)
+            if fallback is None:
+                raise
+            await self._send_on(fallback, message, None)
+
+    async def _on_member_lost(self, member_id: str) -> None:
+        """Move as assinaturas de um socket morto para os restantes e reenvia."""
+        orphaned = [key for key, owner in self._owners.items() if owner == member_id]
+        if member_id != PRIMARY_MEMBER_ID:
+            self._detach_member(member_id)
+            self._schedule_reopen(member_id)
+
+        if not orphaned:
+            return
+
+        self._rebalances += 1
+        logger.warning(f"Pool socket {member_id} lost; moving {len(orphaned)} subscription(s)")
+        for key in orphaned:
+            new_owner = self._least_loaded_member(exclude=member_id)
+            if new_owner is None:
+                self._owners.pop(key, None)
+                continue
+            self._owners[key] = new_owner
+            try:
+                await self._send_on(new_owner, self._subscriptions[key], key)
+            except Exception as exc:
+                logger.warning(f"Unable to move subscription {key} to {new_owner}: {exc}")
+
+    async def _on_primary_lost(self, _data: Any) -> None:
+        if self.size > 1:
+            await self._on_member_lost(PRIMARY_MEMBER_ID)
+
+    def _schedule_reopen(self, member_id: str) -> None:
+        if self._ssid is None or member_id in self._reopen_tasks:
+            return
+
+        async def reopen() -> None:
+            try:
+                await asyncio.sleep(CONNECTION_SETTINGS["reconnect_delay"])
+                await self._open_member(member_id)
+            finally:
+                self._reopen_tasks.pop(member_id, None)
+
+        self._reopen_tasks[member_id] = asyncio.create_task(reopen())
+
+    async def close(self) -> None:
+        """Fecha os sockets secundários (o principal é fechado pelo próprio dono)."""
+        for task in list(self._reopen_tasks.values()):
+            task.cancel()
+        self._reopen_tasks.clear()
+
+        for member_id in [m for m in self.active_connections if m != PRIMARY_MEMBER_ID]:
+            member = self._detach_member(member_id)
+            if member is not None:
+                try:
+                    await member.disconnect()
+                except Exception:
+                    pass
+
+        self._owners.clear()
+        self._subscriptions.clear()
+
+    def get_load_report(self) -> Dict[str, Any]:
+        members: Dict[str, Any] = {}
+        for member_id, member in self.active_connections.items():
+            info = member.connection_info
+            members[member_id] = {
+                "connected": member.is_connected,
+                "region": info.region if info else None,
+                "url": info.url if info else None,
+                "subscriptions": sorted(k for k, owner in self._owners.items() if owner == member_id),
+                "load": self._member_load(member_id),
+                "messages_sent": self._member_sends.get(member_id, 0),
+                "frames_received": member.get_ingress_stats()["enqueued"],
+                "compression": member.get_compression_stats(),
+            }
+        return {
+            "size": self.size,
+            "subscriptions": len(self._owners),
+            "rebalances": self._rebalances,
+            "members": members,
+        }
+
 
 class AsyncWebSocketClient:
     """Cliente WebSocket assíncrono principal da biblioteca."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        scoreboard: Optional[RegionScoreboard] = None,
+        ssl_context: Optional[ResumableSSLContext] = None,
+        compression: Optional[str] = None,
+        route_table: Optional[Dict[str, EventRoute]] = None,
+        recorder: Optional[TrafficRecorder] = None,
+    ):
         self.websocket: Optional[WebSocketClientProtocol] = None
         self.connection_info: Optional[ConnectionInfo] = None
         self.server_time: Optional[ServerTime] = None
 
         self._ping_task: Optional[asyncio.Task] = None
         self._receiver_task: Optional[asyncio.Task] = None
+        self._worker_tasks: List[asyncio.Task] = []
         self._running = False
 
-        self._event_handlers: Dict[str, List[EventHandler]] = {}
+        self._events = EventBus()
         self._message_queue: asyncio.Queue = asyncio.Queue()
 
         self._reconnect_attempts = 0
         self._max_reconnect_attempts = CONNECTION_SETTINGS["max_reconnect_attempts"]
 
-        self._message_batcher = MessageBatcher()
-        self._connection_pool = ConnectionPool()
+        self._writer = OutboundWriter(
+            flush_interval=CONNECTION_SETTINGS["send_flush_interval"],
+            rate_limits=CONNECTION_SETTINGS["send_rate_limits"],
+        )
+        self._scoreboard = scoreboard or region_scoreboard
+        # Um único contexto TLS por cliente: as reconexões reaproveitam a sessão do host
+        self._ssl_context = ssl_context or create_client_ssl_context()
+        self._compression_mode = validate_compression_mode(compression or CONNECTION_SETTINGS["compression"])
+        self._compression_stats: Optional[CompressionStats] = None
+        self._recorder = recorder or create_traffic_recorder()
+        self._connection_pool = ConnectionPool(primary=self, scoreboard=self._scoreboard)
         self._rate_limiter = asyncio.Semaphore(10)
         self._message_cache: Dict[str, Any] = {}
         self._cache_ttl = 5.0
 
         self._last_raw_message_at: Optional[float] = None
         self._handshake_complete = False
+        self._auth_event = asyncio.Event()
         self._last_pong_at: Optional[float] = None
 
+        # Decodificação e roteamento compartilhados com o modo persistente (keep-alive)
+        self._router = FrameRouter(
+            emit=self._emit_event,
+            control=self._on_control_frame,
+            raw=self._emit_raw_message,
+            raw_enabled=self._raw_message_handlers_present,
+            on_authenticated=self._auth_event.set,
+            route_table=route_table,
+        )
+        self._ingress_workers = max(1, int(CONNECTION_SETTINGS["ingress_workers"]))
+        self._ingress = IngressQueue(
+            maxsize=CONNECTION_SETTINGS["ingress_queue_size"],
+            policy=CONNECTION_SETTINGS["ingress_overflow_policy"],
+        )
+        self._raw_sampler: Optional[RawMessageSampler] = None
+
     # -------------------------------------------------------------------------
     # Public API
     # -------------------------------------------------------------------------
 
-    async def connect(self, urls: List[str], ssid: str) -> bool:
-        for url in urls:
-            try:
-                logger.info(f"Trying websocket connection: {url}")
-
-                ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-                ssl_context.check_hostname = False
-                ssl_context.verify_mode = ssl.CERT_NONE
-
-                started_at = time.time()
-                ws = await asyncio.wait_for(
-                    websockets.connect(
-                        url,
-                        ssl=ssl_context,
-                        extra_headers=DEFAULT_HEADERS,
-                        ping_interval=None,
-                        ping_timeout=None,
-                        close_timeout=CONNECTION_SETTINGS["close_timeout"],
-                    ),
-                    timeout=10.0,
-                )
-
-                self.websocket = ws  # type: ignore[assignment]
-                region = self._extract_region_from_url(url)
-
-                self.connection_info = ConnectionInfo(
-                    url=url,
-                    region=region,
-                    status=ConnectionStatus.CONNECTING,
-                    connected_at=datetime.now(),
-                    reconnect_attempts=self._reconnect_attempts,
-                )
-
-                await self._send_handshake(ssid)
-                await self._start_background_tasks()
-
-                elapsed = time.time() - started_at
-                await self._connection_pool.update_stats(url, elapsed, True)
-
-                self.connection_info = ConnectionInfo(
-                    url=url,
-                    region=region,
-                    status=ConnectionStatus.CONNECTED,
-                    connected_at=datetime.now(),
-                    reconnect_attempts=self._reconnect_attempts,
-                )
-
-                self._running = True
-                self._reconnect_attempts = 0
-                logger.info(f"Connected successfully to region {region}")
-                return True
-
-            except Exception as exc:
-                logger.warning(f"Connection failed for {url}: {exc}")
-                try:
-                    if self.websocket:
-                        await self.websocket.close()
-                except Exception:
-                    pass
-                self.websocket = None
-
-                try:
-                    await self._connection_pool.update_stats(url, 0.0, False)
-                except Exception:
-                    pass
+    async def connect(self, urls: List[str], ssid: str, race: bool = True, rank: bool = True) -> bool:
+        """
+        Conecta e autentica no primeiro endpoint disponível.
+
+        Com race=True, as regiões são disputadas em paralelo ("happy eyeballs"):
+        cada tentativa começa com um pequeno atraso em relação à anterior (ou
+        imediatamente, se a anterior falhar), a primeira a autenticar vence e as
+        demais são canceladas e fechadas. Com rank=False a ordem recebida é
+        mantida em vez da ordem do placar de regiões.
+        """
+        self._auth_event.clear()
+        candidates = self._connection_pool.rank_urls(urls) if rank else list(urls)
+
+        if race and len(candidates) > 1:
+            result = await self._race_connect(candidates, ssid)
+        else:
+            result = await self._sequential_connect(candidates, ssid)
 
-                continue
+        if result is None:
+            raise ConnectionError("Failed to connect to any WebSocket endpoint")
 
-        raise ConnectionError("Failed to connect to any WebSocket endpoint")
+        url, attempt = result
+        await self._adopt_connection(url, attempt)
+        return True
 
     async def disconnect(self) -> None:
         logger.info("Disconnecting websocket client...")
         self._running = False
         self._handshake_complete = False
+        self._auth_event.clear()
+        self._router.reset()
 
-        tasks = [self._ping_task, self._receiver_task]
+        tasks = [self._ping_task, self._receiver_task, *self._worker_tasks]
+        self._worker_tasks = []
         for task in tasks:
             if task and not task.done():
                 task.cancel()
@@ -264,6 +610,9 @@ class AsyncWebSocketClient:
                 except Exception:
                     pass
 
+        self._ingress.clear()
+        await self._writer.stop(WebSocketError("WebSocket is not connected"))
+
         if self.websocket:
             try:
                 await self.websocket.close()
@@ -279,50 +628,46 @@ class AsyncWebSocketClient:
                 reconnect_attempts=self.connection_info.reconnect_attempts,
             )
 
+        await self._scoreboard.flush()
+        if self._recorder is not None:
+            await self._recorder.flush()
+
     async def send_message(self, message: str) -> None:
         if not self.websocket or self.websocket.closed:
             raise WebSocketError("WebSocket is not connected")
 
         try:
-            await self.websocket.send(message)
-            logger.debug(f"Sent websocket message: {self._message_preview(message, 300)}")
+            if self._writer.running:
+                await self._writer.send(message)
+            else:
+                await self.websocket.send(message)
+            logger.opt(lazy=True).debug(
+                "Sent websocket message: {}", lambda: self._message_preview(message, 300)
+            )
         except Exception as exc:
             logger.error(f"Failed to send websocket message: {exc}")
             raise WebSocketError(f"Failed to send message: {exc}") from exc
 
     async def send_message_optimized(self, message: str) -> None:
+        """Envio com limite de concorrência e estatística de latência; a coalescência fica no escritor."""
         async with self._rate_limiter:
-            if not self.websocket or self.websocket.closed:
-                raise WebSocketError("WebSocket is not connected")
-
+            start_time = time.time()
             try:
-                start_time = time.time()
-                batch = await self._message_batcher.add_message(message)
-
-                if batch:
-                    for msg in batch:
-                        await self.websocket.send(msg)
-                        logger.debug(f"Sent batched websocket message: {self._message_preview(msg, 200)}")
-
-                response_time = time.time() - start_time
+                await self.send_message(message)
+            except WebSocketError:
                 if self.connection_info:
-                    await self._connection_pool.update_stats(
-                        self.connection_info.url,
-                        response_time,
-                        True,
-                    )
+                    await self._connection_pool.update_stats(self.connection_info.url, 0.0, False)
+                raise
 
-            except Exception as exc:
-                logger.error(f"Failed to send optimized websocket message: {exc}")
-                if self.connection_info:
-                    await self._connection_pool.update_stats(
-                        self.connection_info.url,
-                        0.0,
-                        False,
-                    )
-                raise WebSocketError(f"Failed to send message: {exc}") from exc
+            if self.connection_info:
+                await self._connection_pool.update_stats(
+                    self.connection_info.url,
+                    time.time() - start_time,
+                    True,
+                )
 
     async def receive_messages(self) -> None:
+        """Tarefa leitora: só puxa frames do socket para a fila de entrada."""
         try:
             while self._running and self.websocket:
                 try:
@@ -330,7 +675,16 @@ class AsyncWebSocketClient:
                         self.websocket.recv(),
                         timeout=CONNECTION_SETTINGS["message_timeout"],
                     )
-                    await self._process_message(message)
+                    self._last_raw_message_at = time.time()
+
+                    # Ping do servidor é respondido aqui, sem esperar a fila
+                    if message == "2":
+                        await self._on_ping_frame(None)
+                        continue
+
+                    item = self._pair_attachments(message)
+                    if item is not None:
+                        await self._ingress.put(item)
 
                 except asyncio.TimeoutError:
                     logger.debug("WebSocket receive timeout; continuing listener loop")
@@ -346,17 +700,133 @@ class AsyncWebSocketClient:
             logger.error(f"Error in receive_messages: {exc}")
             await self._handle_disconnect()
 
+    def configure_ingress(
+        self,
+        queue_size: Optional[int] = None,
+        overflow_policy: Optional[str] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        """Ajusta a fila de entrada (tamanho, política de overflow e workers) antes de conectar."""
+        if self._worker_tasks:
+            raise WebSocketError("Ingress pipeline cannot be reconfigured while connected")
+
+        self._ingress = IngressQueue(
+            maxsize=queue_size if queue_size is not None else self._ingress.maxsize,
+            policy=overflow_policy or self._ingress.policy,
+        )
+        if workers is not None:
+            self._ingress_workers = max(1, int(workers))
+
+    def get_ingress_stats(self) -> Dict[str, Any]:
+        stats = self._ingress.get_stats()
+        stats["workers"] = self._ingress_workers
+        stats["attachments_dropped"] = self._router.attachments.dropped
+        return stats
+
+    def configure_outbound(
+        self,
+        flush_interval: Optional[float] = None,
+        rate_limits: Optional[Dict[str, Tuple[float, Optional[float]]]] = None,
+    ) -> None:
+        """Ajusta o prazo de coalescência e os limites de taxa por classe (rate None remove o limite)."""
+        if flush_interval is not None:
+            self._writer.flush_interval = max(0.0, float(flush_interval))
+        for message_class, (rate, burst) in (rate_limits or {}).items():
+            self._writer.set_rate_limit(message_class, rate, burst)
+
+    def get_outbound_stats(self) -> Dict[str, Any]:
+        return self._writer.get_stats()
+
+    def configure_compression(self, mode: str) -> None:
+        """Define o modo permessage-deflate (off, negotiate, require) usado nas próximas conexões."""
+        self._compression_mode = validate_compression_mode(mode)
+
+    @property
+    def compression_mode(self) -> str:
+        return self._compression_mode
+
+    def get_compression_stats(self) -> Dict[str, Any]:
+        if self._compression_stats is None:
+            return {"mode": self._compression_mode, "negotiated": None}
+        return self._compression_stats.get_stats()
+
+    def start_recording(self, path: Optional[str] = None, recorder: Optional[TrafficRecorder] = None) -> TrafficRecorder:
+        """Passa a gravar o tráfego (inclusive no socket já aberto e nos membros do pool)."""
+        if recorder is None:
+            recorder = create_traffic_recorder(path) if path else self._recorder
+        if recorder is None:
+            raise ValueError("A capture path or recorder is required")
+
+        self._recorder = recorder
+        for member in self._connection_pool.active_connections.values():
+            member._recorder = recorder
+        for client in (self, *self._connection_pool.active_connections.values()):
+            if isinstance(client.websocket, RecordingClientProtocol):
+                client.websocket.recorder = recorder
+        return recorder
+
+    async def stop_recording(self) -> Optional[Dict[str, Any]]:
+        """Desliga a gravação, fecha o arquivo e retorna as estatísticas finais."""
+        recorder, self._recorder = self._recorder, None
+        if recorder is None:
+            return None
+        for client in (self, *self._connection_pool.active_connections.values()):
+            client._recorder = None
+            if isinstance(client.websocket, RecordingClientProtocol):
+                client.websocket.recorder = None
+        await recorder.close()
+        return recorder.get_stats()
+
+    @property
+    def recorder(self) -> Optional[TrafficRecorder]:
+        return self._recorder
+
+    def get_recorder_stats(self) -> Optional[Dict[str, Any]]:
+        return self._recorder.get_stats() if self._recorder is not None else None
+
+    def get_tls_stats(self) -> Dict[str, Any]:
+        return self._ssl_context.session_cache.get_stats()
+
+    @property
+    def ssl_context(self) -> ResumableSSLContext:
+        return self._ssl_context
+
     def add_event_handler(self, event: str, handler: EventHandler) -> None:
-        if event not in self._event_handlers:
-            self._event_handlers[event] = []
-        self._event_handlers[event].append(handler)
+        self._events.subscribe(event, handler)
 
     def remove_event_handler(self, event: str, handler: EventHandler) -> None:
-        if event in self._event_handlers:
-            try:
-                self._event_handlers[event].remove(handler)
-            except ValueError:
-                pass
+        self._events.unsubscribe(event, handler)
+
+    def set_handler_error_callback(self, callback: Optional[ErrorCallback]) -> None:
+        """Recebe (evento, exceção) de cada handler que falhar; o erro continua isolado e registrado em log."""
+        self._events.on_error = callback
+
+    def add_event_route(self, broker_event: str, event: str, decoder: Optional[DecoderFunction] = None) -> None:
+        """Roteia um evento do broker para um evento interno; vale para o pool e o keep-alive que compartilham a tabela."""
+        self._router.add_route(broker_event, event, decoder)
+
+    def set_event_decoder(self, broker_event: str, decoder: Optional[DecoderFunction]) -> None:
+        self._router.set_decoder(broker_event, decoder)
+
+    @property
+    def event_routes(self) -> Dict[str, EventRoute]:
+        return self._router.route_table
+
+    @property
+    def connection_pool(self) -> ConnectionPool:
+        return self._connection_pool
+
+    @property
+    def is_authenticated(self) -> bool:
+        return self._auth_event.is_set()
+
+    async def wait_for_authentication(self, timeout: float = 10.0) -> bool:
+        """Aguarda o successauth do broker neste socket; retorna False em timeout."""
+        try:
+            await asyncio.wait_for(self._auth_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     @property
     def is_connected(self) -> bool:
@@ -368,61 +838,223 @@ class AsyncWebSocketClient:
         )
 
     # -------------------------------------------------------------------------
-    # Handshake / background tasks
+    # Connection attempts (sequential / racing)
     # -------------------------------------------------------------------------
 
-    async def _send_handshake(self, ssid: str) -> None:
-        if not self.websocket:
-            raise WebSocketError("WebSocket is not connected during handshake")
+    async def _sequential_connect(self, urls: List[str], ssid: str) -> Optional[Tuple[str, "_ConnectAttempt"]]:
+        for url in urls:
+            logger.info(f"Trying websocket connection: {url}")
+            try:
+                attempt = await self._attempt_connection(url, ssid)
+            except Exception as exc:
+                logger.warning(f"Connection failed for {url}: {exc}")
+                await self._record_attempt_failure(url)
+                continue
+
+            await self._record_attempt_success(url, attempt)
+            return url, attempt
+        return None
+
+    async def _race_connect(self, urls: List[str], ssid: str) -> Optional[Tuple[str, "_ConnectAttempt"]]:
+        stagger = CONNECTION_SETTINGS["connect_stagger"]
+        queue = list(urls)
+        pending: Dict[asyncio.Task, str] = {}
+        winner: Optional[Tuple[str, _ConnectAttempt]] = None
 
         try:
-            logger.debug("Waiting for initial Socket.IO handshake packet...")
-            initial_message = await asyncio.wait_for(self.websocket.recv(), timeout=10.0)
-            initial_message = self._coerce_message_to_text(initial_message)
-            await self._emit_raw_message(initial_message)
+            while winner is None and (queue or pending):
+                if queue:
+                    url = queue.pop(0)
+                    logger.info(f"Racing websocket connection: {url}")
+                    pending[asyncio.create_task(self._attempt_connection(url, ssid))] = url
+
+                done, _ = await asyncio.wait(
+                    pending.keys(),
+                    timeout=stagger if queue else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
 
-            logger.debug(f"Initial handshake packet: {self._message_preview(initial_message)}")
+                for task in done:
+                    url = pending.pop(task)
+                    try:
+                        attempt = task.result()
+                    except Exception as exc:
+                        logger.warning(f"Connection failed for {url}: {exc}")
+                        await self._record_attempt_failure(url)
+                        continue
+
+                    await self._record_attempt_success(url, attempt)
+                    if winner is None:
+                        winner = (url, attempt)
+                    else:
+                        # Duas tentativas concluídas no mesmo ciclo: fica a primeira
+                        await self._close_quietly(attempt.websocket)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
 
-            if initial_message.startswith("0") and "sid" in initial_message:
-                await self.websocket.send("40")
-                logger.debug("Sent Socket.IO open packet: 40")
+        if winner is not None:
+            logger.info(f"Region race won by {winner[0]} in {winner[1].timings['total'] * 1000:.0f} ms")
+        return winner
 
-                conn_message = await asyncio.wait_for(self.websocket.recv(), timeout=10.0)
-                conn_message = self._coerce_message_to_text(conn_message)
-                await self._emit_raw_message(conn_message)
+    async def _attempt_connection(self, url: str, ssid: str) -> "_ConnectAttempt":
+        """Conecta, executa o handshake e aguarda o successauth; fecha o socket se falhar ou for cancelada."""
+        timings: Dict[str, float] = {}
+        websocket: Optional[WebSocketClientProtocol] = None
+        started = time.perf_counter()
 
-                logger.debug(f"Socket.IO connect response: {self._message_preview(conn_message)}")
+        try:
+            websocket = await open_websocket(
+                url,
+                self._ssl_context,
+                timings,
+                CONNECTION_SETTINGS["connect_timeout"],
+                compression=self._compression_mode,
+                recorder=self._recorder,
+                extra_headers=DEFAULT_HEADERS,
+                ping_interval=None,
+                ping_timeout=None,
+                close_timeout=CONNECTION_SETTINGS["close_timeout"],
+            )
+            compression = meter_compression(websocket, self._compression_mode)
+            mark = time.perf_counter()
 
-                if conn_message.startswith("40"):
-                    if self.connection_info:
-                        self.connection_info = ConnectionInfo(
-                            url=self.connection_info.url,
-                            region=self.connection_info.region,
-                            status=ConnectionStatus.AUTHENTICATING,
-                            connected_at=self.connection_info.connected_at,
-                            reconnect_attempts=self.connection_info.reconnect_attempts,
-                        )
+            handshake_frames = await asyncio.wait_for(
+                self._perform_handshake(websocket, ssid),
+                timeout=CONNECTION_SETTINGS["handshake_timeout"],
+            )
+            timings["eio"] = time.perf_counter() - mark
+            mark = time.perf_counter()
 
-                    await self.websocket.send(ssid)
-                    self._handshake_complete = True
-                    logger.debug("SSID auth payload sent successfully")
-                else:
-                    raise WebSocketError(
-                        f"Unexpected Socket.IO connect response: {self._message_preview(conn_message, 200)}"
-                    )
-            else:
-                raise WebSocketError(
-                    f"Unexpected initial handshake payload: {self._message_preview(initial_message, 200)}"
-                )
+            buffered = await asyncio.wait_for(
+                self._await_authentication(websocket),
+                timeout=CONNECTION_SETTINGS["auth_timeout"],
+            )
+            timings["auth"] = time.perf_counter() - mark
+            remember_tls_session(websocket, self._ssl_context)
+            timings["total"] = time.perf_counter() - started
 
-        except asyncio.TimeoutError as exc:
-            logger.error("Handshake timeout")
-            raise WebSocketError("Timeout during websocket handshake") from exc
-        except Exception:
+            return _ConnectAttempt(websocket, handshake_frames, buffered, timings, compression)
+
+        except BaseException as exc:
+            if websocket is not None:
+                await self._close_quietly(websocket)
+            if isinstance(exc, asyncio.TimeoutError):
+                raise WebSocketError(f"Timeout after phases {sorted(timings)}") from exc
             raise
 
-    async def _start_background_tasks(self) -> None:
+    async def _perform_handshake(self, websocket: WebSocketClientProtocol, ssid: str) -> List[str]:
+        logger.debug("Waiting for initial Socket.IO handshake packet...")
+        initial_message = self._coerce_message_to_text(await websocket.recv())
+        logger.debug(f"Initial handshake packet: {self._message_preview(initial_message)}")
+
+        if not (initial_message.startswith("0") and "sid" in initial_message):
+            raise WebSocketError(
+                f"Unexpected initial handshake payload: {self._message_preview(initial_message, 200)}"
+            )
+
+        await websocket.send("40")
+        logger.debug("Sent Socket.IO open packet: 40")
+
+        conn_message = self._coerce_message_to_text(await websocket.recv())
+        logger.debug(f"Socket.IO connect response: {self._message_preview(conn_message)}")
+
+        if not conn_message.startswith("40"):
+            raise WebSocketError(
+                f"Unexpected Socket.IO connect response: {self._message_preview(conn_message, 200)}"
+            )
+
+        await websocket.send(ssid)
+        logger.debug("SSID auth payload sent successfully")
+        return [initial_message, conn_message]
+
+    async def _await_authentication(self, websocket: WebSocketClientProtocol) -> List[Any]:
+        """Lê frames até o successauth, guardando-os para reprocessar no socket vencedor."""
+        buffered: List[Any] = []
+        while True:
+            message = await websocket.recv()
+            if message == "2":
+                await websocket.send("3")
+                continue
+
+            buffered.append(message)
+            if not isinstance(message, str) or not message.startswith("4"):
+                continue
+
+            # O broker confirma tanto em texto (42[...]) quanto como evento binário (451-[...] + anexo)
+            frame = decode_frame(message)
+            if frame.kind not in (FRAME_EVENT, FRAME_BINARY_EVENT):
+                continue
+            if frame.event in AUTH_SUCCESS_EVENTS:
+                for _ in range(frame.attachments if frame.kind == FRAME_BINARY_EVENT else 0):
+                    # Os anexos entram no buffer para o evento ser remontado no replay do vencedor
+                    buffered.append(await websocket.recv())
+                return buffered
+            if frame.event == "NotAuthorized":
+                raise WebSocketError("Authentication rejected: invalid SSID")
+
+    async def _adopt_connection(self, url: str, attempt: "_ConnectAttempt") -> None:
+        self.websocket = attempt.websocket
+        self._compression_stats = attempt.compression
+        region = self._extract_region_from_url(url)
+        self.connection_info = ConnectionInfo(
+            url=url,
+            region=region,
+            status=ConnectionStatus.CONNECTED,
+            connected_at=datetime.now(),
+            reconnect_attempts=self._reconnect_attempts,
+        )
+        self._handshake_complete = True
+
+        for message in attempt.handshake_frames:
+            await self._emit_raw_message(message)
+
+        # Frames recebidos antes da escolha do vencedor (inclusive o successauth) são reprocessados em ordem
+        await self._start_background_tasks(replay=attempt.buffered)
+
+        self._running = True
+        self._reconnect_attempts = 0
+        logger.info(f"Connected successfully to region {region}")
+
+    async def _record_attempt_success(self, url: str, attempt: "_ConnectAttempt") -> None:
+        timings = attempt.timings
+        await self._connection_pool.update_stats(url, timings["total"], True, timings)
+        self._scoreboard.record_connect(
+            url,
+            handshake=timings["dns"] + timings["tcp"] + timings["tls"] + timings["eio"],
+            auth=timings["auth"],
+        )
+
+    async def _record_attempt_failure(self, url: str) -> None:
+        self._scoreboard.record_failure(url)
+        try:
+            await self._connection_pool.update_stats(url, 0.0, False)
+        except Exception:
+            pass
+
+    async def _close_quietly(self, websocket: WebSocketClientProtocol) -> None:
+        try:
+            await asyncio.wait_for(websocket.close(), timeout=CONNECTION_SETTINGS["close_timeout"])
+        except BaseException:
+            pass
+
+    # -------------------------------------------------------------------------
+    # Background tasks
+    # -------------------------------------------------------------------------
+
+    async def _start_background_tasks(self, replay: Optional[List[Any]] = None) -> None:
         self._running = True
+        self._writer.start(self.websocket)
+        self._ingress.clear()
+        self._worker_tasks = [
+            asyncio.create_task(self._ingress_worker()) for _ in range(self._ingress_workers)
+        ]
+        for message in replay or ():
+            item = self._pair_attachments(message)
+            if item is not None:
+                await self._ingress.put(item)
         self._ping_task = asyncio.create_task(self._ping_loop())
         self._receiver_task = asyncio.create_task(self.receive_messages())
 
@@ -433,6 +1065,7 @@ class AsyncWebSocketClient:
 
                 if self.websocket and not self.websocket.closed:
                     await self.send_message('42["ps"]')
+                    await self._measure_ping_rtt()
 
                     if self.connection_info:
                         self.connection_info = ConnectionInfo(
@@ -450,317 +1083,97 @@ class AsyncWebSocketClient:
                 logger.error(f"Ping loop failed: {exc}")
                 break
 
-    # -------------------------------------------------------------------------
-    # Message processing
-    # -------------------------------------------------------------------------
+    async def _measure_ping_rtt(self) -> None:
+        """Mede o RTT com um ping de controle do WebSocket e alimenta o placar de regiões."""
+        if not self.websocket or not self.connection_info:
+            return
 
-    async def _process_message(self, message: Any) -> None:
         try:
-            text_message = self._coerce_message_to_text(message)
-            self._last_raw_message_at = time.time()
-
-            await self._emit_raw_message(text_message)
-            logger.debug(f"Received websocket message: {self._message_preview(text_message, 400)}")
-
-            # Socket.IO ping from server
-            if text_message == "2":
-                await self.send_message("3")
-                self._last_pong_at = time.time()
-                return
-
-            # Sometimes server sends open packet again
-            if text_message.startswith("0") and "sid" in text_message:
-                await self.send_message("40")
-                return
-
-            # Socket.IO connected
-            if text_message.startswith("40"):
-                await self._emit_event("connected", {})
-                return
-
-            # Generic 451-[...] wrapper
-            if text_message.startswith("451-["):
-                json_part = text_message.split("-", 1)[1]
-                try:
-                    data = json.loads(json_part)
-                    await self._handle_json_like_payload(data, raw_message=text_message)
-                except Exception as exc:
-                    logger.debug(f"Could not parse 451 payload: {exc}")
-                return
-
-            # Some PocketOption payloads arrive as [[5,...], [5,...]]
-            if text_message.startswith("[[5,"):
-                await self._handle_payout_message(text_message)
-                return
-
-            # Raw JSON object/array outside 42
-            if text_message.startswith("{") or text_message.startswith("["):
-                try:
-                    data = json.loads(text_message)
-                    await self._handle_json_like_payload(data, raw_message=text_message)
-                    return
-                except json.JSONDecodeError:
-                    pass
-
-            # Main socket event payload 42[...]
-            if text_message.startswith("42"):
-                if "NotAuthorized" in text_message:
-                    logger.error("PocketOption auth failed: invalid SSID")
-                    await self._emit_event("auth_error", {"message": "SSID inválido"})
-                    return
-
-                try:
-                    data = json.loads(text_message[2:])
-                    await self._handle_json_like_payload(data, raw_message=text_message)
-                except Exception as exc:
-                    logger.debug(f"Could not parse 42 payload as JSON: {exc}")
-                return
-
+            started = time.perf_counter()
+            pong_waiter = await self.websocket.ping()
+            await asyncio.wait_for(pong_waiter, CONNECTION_SETTINGS["ping_timeout"])
+            self._scoreboard.record_ping(self.connection_info.url, time.perf_counter() - started)
         except asyncio.CancelledError:
             raise
         except Exception as exc:
-            logger.error(f"Error while processing websocket message: {exc}")
+            logger.debug(f"Ping RTT measurement failed: {exc}")
 
-    async def _handle_json_like_payload(self, data: Any, raw_message: Optional[str] = None) -> None:
-        if isinstance(data, list):
-            # Standard socket event format: ["event", payload]
-            if len(data) >= 1 and isinstance(data[0], str):
-                await self._handle_json_message(data, raw_message=raw_message)
-                return
+    # -------------------------------------------------------------------------
+    # Message processing
+    # -------------------------------------------------------------------------
 
-            # Array payload that may contain multiple [5, ...] entries or mixed chunks
-            if self._looks_like_payout_batch(data):
-                await self._handle_payout_batch(data)
-                return
+    async def _ingress_worker(self) -> None:
+        while True:
+            item = await self._ingress.get()
+            await self._dispatch_item(item)
 
-            await self._emit_event(
-                "json_data",
-                {
-                    "_event": "list_payload",
-                    "payload": data,
-                    "_raw_message": raw_message,
-                },
-            )
-            return
+    def _pair_attachments(self, message: Any) -> Any:
+        return self._router.feed(message)
 
-        if isinstance(data, dict):
-            payload = dict(data)
-            if raw_message is not None:
-                payload.setdefault("_raw_message", raw_message)
+    async def _process_message(self, message: Any) -> None:
+        """Processa um frame inline (sem fila): pareamento, decodificação e despacho."""
+        self._last_raw_message_at = time.time()
+        await self._router.process(message)
 
-            await self._emit_event("json_data", payload)
+    async def _dispatch_item(self, item: Any) -> None:
+        await self._router.dispatch(item)
 
-            if "balance" in payload:
-                balance_data = {
-                    "balance": payload.get("balance"),
-                    "currency": payload.get("currency", "USD"),
-                    "is_demo": bool(payload.get("isDemo", payload.get("is_demo", 1))),
-                    "uid": payload.get("uid"),
-                }
-                await self._emit_event("balance_data", balance_data)
-                await self._emit_event("balance_updated", balance_data)
+    async def _on_control_frame(self, frame: Frame) -> None:
+        if frame.kind == FRAME_PING:
+            await self._on_ping_frame(frame)
+        elif frame.kind == FRAME_OPEN:
+            await self._on_open_frame(frame)
+        elif frame.kind == FRAME_CONNECT:
+            await self._on_connect_frame(frame)
 
-            if self._looks_like_assets_payload(payload):
-                await self._emit_event("assets", payload)
-                await self._emit_event("assets_received", payload)
+    async def _on_ping_frame(self, frame: Optional[Frame]) -> None:
+        # Socket.IO ping from server
+        await self.send_message("3")
+        self._last_pong_at = time.time()
 
-            if self._looks_like_single_payout_payload(payload):
-                await self._emit_event("payout_update", self._normalize_single_payout_payload(payload))
+    async def _on_open_frame(self, frame: Frame) -> None:
+        # Sometimes server sends open packet again
+        await self.send_message("40")
 
-            return
+    async def _on_connect_frame(self, frame: Frame) -> None:
+        await self._emit_event("connected", {})
 
-        await self._emit_event(
-            "unknown_event",
-            {
-                "type": "unhandled_json_payload",
-                "data": data,
-                "raw_message": raw_message,
-            },
-        )
-
-    async def _handle_json_message(self, data: List[Any], raw_message: Optional[str] = None) -> None:
-        if not data:
-            return
-
-        event_type = data[0]
-        event_data = data[1] if len(data) > 1 else {}
+    # -------------------------------------------------------------------------
+    # Raw event emission
+    # -------------------------------------------------------------------------
 
-        if isinstance(event_data, dict):
-            payload = dict(event_data)
-            payload.setdefault("_event", event_type)
-            if raw_message is not None:
-                payload.setdefault("_raw_message", raw_message)
-            await self._emit_event("json_data", payload)
+    def set_raw_message_sampling(
+        self,
+        every_n: Optional[int] = None,
+        per_second: Optional[int] = None,
+    ) -> None:
+        """Limita a emissão de raw_message a 1 a cada N frames e/ou N frames por segundo."""
+        if every_n is None and per_second is None:
+            self._raw_sampler = None
         else:
-            await self._emit_event(
-                "json_data",
-                {
-                    "_event": event_type,
-                    "payload": event_data,
-                    "_raw_message": raw_message,
-                },
-            )
+            self._raw_sampler = RawMessageSampler(every_n=every_n, per_second=per_second)
 
-        if event_type in {"successauth", "authenticated", "auth"}:
-            await self._emit_event("authenticated", event_data)
-            return
+    def _raw_message_handlers_present(self) -> bool:
+        return self._events.has_handlers("raw_message")
 
-        if event_type in {"successupdateBalance", "balance_updated", "balance_data", "getBalance"}:
-            await self._emit_event("balance_updated", event_data)
-            await self._emit_event("balance_data", event_data)
+    async def _emit_raw_message(self, message: Any) -> None:
+        if not self._raw_message_handlers_present():
             return
-
-        if event_type in {"successopenOrder", "order_opened", "openOrder"}:
-            await self._emit_event("order_opened", event_data)
-            return
-
-        if event_type in {"successcloseOrder", "order_closed", "closeOrder"}:
-            await self._emit_event("order_closed", event_data)
-            return
-
-        if event_type in {"updateStream", "stream_update"}:
-            await self._emit_event("stream_update", event_data)
-            return
-
-        if event_type in {"loadHistoryPeriod", "candles_received"}:
-            await self._emit_event("candles_received", event_data)
-            return
-
-        if event_type in {"updateHistoryNew", "history_update"}:
-            await self._emit_event("history_update", event_data)
+        if self._raw_sampler is not None and not self._raw_sampler.should_emit():
             return
 
-        if event_type in {"assets", "assets_received", "getAssets", "loadAssets"}:
-            await self._emit_event("assets", event_data)
-            await self._emit_event("assets_received", event_data)
-            return
-
-        # payload desconhecido, mas preservado
-        await self._emit_event(
-            "unknown_event",
-            {
-                "type": event_type,
-                "data": event_data,
-                "raw_message": raw_message,
-            },
-        )
-
-    async def _handle_payout_message(self, message: str) -> None:
-        try:
-            parsed = json.loads(message)
-            await self._handle_payout_batch(parsed)
-        except json.JSONDecodeError as exc:
-            logger.error(f"Failed to decode payout message JSON: {exc}")
-        except Exception as exc:
-            logger.error(f"Unexpected error while handling payout message: {exc}")
-
-    async def _handle_payout_batch(self, parsed: Any) -> None:
-        if not isinstance(parsed, list):
-            return
-
-        for item in parsed:
-            normalized = self._normalize_payout_entry(item)
-            if normalized is not None:
-                await self._emit_event("payout_update", normalized)
-
-    def _normalize_payout_entry(self, item: Any) -> Optional[Dict[str, Any]]:
-        try:
-            if not isinstance(item, list) or len(item) < 2:
-                return None
-
-            if item[0] != 5:
-                return None
-
-            inner = item[1]
-            if not isinstance(inner, list) or len(inner) < 6:
-                return None
-
-            return {
-                "id": inner[0],
-                "symbol": inner[1] if len(inner) > 1 else None,
-                "name": inner[2] if len(inner) > 2 else None,
-                "type": inner[3] if len(inner) > 3 else None,
-                "is_open": inner[4] if len(inner) > 4 else None,
-                "payout": inner[5] if len(inner) > 5 else None,
-                "raw": inner,
-            }
-        except Exception:
-            return None
-
-    # -------------------------------------------------------------------------
-    # Heuristics for unknown payloads
-    # -------------------------------------------------------------------------
-
-    def _looks_like_assets_payload(self, payload: Dict[str, Any]) -> bool:
-        if not isinstance(payload, dict):
-            return False
-
-        if any(key in payload for key in ("assets", "asset", "symbols", "instruments")):
-            return True
-
-        if "data" in payload and isinstance(payload["data"], list):
-            sample = payload["data"][0] if payload["data"] else None
-            if isinstance(sample, dict) and any(k in sample for k in ("symbol", "asset", "name", "payout")):
-                return True
-
-        return False
-
-    def _looks_like_single_payout_payload(self, payload: Dict[str, Any]) -> bool:
-        if not isinstance(payload, dict):
-            return False
-
-        has_asset = any(key in payload for key in ("symbol", "asset", "name"))
-        has_payout = any(key in payload for key in ("payout", "profit", "rate"))
-        return has_asset and has_payout
-
-    def _normalize_single_payout_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        return {
-            "id": payload.get("id"),
-            "symbol": payload.get("symbol") or payload.get("asset"),
-            "name": payload.get("name"),
-            "type": payload.get("type"),
-            "is_open": payload.get("is_open", payload.get("open", payload.get("available"))),
-            "payout": payload.get("payout", payload.get("profit", payload.get("rate"))),
-            "raw": payload,
-        }
-
-    def _looks_like_payout_batch(self, data: List[Any]) -> bool:
-        if not isinstance(data, list) or not data:
-            return False
-
-        first = data[0]
-        return (
-            isinstance(first, list)
-            and len(first) >= 2
-            and first[0] == 5
-        )
-
-    # -------------------------------------------------------------------------
-    # Raw event emission
-    # -------------------------------------------------------------------------
-
-    async def _emit_raw_message(self, message: str) -> None:
+        text_message = self._coerce_message_to_text(message)
         await self._emit_event(
             "raw_message",
             {
-                "message": message,
-                "preview": self._message_preview(message),
+                "message": text_message,
+                "preview": self._message_preview(text_message),
                 "received_at": datetime.utcnow().isoformat(),
             },
         )
 
     async def _emit_event(self, event: str, data: Any) -> None:
-        if event not in self._event_handlers:
-            return
-
-        for handler in list(self._event_handlers[event]):
-            try:
-                if asyncio.iscoroutinefunction(handler):
-                    await handler(data)
-                else:
-                    handler(data)
-            except Exception as exc:
-                logger.error(f"Error in event handler for {event}: {exc}")
+        await self._events.emit(event, data)
 
     # -------------------------------------------------------------------------
     # Disconnect / recovery helpers
@@ -792,22 +1205,10 @@ class AsyncWebSocketClient:
     # -------------------------------------------------------------------------
 
     def _coerce_message_to_text(self, message: Any) -> str:
-        if isinstance(message, memoryview):
-            return bytes(message).decode("utf-8", errors="ignore")
-        if isinstance(message, (bytes, bytearray)):
-            return message.decode("utf-8", errors="ignore")
-        return str(message)
+        return coerce_message_to_text(message)
 
     def _message_preview(self, message: Any, limit: int = 800) -> str:
-        try:
-            text = str(message)
-        except Exception:
-            text = repr(message)
-
-        text = text.replace("\n", " ").replace("\r", " ")
-        if len(text) > limit:
-            return text[:limit] + "..."
-        return text
+        return message_preview(message, limit)
 
     def _extract_region_from_url(self, url: str) -> str:
         try:
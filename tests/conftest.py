@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Os testes nunca gravam o placar de regiões do usuário
+os.environ["POCKETOPTION_SCOREBOARD_PATH"] = ""
+
+from loguru import logger  # noqa: E402
+
+logger.remove()
+logger.add(sys.stderr, level="WARNING")
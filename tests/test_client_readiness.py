@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+from pocketoptionapi_async.client import AsyncPocketOptionClient
+from pocketoptionapi_async.local_server import LocalBrokerServer
+
+LOCAL_SSID = '42["auth",{"session":"local","isDemo":1,"uid":1,"platform":1}]'
+
+
+def test_persistent_connect_opens_gates_without_stalling():
+    async def run() -> None:
+        async with LocalBrokerServer(tick_rate=0) as server:
+            region = server.register_region("LOCAL_TEST_PERSISTENT")
+            client = AsyncPocketOptionClient(
+                LOCAL_SSID, persistent_connection=True, enable_logging=False, auto_reconnect=False
+            )
+            try:
+                started = time.perf_counter()
+                assert await client.connect(regions=[region])
+                assert time.perf_counter() - started < 3.0
+                assert client.is_ready("authenticated", "balance", "assets")
+                assert server.stats["events"]["getBalance"] == 1
+            finally:
+                await client.disconnect()
+
+    asyncio.run(run())
+
+
+def test_failed_assets_request_does_not_start_cooldown():
+    async def run() -> None:
+        client = AsyncPocketOptionClient(LOCAL_SSID, enable_logging=False, auto_reconnect=False)
+        assert await client._send_assets_request() is False
+        assert client._last_assets_request_at is None
+        assert await client._initialize_data(timeout=0.1) == ()
+
+    asyncio.run(run())
+
+
+def test_failed_internal_handler_makes_wait_until_ready_fail_fast():
+    async def run() -> None:
+        client = AsyncPocketOptionClient(LOCAL_SSID, enable_logging=False, auto_reconnect=False)
+
+        def broken(_data):
+            raise RuntimeError("unparseable assets")
+
+        client._extract_broker_state_sections = broken
+        waiter = asyncio.ensure_future(client.wait_until_ready("assets", timeout=5.0))
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        await client._websocket._emit_event("assets", {"assets": []})
+
+        assert await waiter is False
+        assert time.perf_counter() - started < 1.0
+        assert "assets" in client.get_readiness_errors()
+
+        # Balance inválido falha o gate; uma resposta válida depois abre normalmente
+        await client._websocket._emit_event("balance_updated", {"balance": "not-a-number"})
+        assert await client.wait_until_ready("balance", timeout=5.0) is False
+        await client._websocket._emit_event("balance_updated", {"balance": 10.0})
+        assert await client.wait_until_ready("balance", timeout=0.1) is True
+        assert "balance" not in client.get_readiness_errors()
+
+    asyncio.run(run())
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from pocketoptionapi_async.client import AsyncPocketOptionClient
+from pocketoptionapi_async.constants import REGIONS
+from pocketoptionapi_async.local_server import LocalBrokerServer
+
+LOCAL_SSID = '42["auth",{"session":"local","isDemo":1,"uid":1,"platform":1}]'
+
+
+@pytest.mark.parametrize("pool_size", [2, 3])
+def test_pool_spreads_secondaries_across_regions(pool_size):
+    async def run() -> None:
+        async with LocalBrokerServer(tick_rate=0) as first, LocalBrokerServer(tick_rate=0) as second:
+            regions = [first.register_region("LOCAL_TEST_POOL_A"), second.register_region("LOCAL_TEST_POOL_B")]
+            client = AsyncPocketOptionClient(
+                LOCAL_SSID, enable_logging=False, auto_reconnect=False, pool_size=pool_size
+            )
+            try:
+                assert await client.connect(regions=regions)
+                pool = client._websocket.connection_pool
+                assert pool.size == pool_size
+
+                urls = [member.connection_info.url for member in pool.active_connections.values()]
+                primary_url = client._websocket.connection_info.url
+                other_url = next(REGIONS.get_region(name) for name in regions if REGIONS.get_region(name) != primary_url)
+                # O primeiro secundário vai para a outra região; os seguintes alternam entre as duas
+                assert urls[1] == other_url
+                assert {urls.count(url) for url in set(urls)} <= {pool_size // 2, (pool_size + 1) // 2}
+            finally:
+                await client.disconnect()
+
+    asyncio.run(run())
+
+
+def test_payout_dict_on_secondary_socket_reaches_client_caches():
+    async def run() -> None:
+        async with LocalBrokerServer(tick_rate=0) as first, LocalBrokerServer(tick_rate=0) as second:
+            regions = [first.register_region("LOCAL_TEST_POOL_A"), second.register_region("LOCAL_TEST_POOL_B")]
+            client = AsyncPocketOptionClient(LOCAL_SSID, enable_logging=False, auto_reconnect=False, pool_size=2)
+            try:
+                assert await client.connect(regions=regions)
+                pool = client._websocket.connection_pool
+                secondary_url = next(
+                    member.connection_info.url for name, member in pool.active_connections.items() if name != "primary"
+                )
+                server = first if first.url == secondary_url else second
+                asset = client._normalize_asset_name_for_payout("LOCALPOOL_otc")
+                assert asset not in client._payouts_cache
+
+                # Só o socket secundário recebe o frame; o primário está no outro servidor
+                frame = '42["updateStream",{"99999":{"symbol":"LOCALPOOL_otc","payout":77,"is_open":true}}]'
+                for session in list(server._sessions):
+                    if session.authenticated:
+                        session.send(frame)
+                for _ in range(50):
+                    if asset in client._payouts_cache:
+                        break
+                    await asyncio.sleep(0.02)
+
+                assert client._payouts_cache[asset] == 77
+            finally:
+                await client.disconnect()
+
+    asyncio.run(run())
@@ -0,0 +1,35 @@
+import asyncio
+
+from pocketoptionapi_async.events import EventBus
+
+
+def test_failing_handler_is_reported_and_isolated():
+    async def run() -> None:
+        errors = []
+        received = []
+        bus = EventBus(log_errors=False, on_error=lambda event, exc: errors.append((event, str(exc))))
+
+        def broken(_data):
+            raise ValueError("boom")
+
+        bus.subscribe("tick", broken)
+        bus.subscribe("tick", received.append)
+        await bus.emit("tick", 1)
+        await bus.emit("tick", 2, concurrent=True)
+
+        assert received == [1, 2]
+        assert errors == [("tick", "boom"), ("tick", "boom")]
+
+    asyncio.run(run())
+
+
+def test_failing_error_callback_does_not_escape():
+    async def run() -> None:
+        def callback(_event, _exc):
+            raise RuntimeError("callback broke")
+
+        bus = EventBus(log_errors=False, on_error=callback)
+        bus.subscribe("tick", lambda _data: 1 / 0)
+        await bus.emit("tick", None)
+
+    asyncio.run(run())
@@ -0,0 +1,107 @@
+import pytest
+
+from pocketoptionapi_async import codec
+from pocketoptionapi_async.frames import (
+    FRAME_ACK,
+    FRAME_BINARY_EVENT,
+    FRAME_CONNECT,
+    FRAME_EVENT,
+    FRAME_JSON,
+    FRAME_OPEN,
+    FRAME_PAYOUT_BATCH,
+    FRAME_PING,
+    FRAME_PONG,
+    FRAME_UNKNOWN,
+    AttachmentAssembler,
+    decode_binary_frame,
+    decode_frame,
+)
+
+
+@pytest.mark.parametrize(
+    "text, kind",
+    [
+        ('0{"sid":"abc","pingInterval":25000}', FRAME_OPEN),
+        ("2", FRAME_PING),
+        ("3", FRAME_PONG),
+        ('40{"sid":"xyz"}', FRAME_CONNECT),
+        ('430[{"ok":true}]', FRAME_ACK),
+        ('{"balance":10}', FRAME_JSON),
+        ('[[5,["#AAPL","AAPL","Apple","stock",true,85]]]', FRAME_PAYOUT_BATCH),
+        ("", FRAME_UNKNOWN),
+        ("0 no session", FRAME_UNKNOWN),
+        ("22", FRAME_UNKNOWN),
+        ('42["broken"', FRAME_UNKNOWN),
+        ("hello", FRAME_UNKNOWN),
+    ],
+)
+def test_decode_frame_classifies_by_packet_type(text, kind):
+    assert decode_frame(text).kind == kind
+
+
+def test_decode_frame_decodes_event_payload_once():
+    frame = decode_frame('42["successupdateBalance",{"balance":12.5}]')
+    assert frame.kind == FRAME_EVENT
+    assert frame.event == "successupdateBalance"
+    assert frame.data == ["successupdateBalance", {"balance": 12.5}]
+    assert frame.raw == '42["successupdateBalance",{"balance":12.5}]'
+
+
+def test_event_without_name_is_plain_json():
+    frame = decode_frame("42[1,2]")
+    assert frame.kind == FRAME_JSON
+    assert frame.data == [1, 2]
+
+
+def test_decode_binary_frame_reads_bytes_directly():
+    assert decode_binary_frame(b'["updateStream",[1]]').event == "updateStream"
+    assert decode_binary_frame(memoryview(b'[[5,["#X","X"]]]')).kind == FRAME_PAYOUT_BATCH
+    assert decode_binary_frame(bytearray(b'{"a":1}')).data == {"a": 1}
+    assert decode_binary_frame(b"\x00\x01").kind == FRAME_UNKNOWN
+
+
+def test_binary_event_header_carries_attachment_count():
+    frame = decode_frame('451-["successauth",{"_placeholder":true,"num":0}]')
+    assert frame.kind == FRAME_BINARY_EVENT
+    assert frame.event == "successauth"
+    assert frame.attachments == 1
+    assert decode_frame('45x-["a",{}]').kind == FRAME_UNKNOWN
+
+
+def test_assembler_fills_placeholders_with_attachments():
+    assembler = AttachmentAssembler()
+    header = decode_frame('452-["successupdateBalance",[{"_placeholder":true,"num":1},{"_placeholder":true,"num":0}]]')
+
+    assert assembler.begin(header) is None
+    assert assembler.pending
+    assert assembler.feed(codec.dumps_bytes({"balance": 1})) is None
+    frame = assembler.feed(b"\xff\xfe")
+
+    assert not assembler.pending
+    assert frame.kind == FRAME_EVENT
+    assert frame.data == ["successupdateBalance", [b"\xff\xfe", {"balance": 1}]]
+
+
+def test_assembler_pairs_binary_successauth():
+    assembler = AttachmentAssembler()
+    assert assembler.begin(decode_frame('451-["successauth",{"_placeholder":true,"num":0}]')) is None
+    frame = assembler.feed(memoryview(codec.dumps_bytes({"id": "abc"})))
+    assert frame.event == "successauth"
+    assert frame.data == ["successauth", {"id": "abc"}]
+
+
+def test_assembler_drops_incomplete_event_on_new_header():
+    assembler = AttachmentAssembler()
+    assembler.begin(decode_frame('452-["first",{"_placeholder":true,"num":0}]'))
+    assembler.feed(b"{}")
+    assert assembler.begin(decode_frame('451-["second",{"_placeholder":true,"num":0}]')) is None
+    assert assembler.dropped == 1
+    assert assembler.feed(b"[1]").data == ["second", [1]]
+
+
+def test_assembler_ignores_stray_attachments_and_zero_count_headers():
+    assembler = AttachmentAssembler()
+    assert assembler.feed(b"{}") is None
+    header = decode_frame('450-["noAttachments",{}]')
+    assert assembler.begin(header) is header
+    assert not assembler.pending
@@ -0,0 +1,223 @@
+import asyncio
+from typing import List, Optional, Tuple
+
+import pytest
+
+from pocketoptionapi_async.client import AsyncPocketOptionClient
+from pocketoptionapi_async.history import CandleHistoryPager, CandleRequestRegistry
+from pocketoptionapi_async.local_server import LocalBrokerServer
+from pocketoptionapi_async.models import Candle
+
+LOCAL_SSID = '42["auth",{"session":"local","isDemo":1,"uid":1,"platform":1}]'
+
+
+def test_identical_requests_share_one_flight():
+    async def run() -> None:
+        registry = CandleRequestRegistry()
+        first, first_sends = registry.join("EURUSD_otc", 60)
+        second, second_sends = registry.join("EURUSD_otc", 60)
+        other, other_sends = registry.join("GBPUSD_otc", 60)
+
+        assert (first_sends, second_sends, other_sends) == (True, False, True)
+        assert registry.resolve("EURUSD_otc", 60, ["eur"]) == 2
+        assert await first == await second == ["eur"]
+        assert not other.done()
+        assert registry.get_stats() == {"sent": 2, "coalesced": 1, "resolved": 1, "in_flight": 1}
+
+    asyncio.run(run())
+
+
+def test_responses_are_matched_by_asset_period_and_index():
+    async def run() -> None:
+        registry = CandleRequestRegistry()
+        minute, _ = registry.join("EURUSD_otc", 60, index=1)
+        five, _ = registry.join("EURUSD_otc", 300, index=1)
+        page, _ = registry.join("EURUSD_otc", 60, index=2)
+
+        assert registry.resolve("EURUSD_otc", 60, "late", index=3) == 0
+        registry.resolve("EURUSD_otc", 300, "five", index=1)
+        registry.resolve("EURUSD_otc", 60, "page", index=2)
+
+        assert (five.result(), page.result()) == ("five", "page")
+        assert not minute.done()
+        assert registry.is_pending("EURUSD_otc", 60, index=1)
+
+    asyncio.run(run())
+
+
+def test_leaving_caller_does_not_cancel_the_others():
+    async def run() -> None:
+        registry = CandleRequestRegistry()
+        first, _ = registry.join("EURUSD_otc", 60)
+        second, _ = registry.join("EURUSD_otc", 60)
+
+        registry.leave("EURUSD_otc", 60, first)
+        assert registry.is_pending("EURUSD_otc", 60)
+        registry.leave("EURUSD_otc", 60, second)
+        assert not registry.is_pending("EURUSD_otc", 60)
+        assert len(registry) == 0
+
+    asyncio.run(run())
+
+
+def test_failures_reach_every_waiter():
+    async def run() -> None:
+        registry = CandleRequestRegistry()
+        first, _ = registry.join("EURUSD_otc", 60)
+        second, _ = registry.join("EURUSD_otc", 60)
+        other, _ = registry.join("GBPUSD_otc", 60)
+
+        registry.fail("EURUSD_otc", 60, TimeoutError("no answer"))
+        for future in (first, second):
+            with pytest.raises(TimeoutError):
+                await future
+
+        registry.fail_all(ConnectionError("disconnected"))
+        with pytest.raises(ConnectionError):
+            await other
+        assert len(registry) == 0
+
+    asyncio.run(run())
+
+
+def test_next_index_follows_broker_format():
+    registry = CandleRequestRegistry()
+    indexes = [registry.next_index(1_700_000_000) for _ in range(3)]
+    assert indexes == [170_000_000_000, 170_000_000_001, 170_000_000_002]
+
+
+def test_concurrent_get_candles_get_their_own_asset():
+    # Níveis de preço bem separados: uma resposta trocada aparece no preço de fechamento
+    assets = {f"SCAN{index}_otc": 1.5 ** index for index in range(8)}
+
+    async def run() -> None:
+        server = LocalBrokerServer(latency=0.01, jitter=0.01, tick_rate=0, candle_count=50, assets=assets, seed=3)
+        async with server:
+            region = server.register_region("LOCAL_TEST_HISTORY")
+            client = AsyncPocketOptionClient(LOCAL_SSID, enable_logging=False, auto_reconnect=False)
+            assert await client.connect(regions=[region])
+            try:
+                calls = [asset for asset in assets for _ in range(3)]
+                results = await asyncio.gather(*(client.get_candles(asset, 60, 50) for asset in calls))
+                for asset, candles in zip(calls, results):
+                    assert candles
+                    assert abs(candles[-1].close / assets[asset] - 1.0) < 0.2
+                assert server.stats["events"]["changeSymbol"] == len(assets)
+            finally:
+                await client.disconnect()
+
+    asyncio.run(run())
+
+
+class FakeHistory:
+    """Histórico de 60s em [first_ts, end) com lacunas opcionais; pode cortar cada resposta ou vazar candles fora da janela."""
+
+    def __init__(self, first_ts: int, limit: Optional[int] = None, overlap: int = 0, gaps: Tuple[Tuple[int, int], ...] = ()):
+        self.first_ts = first_ts
+        self.limit = limit
+        self.overlap = overlap
+        self.gaps = gaps
+        self.requests: List[tuple] = []
+
+    async def fetch(self, end_ts: int, span: int) -> List[Candle]:
+        self.requests.append((end_ts, span))
+        await asyncio.sleep(0)
+        start = max(self.first_ts, end_ts - span)
+        stamps = list(range(start - start % 60, end_ts + self.overlap * 60, 60))
+        stamps = [ts for ts in stamps if ts >= self.first_ts and not any(lo <= ts < hi for lo, hi in self.gaps)]
+        if self.limit is not None:
+            stamps = stamps[-self.limit:]
+        return [
+            Candle(timestamp=ts, open=1.0, high=1.0, low=1.0, close=1.0, asset="EURUSD_otc", timeframe=60)
+            for ts in stamps
+        ]
+
+
+def collect(pager: CandleHistoryPager) -> List[List[int]]:
+    async def run() -> List[List[int]]:
+        return [[int(c.timestamp.timestamp()) for c in page] async for page in pager.pages()]
+
+    return asyncio.run(run())
+
+
+END = 1_700_000_000  # 1_699_999_980 é o início do candle que contém END
+
+
+def assert_contiguous_backwards(pages: List[List[int]], count: int) -> None:
+    stamps = [ts for page in pages for ts in reversed(page)]
+    assert len(stamps) == count
+    assert stamps[0] == END // 60 * 60
+    assert all(newer - older == 60 for newer, older in zip(stamps, stamps[1:]))
+
+
+def test_pager_walks_backwards_in_windows():
+    history = FakeHistory(first_ts=0)
+    pages = collect(CandleHistoryPager(history.fetch, 60, 1200, END, page_size=500, max_in_flight=2))
+
+    assert [len(page) for page in pages] == [500, 500, 200]
+    assert all(page == sorted(page) for page in pages)
+    assert_contiguous_backwards(pages, 1200)
+    assert len(history.requests) == 3
+
+
+def test_pager_drops_overlap_between_pages():
+    history = FakeHistory(first_ts=0, overlap=3)
+    pager = CandleHistoryPager(history.fetch, 60, 300, END, page_size=100, max_in_flight=3)
+    pages = collect(pager)
+
+    assert_contiguous_backwards(pages, 300)
+    assert pager.stats["discarded"] > 0
+
+
+def test_pager_refills_pages_cut_by_the_broker():
+    history = FakeHistory(first_ts=0, limit=150)
+    pager = CandleHistoryPager(history.fetch, 60, 1000, END, page_size=500, max_in_flight=2)
+    pages = collect(pager)
+
+    assert_contiguous_backwards(pages, 1000)
+    assert pager.stats["refills"] > 0
+
+
+def test_pager_stops_at_start_of_history():
+    history = FakeHistory(first_ts=END // 60 * 60 - 99 * 60)
+    pager = CandleHistoryPager(history.fetch, 60, 1000, END, page_size=40, max_in_flight=4, max_gap=2 * 3600)
+    pages = collect(pager)
+
+    assert_contiguous_backwards(pages, 100)
+    assert pager.stats["empty_pages"] == 3
+
+
+def test_pager_crosses_a_weekend_gap():
+    # ~2,5 dias sem candles depois dos 1000 mais recentes (mercado fechado)
+    gap_end = END // 60 * 60 - 999 * 60
+    gap_start = gap_end - 3600 * 60
+    history = FakeHistory(first_ts=0, gaps=((gap_start, gap_end),))
+    pager = CandleHistoryPager(history.fetch, 60, 3000, END, page_size=500, max_in_flight=4)
+    stamps = [ts for page in collect(pager) for ts in reversed(page)]
+
+    assert len(stamps) == 3000
+    steps = [newer - older for newer, older in zip(stamps, stamps[1:])]
+    assert steps.count(60) == len(steps) - 1
+    assert max(steps) == 3601 * 60
+    assert stamps[999] == gap_end and stamps[1000] == gap_start - 60
+    assert pager.stats["empty_pages"] >= 6
+
+
+def test_backfill_against_local_server_with_cut_pages():
+    async def run() -> None:
+        server = LocalBrokerServer(tick_rate=0, history_page_limit=300, seed=5)
+        async with server:
+            region = server.register_region("LOCAL_TEST_BACKFILL")
+            client = AsyncPocketOptionClient(LOCAL_SSID, enable_logging=False, auto_reconnect=False)
+            assert await client.connect(regions=[region])
+            try:
+                stamps: List[int] = []
+                async for page in client.iter_candle_pages("EURUSD_otc", 60, 2000, page_size=500, max_in_flight=4):
+                    stamps.extend(int(c.timestamp.timestamp()) for c in reversed(page))
+                assert len(stamps) == 2000
+                assert all(newer - older == 60 for newer, older in zip(stamps, stamps[1:]))
+                assert server.stats["history_pages"] > 4
+            finally:
+                await client.disconnect()
+
+    asyncio.run(run())
@@ -0,0 +1,120 @@
+import asyncio
+from typing import Any, List, Tuple
+
+from pocketoptionapi_async import codec
+from pocketoptionapi_async.connection_keep_alive import ConnectionKeepAlive
+from pocketoptionapi_async.constants import BROKER_EVENT_MAP, REGIONS
+from pocketoptionapi_async.local_server import LocalBrokerServer
+from pocketoptionapi_async.websocket_client import AsyncWebSocketClient
+
+LOCAL_SSID = '42["auth",{"session":"local","isDemo":1,"uid":1,"platform":1}]'
+
+# Frames de dados como chegam do broker (controle de transporte fica de fora: cada modo responde no seu socket)
+CORPUS: List[Any] = [
+    '42["successauth",{"id":"abc"}]',
+    '451-["successupdateBalance",{"_placeholder":true,"num":0}]',
+    codec.dumps_bytes({"balance": 1000.5, "currency": "USD", "isDemo": 1, "uid": 7}),
+    '42["updateStream",[["EURUSD_otc",1700000000,1.1]]]',
+    '451-["updateHistoryNew",{"_placeholder":true,"num":0}]',
+    codec.dumps_bytes({"asset": "EURUSD_otc", "period": 60, "history": [[1700000000, 1.1]]}),
+    '42["successopenOrder",{"id":"o1","requestId":"r1","asset":"EURUSD_otc"}]',
+    '42["successcloseOrder",{"profit":1.8,"deals":[{"id":"o1","profit":1.8}]}]',
+    '[[5,["#AAPL","AAPL","Apple","stock",true,85]]]',
+    '42["someFutureEvent",{"x":1}]',
+    '42["NotAuthorized"]',
+    b'{"balance": 12.0}',
+]
+
+EVENTS = set(BROKER_EVENT_MAP) | set(BROKER_EVENT_MAP.values()) | {
+    "json_data",
+    "unknown_event",
+    "auth_error",
+    "balance_data",
+    "assets_received",
+    "payout_update",
+}
+
+
+def record(source: Any) -> List[Tuple[str, Any]]:
+    received: List[Tuple[str, Any]] = []
+    for event in EVENTS:
+        source.add_event_handler(event, lambda data, event=event: received.append((event, data)))
+    return received
+
+
+def test_regular_and_persistent_modes_emit_identical_events():
+    async def run() -> None:
+        regular = AsyncWebSocketClient()
+        persistent = ConnectionKeepAlive(LOCAL_SSID, route_table=regular.event_routes)
+        from_regular = record(regular)
+        from_persistent = record(persistent)
+
+        for message in CORPUS:
+            await regular._process_message(message)
+            await persistent._process_message(message)
+
+        assert from_regular
+        assert from_persistent == from_regular
+        emitted = {event for event, _ in from_regular}
+        assert {"authenticated", "balance_updated", "history_update", "order_closed", "payout_update"} <= emitted
+
+    asyncio.run(run())
+
+
+def test_persistent_mode_maps_region_names_to_urls():
+    async def run() -> None:
+        persistent = ConnectionKeepAlive(LOCAL_SSID)
+        persistent.start_persistent_connection = _no_connect
+        region = next(iter(REGIONS.get_all_regions()))
+        assert await persistent.connect_with_keep_alive([region, "NOT_A_REGION"]) is False
+        assert persistent.available_urls == [REGIONS.get_region(region)]
+        assert await persistent.connect_with_keep_alive(["NOT_A_REGION"]) is False
+
+    asyncio.run(run())
+
+
+async def _no_connect() -> bool:
+    return False
+
+
+def test_orders_jump_subscription_bursts_in_both_modes():
+    order = '42["openOrder",{"asset":"EURUSD_otc","amount":1,"action":"call","isDemo":1,"requestId":"r1","time":60}]'
+    burst = [f'42["subfor","ASSET{index}_otc"]' for index in range(20)]
+
+    async def exercise(source, send) -> None:
+        wire: List[str] = []
+        socket_send = source.websocket.send
+
+        async def spy(message):
+            wire.append(message)
+            await socket_send(message)
+
+        source.websocket.send = spy
+        source.configure_outbound(rate_limits={"subscription": (50, 5)})
+        pending = [asyncio.ensure_future(send(message)) for message in burst]
+        await asyncio.sleep(0.02)
+        await send(order)
+        await asyncio.gather(*pending)
+
+        # A ordem sai logo após a rajada inicial, não atrás das 20 reassinaturas
+        assert wire.index(order) < 10
+        assert wire[-1] != order
+        assert source.get_outbound_stats()["order_enqueue_to_wire"]["max_ms"] < 50
+
+    async def run() -> None:
+        async with LocalBrokerServer(tick_rate=0) as server:
+            regular = AsyncWebSocketClient()
+            await regular.connect([server.url], LOCAL_SSID)
+            try:
+                await exercise(regular, regular.send_message)
+            finally:
+                await regular.disconnect()
+
+            persistent = ConnectionKeepAlive(LOCAL_SSID)
+            assert await persistent.connect_with_keep_alive([server.url])
+            try:
+                await exercise(persistent, persistent.send_message)
+            finally:
+                await persistent.disconnect()
+
+    asyncio.run(run())
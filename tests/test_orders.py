@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from pocketoptionapi_async.client import AsyncPocketOptionClient
+from pocketoptionapi_async.local_server import LocalBrokerServer
+from pocketoptionapi_async.models import Order, OrderDirection
+
+LOCAL_SSID = '42["auth",{"session":"local","isDemo":1,"uid":1,"platform":1}]'
+
+
+def run_with_broker(scenario, **server_options):
+    async def run() -> None:
+        async with LocalBrokerServer(tick_rate=0, seed=1, **server_options) as server:
+            region = server.register_region("LOCAL_TEST_ORDERS")
+            client = AsyncPocketOptionClient(LOCAL_SSID, enable_logging=False, auto_reconnect=False)
+            assert await client.connect(regions=[region])
+            try:
+                await scenario(client, server)
+            finally:
+                await client.disconnect()
+
+    asyncio.run(run())
+
+
+def test_concurrent_orders_resolve_by_request_id():
+    async def scenario(client, server):
+        amounts = [1 + index for index in range(20)]
+        results = await asyncio.gather(
+            *(client.place_order("EURUSD_otc", amount, OrderDirection.CALL, 60) for amount in amounts)
+        )
+
+        assert [result.amount for result in results] == amounts
+        assert all(result.error_message is None for result in results)
+        assert len({result.order_id for result in results}) == len(results)
+        assert client._order_confirmations == {}
+        assert client.get_latency_stats()["order_ack"]["count"] == len(results)
+
+    run_with_broker(scenario, latency=0.005)
+
+
+def test_unconfirmed_order_times_out_and_cleans_up():
+    async def scenario(client, server):
+        server._handlers = {name: handler for name, handler in server._handlers.items() if name != "openOrder"}
+        order = Order(asset="EURUSD_otc", amount=1, direction=OrderDirection.CALL, duration=60, request_id="req-1")
+        client._register_order_confirmation("req-1")
+        await client._send_order(order)
+
+        result = await client._wait_for_order_result("req-1", order, timeout=0.2)
+
+        assert result.error_message == "Timeout waiting for server confirmation"
+        assert client._order_confirmations == {}
+
+    run_with_broker(scenario)
+
+
+def test_pending_confirmations_fail_on_disconnect():
+    async def run() -> None:
+        client = AsyncPocketOptionClient(LOCAL_SSID, enable_logging=False, auto_reconnect=False)
+        future = client._register_order_confirmation("req-2")
+        client._resolve_order_confirmation("unknown", None)
+        assert not future.done()
+
+        client._fail_order_confirmations(ConnectionError("gone"))
+        with pytest.raises(ConnectionError):
+            await future
+        assert client._order_confirmations == {}
+
+    asyncio.run(run())
+
+
+def test_settlements_arrive_as_orders_close():
+    async def scenario(client, server):
+        durations = [30, 5, 60, 15]
+        orders = await asyncio.gather(
+            *(client.place_order("EURUSD_otc", 1, OrderDirection.PUT, duration) for duration in durations)
+        )
+        by_id = {order.order_id: order.duration for order in orders}
+
+        settled = [result async for result in client.iter_results(list(by_id), timeout=5.0)]
+
+        assert sorted(result.order_id for result in settled) == sorted(by_id)
+        assert [by_id[result.order_id] for result in settled] == sorted(durations)
+        assert all(result.status.value in ("win", "lose", "draw") for result in settled)
+        assert client._settlement_waiters == {}
+
+        # Ordem já fechada resolve na hora, sem novo successcloseOrder
+        verdict = await client.check_win(orders[0].order_id, max_wait_time=0.1)
+        assert verdict["completed"] is True
+
+    run_with_broker(scenario, order_time_scale=0.01)
+
+
+def test_wait_for_results_leaves_open_orders_as_none():
+    async def scenario(client, server):
+        quick = await client.place_order("EURUSD_otc", 1, OrderDirection.CALL, 5)
+        slow = await client.place_order("EURUSD_otc", 1, OrderDirection.CALL, 3000)
+
+        results = await client.wait_for_results([quick.order_id, slow.order_id], timeout=1.0)
+
+        assert results[quick.order_id] is not None
+        assert results[slow.order_id] is None
+        assert client._settlement_waiters == {}
+
+    run_with_broker(scenario, order_time_scale=0.01)
+
+
+def test_settlement_waiters_fail_on_disconnect():
+    async def scenario(client, server):
+        order = await client.place_order("EURUSD_otc", 1, OrderDirection.CALL, 3000)
+        waiter = asyncio.ensure_future(client.check_win(order.order_id))
+        await asyncio.sleep(0.05)
+        await client.disconnect()
+
+        verdict = await asyncio.wait_for(waiter, timeout=1.0)
+        assert verdict["completed"] is False
+
+    run_with_broker(scenario, order_time_scale=0.01)
+
+
+def test_unknown_events_do_not_touch_order_state():
+    async def scenario(client, server):
+        order = await client.place_order("EURUSD_otc", 1, OrderDirection.CALL, 3000)
+        seen = []
+        client._websocket.add_event_handler("json_data", lambda data: seen.append(data.get("_event")))
+
+        await client._websocket._process_message(
+            '42["brandNewDeals",{"deals":[{"id":"%s","profit":5}],"requestId":"ghost","asset":"X","amount":9}]'
+            % order.order_id
+        )
+        await client._websocket._process_message('42["brandNewPayouts",{"localnew":{"symbol":"LOCALNEW_otc","payout":81}}]')
+
+        assert seen == ["brandNewDeals", "brandNewPayouts"]
+        assert order.order_id in client._active_orders
+        assert "ghost" not in client._active_orders
+        assert client._payouts_cache[client._normalize_asset_name_for_payout("LOCALNEW_otc")] == 81
+
+    run_with_broker(scenario, order_time_scale=0.01)
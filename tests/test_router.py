@@ -0,0 +1,103 @@
+import asyncio
+from typing import Any, List, Tuple
+
+import pytest
+
+from pocketoptionapi_async import codec
+from pocketoptionapi_async.frames import FRAME_CONNECT, FRAME_PING, Frame
+from pocketoptionapi_async.router import FrameRouter, compile_routes
+
+
+class Recorder:
+    def __init__(self, **kwargs: Any):
+        self.events: List[Tuple[str, Any]] = []
+        self.control: List[str] = []
+        self.authenticated = 0
+        self.router = FrameRouter(
+            emit=self.emit,
+            control=self.on_control,
+            on_authenticated=self.on_authenticated,
+            **kwargs,
+        )
+
+    async def emit(self, event: str, data: Any) -> None:
+        self.events.append((event, data))
+
+    async def on_control(self, frame: Frame) -> None:
+        self.control.append(frame.kind)
+
+    def on_authenticated(self) -> None:
+        self.authenticated += 1
+
+    def names(self) -> List[str]:
+        return [event for event, _ in self.events]
+
+    def feed(self, *messages: Any) -> "Recorder":
+        async def run() -> None:
+            for message in messages:
+                await self.router.process(message)
+
+        asyncio.run(run())
+        return self
+
+
+def test_routed_event_emits_json_data_then_internal_events():
+    recorder = Recorder().feed('42["successupdateBalance",{"balance":5}]')
+    assert recorder.names() == ["json_data", "balance_updated", "balance_data"]
+    assert recorder.events[0][1]["_event"] == "successupdateBalance"
+    assert recorder.events[1][1] == {"balance": 5}
+
+
+def test_successauth_releases_authentication():
+    recorder = Recorder().feed('42["successauth",{"id":"x"}]')
+    assert recorder.authenticated == 1
+    assert recorder.names()[-1] == "authenticated"
+
+
+def test_unknown_event_is_preserved():
+    recorder = Recorder().feed('42["brandNewEvent",[1,2]]')
+    assert recorder.names() == ["json_data", "unknown_event"]
+    assert recorder.events[0][1]["_event"] == "brandNewEvent"
+    assert recorder.events[1][1]["type"] == "brandNewEvent"
+    assert recorder.events[1][1]["data"] == [1, 2]
+
+
+def test_control_frames_go_to_the_connection_owner():
+    recorder = Recorder().feed("2", '40{"sid":"x"}', "3")
+    assert recorder.control == [FRAME_PING, FRAME_CONNECT]
+    assert recorder.events == []
+
+
+def test_binary_event_is_dispatched_after_its_attachment():
+    recorder = Recorder().feed('451-["updateHistoryNew",{"_placeholder":true,"num":0}]')
+    assert recorder.events == []
+    recorder.feed(codec.dumps_bytes({"asset": "EURUSD_otc", "period": 60}))
+    assert recorder.names()[-1] == "history_update"
+    assert recorder.events[-1][1] == {"asset": "EURUSD_otc", "period": 60}
+
+
+def test_payout_batch_emits_one_update_per_entry():
+    recorder = Recorder().feed('[[5,["#A","A","Alpha","stock",true,80]],[5,["#B","B","Beta","stock",false,70]]]')
+    assert recorder.names() == ["payout_update", "payout_update"]
+    assert [data["payout"] for _, data in recorder.events] == [80, 70]
+
+
+def test_routes_and_decoders_are_shared_through_the_table():
+    table = compile_routes()
+    first = Recorder(route_table=table)
+    second = Recorder(route_table=table)
+
+    first.router.add_route("signalsUpdate", "signals")
+    second.router.set_decoder("signalsUpdate", lambda data: {"count": len(data)})
+    first.feed('42["signalsUpdate",[1,2,3]]')
+
+    assert first.events[-1] == ("signals", {"count": 3})
+    with pytest.raises(KeyError):
+        first.router.set_decoder("notRouted", None)
+
+
+def test_processing_errors_do_not_break_the_router():
+    recorder = Recorder(route_table=compile_routes({"boom": "boom"}, {"boom": lambda data: 1 / 0}))
+    recorder.feed('42["boom",{}]', '42["boom2",{}]')
+    assert recorder.names() == ["json_data", "unknown_event"]
+    assert recorder.router.frames_dispatched == 2
@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+from pocketoptionapi_async import constants, scoreboard
+from pocketoptionapi_async.constants import REGIONS
+from pocketoptionapi_async.local_server import LocalBrokerServer
+from pocketoptionapi_async.scoreboard import RegionScoreboard
+from pocketoptionapi_async.websocket_client import AsyncWebSocketClient
+
+FAST = "wss://api-fast.example.com/socket.io/?EIO=4&transport=websocket"
+SLOW = "wss://api-slow.example.com/socket.io/?EIO=4&transport=websocket"
+FLAKY = "wss://api-flaky.example.com/socket.io/?EIO=4&transport=websocket"
+DOWN = "wss://api-down.example.com/socket.io/?EIO=4&transport=websocket"
+NEW_A = "wss://api-new-a.example.com/socket.io/?EIO=4&transport=websocket"
+NEW_B = "wss://api-new-b.example.com/socket.io/?EIO=4&transport=websocket"
+
+
+def test_order_ranks_measured_then_unmeasured_then_failed():
+    board = RegionScoreboard(path=None)
+    board.record_connect(SLOW, handshake=0.4, auth=0.2)
+    board.record_connect(FAST, handshake=0.1, auth=0.05)
+    board.record_connect(FLAKY, handshake=0.1, auth=0.05)
+    board.record_failure(FLAKY)
+    board.record_failure(DOWN)
+
+    ordered = board.order([DOWN, NEW_A, SLOW, FLAKY, NEW_B, FAST])
+
+    assert ordered[:3] == [FAST, FLAKY, SLOW]
+    assert ordered[3:] == [NEW_A, NEW_B, DOWN]
+
+
+def test_loopback_endpoints_are_only_skipped_on_request():
+    local = "ws://127.0.0.1:41234/socket.io/?EIO=4&transport=websocket"
+    assert RegionScoreboard(path=None).order([NEW_A, local]) == [NEW_A, local]
+
+    board = RegionScoreboard(path=None)
+    board.record_connect(local, handshake=0.01)
+    assert board.order([NEW_A, local]) == [local, NEW_A]
+
+    ignoring = RegionScoreboard(path=None, ignore_loopback=True)
+    ignoring.record_connect(local, handshake=0.01)
+    ignoring.record_failure("ws://localhost:50000/socket.io/")
+    ignoring.record_ping("ws://[::1]:8080/socket.io/", 0.001)
+    assert ignoring.snapshot() == {}
+
+
+def test_persistence_defaults_to_home_and_can_be_disabled(monkeypatch):
+    monkeypatch.delenv("POCKETOPTION_SCOREBOARD_PATH", raising=False)
+    assert scoreboard._default_path() == scoreboard.DEFAULT_SCOREBOARD_PATH
+    monkeypatch.setenv("POCKETOPTION_SCOREBOARD_PATH", "/tmp/board.json")
+    assert scoreboard._default_path() == "/tmp/board.json"
+    monkeypatch.setenv("POCKETOPTION_SCOREBOARD_PATH", "")
+    assert scoreboard._default_path() is None
+
+
+def test_saves_are_debounced_inside_the_loop(tmp_path):
+    path = tmp_path / "board.json"
+
+    async def run() -> None:
+        board = RegionScoreboard(path=str(path), save_interval=0.05)
+        for _ in range(20):
+            board.record_connect(FAST, handshake=0.1)
+        assert not path.exists()
+        await asyncio.sleep(0.2)
+        assert json.loads(path.read_text())["regions"][FAST]["successes"] == 20
+
+        board.record_failure(FAST)
+        await board.flush()
+        assert json.loads(path.read_text())["regions"][FAST]["failures"] == 1
+        assert RegionScoreboard(path=str(path)).order([NEW_A, FAST]) == [FAST, NEW_A]
+
+    asyncio.run(run())
+
+
+def test_faster_local_region_ranks_first_and_survives_reload(tmp_path, monkeypatch):
+    path = str(tmp_path / "board.json")
+    board = RegionScoreboard(path=path)
+    monkeypatch.setattr(constants, "region_scoreboard", board)
+    ssid = '42["auth",{"session":"local","isDemo":1,"uid":1,"platform":1}]'
+
+    async def connect(urls, race=True):
+        client = AsyncWebSocketClient(scoreboard=board)
+        try:
+            await client.connect(urls, ssid, race=race, rank=False)
+            return client.connection_info.url
+        finally:
+            await client.disconnect()
+
+    async def run() -> None:
+        # A latência injetada atrasa o 40 e o successauth do servidor lento
+        async with LocalBrokerServer(latency=0.25, tick_rate=0) as slow, LocalBrokerServer(tick_rate=0) as fast:
+            slow_url = REGIONS.get_region(slow.register_region("LOCAL_TEST_SLOW"))
+            fast_url = REGIONS.get_region(fast.register_region("LOCAL_TEST_FAST"))
+            try:
+                # O lento sai na frente da corrida e mesmo assim perde
+                assert await connect([slow_url, fast_url]) == fast_url
+                assert await connect([slow_url], race=False) == slow_url
+
+                ranked = [url for url in REGIONS.get_all(randomize=False) if url in (slow_url, fast_url)]
+                assert ranked == [fast_url, slow_url]
+                await board.flush()
+            finally:
+                REGIONS.unregister_region("LOCAL_TEST_SLOW")
+                REGIONS.unregister_region("LOCAL_TEST_FAST")
+
+        reloaded = RegionScoreboard(path=path)
+        assert reloaded.order([slow_url, fast_url]) == [fast_url, slow_url]
+        assert reloaded.expected_latency(fast_url) < reloaded.expected_latency(slow_url)
+
+    asyncio.run(run())
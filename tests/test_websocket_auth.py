@@ -0,0 +1,65 @@
+import asyncio
+from typing import Any, List
+
+import pytest
+
+from pocketoptionapi_async import codec
+from pocketoptionapi_async.client import AsyncPocketOptionClient
+from pocketoptionapi_async.exceptions import WebSocketError
+from pocketoptionapi_async.local_server import LocalBrokerServer
+from pocketoptionapi_async.websocket_client import AsyncWebSocketClient
+
+LOCAL_SSID = '42["auth",{"session":"local","isDemo":1,"uid":1,"platform":1}]'
+
+
+class FakeSocket:
+    def __init__(self, frames: List[Any]):
+        self.frames = list(frames)
+        self.sent: List[Any] = []
+
+    async def recv(self) -> Any:
+        if not self.frames:
+            await asyncio.sleep(3600)
+        return self.frames.pop(0)
+
+    async def send(self, message: Any) -> None:
+        self.sent.append(message)
+
+
+def await_auth(frames: List[Any]) -> List[Any]:
+    async def run() -> List[Any]:
+        client = AsyncWebSocketClient()
+        return await asyncio.wait_for(client._await_authentication(FakeSocket(frames)), timeout=1.0)
+
+    return asyncio.run(run())
+
+
+def test_text_successauth_is_detected():
+    buffered = await_auth(['42["updateStream",[]]', '42["successauth",{"id":"x"}]'])
+    assert buffered[-1].startswith('42["successauth"')
+
+
+def test_binary_successauth_is_detected_with_its_attachment():
+    attachment = codec.dumps_bytes({"id": "x"})
+    buffered = await_auth(["2", '451-["successauth",{"_placeholder":true,"num":0}]', attachment])
+    assert buffered == ['451-["successauth",{"_placeholder":true,"num":0}]', attachment]
+
+
+def test_binary_not_authorized_is_rejected():
+    with pytest.raises(WebSocketError):
+        await_auth(['451-["NotAuthorized",{"_placeholder":true,"num":0}]', b"{}"])
+
+
+@pytest.mark.parametrize("binary_auth", [False, True])
+def test_connect_against_local_server(binary_auth):
+    async def run() -> None:
+        async with LocalBrokerServer(binary_auth=binary_auth, tick_rate=0) as server:
+            region = server.register_region("LOCAL_TEST_AUTH")
+            client = AsyncPocketOptionClient(LOCAL_SSID, enable_logging=False, auto_reconnect=False)
+            try:
+                assert await asyncio.wait_for(client.connect(regions=[region]), timeout=5.0)
+                assert client.is_ready("authenticated")
+            finally:
+                await client.disconnect()
+
+    asyncio.run(run())
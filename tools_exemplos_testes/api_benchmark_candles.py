@@ -0,0 +1,225 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, desenvolvida para fornecer uma camada confiável, extensível, resiliente e orientada a eventos para automação operacional e processamento de dados de mercado em tempo real.
+
+Descrição:
+Benchmark de vazão do histórico de candles contra o servidor local (LocalBrokerServer). Simula um scanner que busca o histórico de dezenas de ativos: primeiro em sequência, depois todos em paralelo e, por fim, em paralelo com chamadas repetidas para os mesmos ativos (coalescidas em um único changeSymbol). Cada ativo tem um nível de preço próprio no servidor, o que permite conferir que toda resposta chegou ao chamador certo. Por último mede o backfill paginado (loadHistoryPeriod) de um histórico longo, coletado inteiro e em streaming página a página.
+
+O que ele faz:
+- Sobe o servidor local com N ativos de preços bem separados e latência configurável
+- Mede pedidos/s e p50/p99/máx por chamada em três cenários (sequencial, paralelo, paralelo com duplicatas)
+- Confere se os candles recebidos pertencem ao ativo pedido (nível de preço do servidor)
+- Mostra quantos changeSymbol chegaram ao servidor e quantas chamadas foram coalescidas
+- Permite ajustar o limite de taxa de assinaturas do cliente (--subscription-rate), que é o teto do cenário paralelo
+- Mede o backfill de --backfill candles (padrão 50k de 1 minuto): tempo, páginas, continuidade e pico de memória no streaming
+
+Características:
+- Execução 100% local, sem SSID real
+- Latências registradas em histogramas HDR (LatencyHistogram)
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- loguru
+- Módulos internos do projeto:
+  - pocketoptionapi_async
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from loguru import logger
+
+os.environ.setdefault("POCKETOPTION_SCOREBOARD_PATH", "")
+
+from pocketoptionapi_async.client import AsyncPocketOptionClient
+from pocketoptionapi_async.latency import LatencyHistogram
+from pocketoptionapi_async.local_server import LocalBrokerServer
+
+LOCAL_SSID = '42["auth",{"session":"local","isDemo":1,"uid":1,"platform":1}]'
+
+
+def build_assets(count: int) -> Dict[str, float]:
+    # Preços em progressão geométrica (x1.5): o histórico de um ativo nunca se confunde com o de outro
+    return {f"SCAN{index:03d}_otc": round(1.5 ** index, 5) for index in range(count)}
+
+
+def belongs_to(candles: List[Any], expected_price: float) -> bool:
+    if not candles:
+        return False
+    return abs(candles[-1].close / expected_price - 1.0) < 0.2
+
+
+async def run_scenario(
+    client: AsyncPocketOptionClient,
+    server: LocalBrokerServer,
+    assets: Dict[str, float],
+    mode: str,
+    timeframe: int,
+    count: int,
+    duplicates: int,
+) -> Dict[str, Any]:
+    histogram = LatencyHistogram()
+    names = list(assets)
+    calls = [name for name in names for _ in range(duplicates)] if mode == "duplicates" else names
+    wrong: List[str] = []
+    sent_before = server.stats["events"].get("changeSymbol", 0)
+    coalesced_before = client.get_connection_stats()["history_requests"]["coalesced"]
+
+    async def fetch(asset: str) -> None:
+        started = time.perf_counter_ns()
+        candles = await client.get_candles(asset, timeframe, count)
+        histogram.record(time.perf_counter_ns() - started)
+        if not belongs_to(candles, assets[asset]):
+            wrong.append(asset)
+
+    started = time.perf_counter()
+    if mode == "sequential":
+        for asset in calls:
+            await fetch(asset)
+    else:
+        await asyncio.gather(*(fetch(asset) for asset in calls))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "calls": len(calls),
+        "elapsed": elapsed,
+        "rate": len(calls) / elapsed if elapsed else 0.0,
+        "latency": histogram.summary("ms"),
+        "wrong": wrong,
+        "sent": server.stats["events"].get("changeSymbol", 0) - sent_before,
+        "coalesced": client.get_connection_stats()["history_requests"]["coalesced"] - coalesced_before,
+    }
+
+
+async def run_backfill(
+    client: AsyncPocketOptionClient,
+    server: LocalBrokerServer,
+    asset: str,
+    timeframe: int,
+    count: int,
+    page_size: int,
+    in_flight: int,
+) -> Dict[str, Any]:
+    pages_before = server.stats["history_pages"]
+    started = time.perf_counter()
+    timestamps: List[int] = []
+    async for page in client.iter_candle_pages(asset, timeframe, count, page_size=page_size, max_in_flight=in_flight):
+        timestamps.extend(int(candle.timestamp.timestamp()) for candle in reversed(page))
+    elapsed = time.perf_counter() - started
+    pages = server.stats["history_pages"] - pages_before
+    contiguous = all(newer - older == timeframe for newer, older in zip(timestamps, timestamps[1:]))
+    timestamps.clear()
+
+    # Segunda passada só para medir memória (tracemalloc deixa a execução mais lenta)
+    tracemalloc.start()
+    streamed = 0
+    async for page in client.iter_candle_pages(asset, timeframe, count, page_size=page_size, max_in_flight=in_flight):
+        streamed += len(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "count": streamed,
+        "elapsed": elapsed,
+        "rate": streamed / elapsed if elapsed else 0.0,
+        "pages": pages,
+        "contiguous": contiguous,
+        "peak_mb": peak / 1e6,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de histórico de candles no servidor local")
+    parser.add_argument("--assets", type=int, default=50, help="Quantidade de ativos do scanner")
+    parser.add_argument("--latency", type=float, default=0.02, help="Latência por resposta do servidor (s)")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Jitter máximo adicional (s)")
+    parser.add_argument("--candles", type=int, default=300, help="Candles por histórico")
+    parser.add_argument("--duplicates", type=int, default=4, help="Chamadas por ativo no cenário com duplicatas")
+    parser.add_argument("--timeframe", type=int, default=60)
+    parser.add_argument(
+        "--subscription-rate",
+        type=float,
+        help="Limite de changeSymbol/s do cliente (padrão da biblioteca se omitido; 0 remove o limite)",
+    )
+    parser.add_argument("--backfill", type=int, default=50_000, help="Candles do cenário de backfill (0 desativa)")
+    parser.add_argument("--page-size", type=int, default=500, help="Candles por página do backfill")
+    parser.add_argument("--in-flight", type=int, default=4, help="Páginas do backfill em voo ao mesmo tempo")
+    parser.add_argument("--history-page-limit", type=int, default=0, help="Corte de candles por resposta no servidor")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    assets = build_assets(args.assets)
+    server = LocalBrokerServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        tick_rate=0.0,
+        candle_count=args.candles,
+        history_page_limit=args.history_page_limit,
+        assets=assets,
+        seed=7,
+    )
+
+    async with server:
+        region = server.register_region()
+        client = AsyncPocketOptionClient(LOCAL_SSID, is_demo=True, enable_logging=False, auto_reconnect=False)
+        if args.subscription_rate is not None:
+            rate = args.subscription_rate if args.subscription_rate > 0 else None
+            client._websocket.configure_outbound(rate_limits={"subscription": (rate, rate)})
+        if not await client.connect(regions=[region]):
+            raise SystemExit("Falha ao conectar no servidor local")
+
+        try:
+            results = [
+                await run_scenario(client, server, assets, mode, args.timeframe, args.candles, args.duplicates)
+                for mode in ("sequential", "parallel", "duplicates")
+            ]
+            backfill = None
+            if args.backfill:
+                backfill = await run_backfill(
+                    client, server, next(iter(assets)), args.timeframe, args.backfill, args.page_size, args.in_flight
+                )
+        finally:
+            await client.disconnect()
+
+    print("=" * 72)
+    print("BENCHMARK DE HISTÓRICO DE CANDLES (SERVIDOR LOCAL)")
+    print("=" * 72)
+    print(f"Ativos: {args.assets} | candles por pedido: {args.candles} | "
+          f"latência: {args.latency * 1000:.0f}±{args.jitter * 1000:.0f} ms")
+    limit = client._websocket.get_outbound_stats().get("classes", {}).get("subscription", {}).get("rate_limit")
+    print(f"Limite de assinaturas do cliente: {f'{limit:g}/s' if limit else 'sem limite'}")
+    for result in results:
+        latency = result["latency"]
+        print(
+            f"{result['mode']:<11} {result['calls']:>4} chamadas em {result['elapsed']:.2f}s "
+            f"({result['rate']:.1f}/s) | p50 {latency['p50']:.1f} ms | p99 {latency['p99']:.1f} ms | "
+            f"máx {latency['max']:.1f} ms"
+        )
+        print(
+            f"{'':<11} changeSymbol enviados: {result['sent']} | coalescidas: {result['coalesced']} | "
+            f"respostas trocadas/vazias: {len(result['wrong'])}"
+        )
+    if backfill:
+        print(
+            f"backfill    {backfill['count']} candles em {backfill['elapsed']:.2f}s ({backfill['rate']:.0f}/s) | "
+            f"{backfill['pages']} páginas de {args.page_size} ({args.in_flight} em voo) | "
+            f"contínuo: {'sim' if backfill['contiguous'] else 'NÃO'}"
+        )
+        print(f"{'':<11} pico de memória no streaming: {backfill['peak_mb']:.1f} MB")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,164 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, desenvolvida para fornecer uma camada confiável, extensível, resiliente e orientada a eventos para automação operacional e processamento de dados de mercado em tempo real.
+
+Descrição:
+Microbenchmark offline da emissão de eventos. Compara o emissor antigo (cópia da lista de handlers e asyncio.iscoroutinefunction a cada emissão) com o EventBus compartilhado, que classifica os handlers no registro e usa tuplas copy-on-write, medindo emissões por segundo sem rede.
+
+O que ele faz:
+- Reproduz localmente o emissor ad-hoc usado antes pelos módulos da biblioteca
+- Mede emits/s com handlers síncronos, assíncronos e mistos
+- Mede o modo concorrente do EventBus com handlers assíncronos que aguardam I/O simulado
+- Imprime um relatório comparativo antes/depois
+
+Características:
+- Execução 100% local e determinística
+- Mesma quantidade de handlers e eventos em todos os cenários
+- Sem SSID e sem conexão com o broker
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- loguru
+- Módulos internos do projeto:
+  - pocketoptionapi_async
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from loguru import logger
+
+from pocketoptionapi_async.events import EventBus
+
+
+# -------------------------
+# Emissor legado (reprodução do caminho anterior)
+# -------------------------
+
+class LegacyEmitter:
+    def __init__(self) -> None:
+        self._event_handlers: Dict[str, List[Callable]] = {}
+
+    def add_event_handler(self, event: str, handler: Callable) -> None:
+        if event not in self._event_handlers:
+            self._event_handlers[event] = []
+        self._event_handlers[event].append(handler)
+
+    async def emit(self, event: str, data: Any) -> None:
+        if event not in self._event_handlers:
+            return
+
+        for handler in list(self._event_handlers[event]):
+            try:
+                if asyncio.iscoroutinefunction(handler):
+                    await handler(data)
+                else:
+                    handler(data)
+            except Exception as exc:
+                logger.error(f"Error in event handler for {event}: {exc}")
+
+
+# -------------------------
+# Handlers de teste
+# -------------------------
+
+def build_handlers(kind: str, count: int) -> List[Callable]:
+    handlers: List[Callable] = []
+    for index in range(count):
+        use_async = kind == "async" or (kind == "mixed" and index % 2)
+        if use_async:
+            async def handler(_data: Any) -> None:
+                return None
+        else:
+            def handler(_data: Any) -> None:
+                return None
+        handlers.append(handler)
+    return handlers
+
+
+# Os eventos em que um frame típico se desdobra (json_data, balance_data, assets...)
+EVENTS = ("json_data", "stream_update", "balance_data", "payout_update")
+
+
+async def measure(label: str, emitter: Any, subscribe: Callable, kind: str, handlers: int, emits: int) -> float:
+    for event in EVENTS:
+        for handler in build_handlers(kind, handlers):
+            subscribe(emitter, event, handler)
+
+    payload = {"asset": "EURUSD_otc", "price": 1.0812}
+    started = time.perf_counter()
+    for index in range(emits):
+        await emitter.emit(EVENTS[index % len(EVENTS)], payload)
+    elapsed = time.perf_counter() - started
+
+    rate = emits / elapsed if elapsed > 0 else 0.0
+    logger.info(f"{label}: {rate:,.0f} emits/s")
+    return rate
+
+
+async def measure_io(concurrent: bool, handlers: int, emits: int, delay: float) -> float:
+    bus = EventBus(concurrent=concurrent)
+
+    async def slow_handler(_data: Any) -> None:
+        await asyncio.sleep(delay)
+
+    for _ in range(handlers):
+        bus.subscribe("json_data", slow_handler)
+
+    started = time.perf_counter()
+    for _ in range(emits):
+        await bus.emit("json_data", {})
+    elapsed = time.perf_counter() - started
+
+    rate = emits / elapsed if elapsed > 0 else 0.0
+    label = "concorrente" if concurrent else "sequencial"
+    logger.info(f"EventBus {label} com I/O simulado: {rate:,.1f} emits/s")
+    return rate
+
+
+def _legacy_subscribe(emitter: LegacyEmitter, event: str, handler: Callable) -> None:
+    emitter.add_event_handler(event, handler)
+
+
+def _bus_subscribe(emitter: EventBus, event: str, handler: Callable) -> None:
+    emitter.subscribe(event, handler)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de emissão de eventos")
+    parser.add_argument("--emits", type=int, default=200_000, help="Emissões por cenário")
+    parser.add_argument("--handlers", type=int, default=3, help="Handlers por evento")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    results = []
+    for kind in ("sync", "async", "mixed"):
+        before = await measure(f"Legado ({kind})", LegacyEmitter(), _legacy_subscribe, kind, args.handlers, args.emits)
+        after = await measure(f"EventBus ({kind})", EventBus(), _bus_subscribe, kind, args.handlers, args.emits)
+        results.append((kind, before, after))
+
+    io_emits = max(1, args.emits // 2000)
+    sequential = await measure_io(False, args.handlers, io_emits, 0.005)
+    concurrent = await measure_io(True, args.handlers, io_emits, 0.005)
+
+    print("=" * 60)
+    print("BENCHMARK DE EVENTOS")
+    print("=" * 60)
+    print(f"Handlers por evento:        {args.handlers}")
+    print(f"Emissões por cenário:       {args.emits}")
+    for kind, before, after in results:
+        gain = after / before if before > 0 else 0.0
+        print(f"{kind:<7} legado {before:>12,.0f}/s | EventBus {after:>12,.0f}/s | {gain:.2f}x")
+    print(f"I/O simulado sequencial:    {sequential:,.1f} emits/s")
+    print(f"I/O simulado concorrente:   {concurrent:,.1f} emits/s")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
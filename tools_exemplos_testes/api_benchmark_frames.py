@@ -0,0 +1,240 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, desenvolvida para fornecer uma camada confiável, extensível, resiliente e orientada a eventos para automação operacional e processamento de dados de mercado em tempo real.
+
+Descrição:
+Benchmark offline do caminho quente de recepção de frames. Compara a classificação antiga (cadeia de startswith, varredura de "NotAuthorized" e json.loads por ramo) com o classificador de passagem única do módulo frames, e mede o pipeline completo de AsyncWebSocketClient._process_message sobre um corpus gravado ou sintético, sem rede.
+
+O que ele faz:
+- Carrega um corpus gravado (um frame por linha, em JSON string) ou gera um corpus sintético
+- Mede frames/s do classificador legado reproduzido localmente
+- Mede frames/s do classificador de passagem única (frames.decode_frame)
+- Mede frames/s do pipeline completo _process_message com socket falso
+- Compara os backends JSON disponíveis (orjson, msgspec, json) no classificador
+- Imprime um relatório comparativo antes/depois
+
+Características:
+- Execução 100% local e determinística
+- Corpus sintético com mistura realista (updateStream, payouts [[5,...]], saldo, pings, 451- com anexo binário)
+- Sem SSID e sem conexão com o broker
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- loguru
+- Módulos internos do projeto:
+  - pocketoptionapi_async
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Callable, List, Optional, Union
+
+from loguru import logger
+
+from pocketoptionapi_async import codec
+from pocketoptionapi_async.frames import decode_binary_frame, decode_frame
+from pocketoptionapi_async.websocket_client import AsyncWebSocketClient
+
+
+# -------------------------
+# Corpus
+# -------------------------
+
+RawFrame = Union[str, bytes]
+
+
+def build_synthetic_corpus(size: int = 50_000, seed: int = 7) -> List[RawFrame]:
+    """Gera um corpus sintético com a mistura típica de frames do broker."""
+    rng = random.Random(seed)
+    assets = ["EURUSD_otc", "GBPUSD_otc", "AUDCAD_otc", "BTCUSD", "#AAPL_otc", "USDJPY"]
+    payout_batch = json.dumps(
+        [
+            [5, [idx, asset, asset.replace("_otc", " OTC"), "currency", 1, rng.randint(70, 92)]]
+            for idx, asset in enumerate(assets * 20)
+        ]
+    )
+
+    corpus: List[RawFrame] = []
+    for _ in range(size):
+        roll = rng.random()
+        if roll < 0.70:
+            asset = rng.choice(assets)
+            tick = [[asset, round(time.time(), 3), round(rng.uniform(1.0, 2.0), 5)]]
+            corpus.append("42" + json.dumps(["updateStream", tick]))
+        elif roll < 0.80:
+            corpus.append(payout_batch)
+        elif roll < 0.88:
+            balance = {"balance": round(rng.uniform(100, 50_000), 2), "isDemo": 1, "uid": 1}
+            corpus.append("42" + json.dumps(["successupdateBalance", balance]))
+        elif roll < 0.95:
+            corpus.append("2")
+        else:
+            asset = rng.choice(assets)
+            tick = [[asset, round(time.time(), 3), round(rng.uniform(1.0, 2.0), 5)]]
+            corpus.append('451-["updateStream",{"_placeholder":true,"num":0}]')
+            corpus.append(json.dumps(tick).encode("utf-8"))
+    return corpus
+
+
+def load_corpus(path: str) -> List[RawFrame]:
+    """Carrega um corpus gravado: um frame por linha, serializado como JSON string."""
+    frames: List[RawFrame] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            try:
+                value = json.loads(line)
+                frames.append(value if isinstance(value, str) else line)
+            except ValueError:
+                frames.append(line)
+    return frames
+
+
+# -------------------------
+# Classificador legado (reprodução do caminho anterior)
+# -------------------------
+
+def legacy_classify(message: RawFrame) -> Optional[Any]:
+    text_message = message.decode("utf-8") if isinstance(message, bytes) else message
+    if text_message == "2":
+        return "ping"
+    if text_message.startswith("0") and "sid" in text_message:
+        return "open"
+    if text_message.startswith("40"):
+        return "connected"
+    if text_message.startswith("451-["):
+        try:
+            return json.loads(text_message.split("-", 1)[1])
+        except Exception:
+            return None
+    if text_message.startswith("[[5,"):
+        try:
+            return json.loads(text_message)
+        except ValueError:
+            return None
+    if text_message.startswith("{") or text_message.startswith("["):
+        try:
+            return json.loads(text_message)
+        except ValueError:
+            pass
+    if text_message.startswith("42"):
+        if "NotAuthorized" in text_message:
+            return "auth_error"
+        try:
+            return json.loads(text_message[2:])
+        except Exception:
+            return None
+    return None
+
+
+def classify(message: RawFrame) -> Any:
+    if isinstance(message, str):
+        return decode_frame(message)
+    return decode_binary_frame(message)
+
+
+# -------------------------
+# Medições
+# -------------------------
+
+def measure_sync(label: str, func: Callable[[RawFrame], Any], corpus: List[RawFrame], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for frame in corpus:
+            func(frame)
+        best = min(best, time.perf_counter() - started)
+    rate = len(corpus) / best if best > 0 else 0.0
+    logger.info(f"{label}: {rate:,.0f} frames/s")
+    return rate
+
+
+class _NullWebSocket:
+    """Socket falso: aceita envios e nunca fecha."""
+
+    closed = False
+
+    async def send(self, message: Any) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+async def measure_pipeline(corpus: List[RawFrame], rounds: int) -> float:
+    client = AsyncWebSocketClient()
+    client.websocket = _NullWebSocket()  # type: ignore[assignment]
+
+    received = 0
+
+    def on_json(_data: Any) -> None:
+        nonlocal received
+        received += 1
+
+    client.add_event_handler("json_data", on_json)
+
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for frame in corpus:
+            await client._process_message(frame)
+        best = min(best, time.perf_counter() - started)
+
+    rate = len(corpus) / best if best > 0 else 0.0
+    logger.info(f"Pipeline _process_message: {rate:,.0f} frames/s ({received} eventos json_data)")
+    return rate
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de classificação de frames")
+    parser.add_argument("--corpus", help="Arquivo de corpus gravado (um frame JSON por linha)")
+    parser.add_argument("--size", type=int, default=50_000, help="Tamanho do corpus sintético")
+    parser.add_argument("--rounds", type=int, default=3, help="Rodadas por medição (usa a melhor)")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    corpus = load_corpus(args.corpus) if args.corpus else build_synthetic_corpus(args.size)
+    logger.info(f"Corpus carregado: {len(corpus)} frames")
+
+    before = measure_sync("Classificador legado", legacy_classify, corpus, args.rounds)
+    after = measure_sync("Classificador de passagem única", classify, corpus, args.rounds)
+
+    default_backend = codec.BACKEND
+    backend_rates = {}
+    for backend in codec.available_backends():
+        codec.use_backend(backend)
+        backend_rates[backend] = measure_sync(
+            f"Classificador com backend {backend}", classify, corpus, args.rounds
+        )
+    codec.use_backend(default_backend)
+
+    # O pipeline completo emite logs de debug por frame; silencia para medir só o processamento
+    logger.remove()
+    pipeline = await measure_pipeline(corpus, args.rounds)
+    logger.add(sys.stderr, level="INFO")
+
+    print("=" * 60)
+    print("BENCHMARK DE FRAMES")
+    print("=" * 60)
+    print(f"Frames no corpus:           {len(corpus)}")
+    print(f"Antes (legado):             {before:,.0f} frames/s")
+    print(f"Depois (passagem única):    {after:,.0f} frames/s")
+    if before > 0:
+        print(f"Ganho:                      {after / before:.2f}x")
+    print(f"Pipeline _process_message:  {pipeline:,.0f} frames/s (backend {codec.BACKEND})")
+    for backend, rate in backend_rates.items():
+        print(f"Backend {backend:<19} {rate:,.0f} frames/s")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,257 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, desenvolvida para fornecer uma camada confiável, extensível, resiliente e orientada a eventos para automação operacional e processamento de dados de mercado em tempo real.
+
+Descrição:
+Benchmark offline dos dois modos de conexão sobre o mesmo tráfego gravado. Compara o caminho persistente antigo (varredura de substring no keep-alive e nova decodificação JSON no cliente) com o roteador de frames compartilhado, usado agora tanto pelo AsyncWebSocketClient quanto pelo ConnectionKeepAlive, medindo frames/s, decodificações por frame e eventos emitidos.
+
+O que ele faz:
+- Carrega um corpus gravado (um frame por linha, em JSON string) ou gera o corpus sintético do benchmark de frames
+- Reproduz localmente o caminho persistente legado (keep-alive + _on_keep_alive_message do cliente), com as mesmas extrações de estado do cliente
+- Mede o modo regular (AsyncWebSocketClient._process_message) e o modo persistente (ConnectionKeepAlive._process_message) com os handlers reais do AsyncPocketOptionClient
+- Conta chamadas a codec.loads por frame e eventos normalizados emitidos em cada caminho
+- Repete a medição só com os frames que o caminho legado entende, para comparar com paridade
+- Imprime um relatório comparativo antes/depois
+
+Características:
+- Execução 100% local e determinística
+- Mesmo corpus para todos os cenários
+- Sem SSID e sem conexão com o broker
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- loguru
+- Módulos internos do projeto:
+  - pocketoptionapi_async
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from loguru import logger
+
+from api_benchmark_frames import RawFrame, _NullWebSocket, build_synthetic_corpus, load_corpus
+from pocketoptionapi_async import codec
+from pocketoptionapi_async.client import AsyncPocketOptionClient
+from pocketoptionapi_async.connection_keep_alive import ConnectionKeepAlive
+from pocketoptionapi_async.events import EventBus
+
+# Eventos normalizados que o cliente assina nos dois modos
+ROUTED_EVENTS = (
+    "authenticated",
+    "balance_updated",
+    "balance_data",
+    "order_opened",
+    "order_closed",
+    "stream_update",
+    "candles_received",
+    "history_update",
+    "payout_update",
+    "json_data",
+    "unknown_event",
+)
+
+LEGACY_EVENT_MAP = {
+    "successauth": "authenticated",
+    "successupdateBalance": "balance_updated",
+    "successopenOrder": "order_opened",
+    "successcloseOrder": "order_closed",
+    "updateStream": "stream_update",
+    "loadHistoryPeriod": "candles_received",
+    "updateHistoryNew": "history_update",
+}
+
+
+# -------------------------
+# Contagem de decodificações
+# -------------------------
+
+class DecodeCounter:
+    """Envolve codec.loads para contar quantas vezes o JSON é decodificado."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self._original = codec.loads
+
+    def __enter__(self) -> "DecodeCounter":
+        original = self._original
+
+        def counting_loads(data: Any) -> Any:
+            self.calls += 1
+            return original(data)
+
+        codec.loads = counting_loads
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        codec.loads = self._original
+
+
+# -------------------------
+# Caminho persistente legado (reprodução do caminho anterior)
+# -------------------------
+
+class LegacyPersistentPath:
+    """Keep-alive antigo + _on_keep_alive_message/_handle_json_message do cliente."""
+
+    def __init__(self, client: AsyncPocketOptionClient, bus: EventBus) -> None:
+        self._client = client
+        self._bus = bus
+        self.websocket = _NullWebSocket()
+
+    async def process(self, message: RawFrame) -> None:
+        # ConnectionKeepAlive._process_message: varredura de substring, sem decodificar
+        if isinstance(message, bytes):
+            message = message.decode("utf-8")
+        if message == "2":
+            await self.websocket.send("3")
+            return
+        if "successauth" in message:
+            await self._bus.emit("authenticated", {})
+            return
+        await self._on_keep_alive_message({"message": message})
+
+    async def _on_keep_alive_message(self, message: Dict[str, Any]) -> None:
+        # AsyncPocketOptionClient._on_keep_alive_message: o cliente decodifica o frame de novo
+        raw_message = message.get("message")
+        if not isinstance(raw_message, str):
+            return
+        if raw_message.startswith("42"):
+            try:
+                data = codec.loads(raw_message[2:])
+                if isinstance(data, list) and len(data) >= 2:
+                    await self._handle_json_message(data)
+            except Exception:
+                pass
+
+    async def _handle_json_message(self, data: List[Any]) -> None:
+        event_type = data[0]
+        event_data = data[1] if len(data) > 1 else {}
+
+        self._client._extract_broker_state_sections(event_data)
+        self._client._extract_payouts_from_any_payload(event_data)
+
+        event = LEGACY_EVENT_MAP.get(event_type)
+        if event:
+            await self._bus.emit(event, event_data)
+        else:
+            await self._bus.emit("unknown_event", {"type": event_type, "data": event_data})
+
+
+# -------------------------
+# Medições
+# -------------------------
+
+# SSID fictício: só o parse local é exercitado, nunca há conexão
+BENCHMARK_SSID = '42["auth",{"session":"benchmark","isDemo":1,"uid":1,"platform":1}]'
+
+
+def build_client() -> AsyncPocketOptionClient:
+    return AsyncPocketOptionClient(BENCHMARK_SSID, is_demo=True, enable_logging=False)
+
+
+def _event_counter(subscribe: Callable[[str, Callable], None]) -> Dict[str, int]:
+    counts: Dict[str, int] = {event: 0 for event in ROUTED_EVENTS}
+    for event in ROUTED_EVENTS:
+        def handler(_data: Any, _event: str = event) -> None:
+            counts[_event] += 1
+        subscribe(event, handler)
+    return counts
+
+
+async def measure(label: str, process: Callable, corpus: List[RawFrame], counts: Dict[str, int]) -> Dict[str, Any]:
+    with DecodeCounter() as decodes:
+        started = time.perf_counter()
+        for frame in corpus:
+            await process(frame)
+        elapsed = time.perf_counter() - started
+
+    json_frames = sum(1 for frame in corpus if frame != "2")
+    rate = len(corpus) / elapsed if elapsed > 0 else 0.0
+    return {
+        "label": label,
+        "rate": rate,
+        "decodes": decodes.calls / json_frames if json_frames else 0.0,
+        "events": sum(counts.values()),
+        "payouts": counts["payout_update"],
+    }
+
+
+def common_subset(corpus: List[RawFrame]) -> List[RawFrame]:
+    """Frames que o caminho legado também entende (ping e eventos 42), para comparar com paridade."""
+    return [frame for frame in corpus if isinstance(frame, str) and (frame == "2" or frame.startswith("42"))]
+
+
+async def run_legacy(corpus: List[RawFrame]) -> Dict[str, Any]:
+    bus = EventBus()
+    counts = _event_counter(bus.subscribe)
+    path = LegacyPersistentPath(build_client(), bus)
+    return await measure("Persistente legado", path.process, corpus, counts)
+
+
+async def run_regular(corpus: List[RawFrame]) -> Dict[str, Any]:
+    client = build_client()
+    transport = client._websocket
+    transport.websocket = _NullWebSocket()  # type: ignore[assignment]
+    counts = _event_counter(transport.add_event_handler)
+    return await measure("Regular (roteador)", transport._process_message, corpus, counts)
+
+
+async def run_persistent(corpus: List[RawFrame]) -> Dict[str, Any]:
+    client = build_client()
+    keep_alive = ConnectionKeepAlive(BENCHMARK_SSID, is_demo=True)
+    keep_alive.websocket = _NullWebSocket()  # type: ignore[assignment]
+    keep_alive.add_event_handler("message_received", client._on_keep_alive_message)
+    client._register_transport_handlers(keep_alive)
+    counts = _event_counter(keep_alive.add_event_handler)
+    return await measure("Persistente (roteador)", keep_alive._process_message, corpus, counts)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dos modos regular e persistente")
+    parser.add_argument("--corpus", help="Arquivo de corpus gravado (um frame JSON por linha)")
+    parser.add_argument("--size", type=int, default=50_000, help="Tamanho do corpus sintético")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    corpus = load_corpus(args.corpus) if args.corpus else build_synthetic_corpus(args.size)
+    logger.info(f"Corpus carregado: {len(corpus)} frames")
+
+    common = common_subset(corpus)
+
+    # Os caminhos completos emitem logs de debug por frame; silencia para medir só o processamento
+    logger.remove()
+    scenarios = []
+    for title, frames in (("Corpus completo", corpus), ("Somente ping/42 (paridade)", common)):
+        scenarios.append(
+            (title, frames, [await run_legacy(frames), await run_regular(frames), await run_persistent(frames)])
+        )
+    logger.add(sys.stderr, level="INFO")
+
+    print("=" * 72)
+    print("BENCHMARK DOS MODOS DE CONEXÃO")
+    print("=" * 72)
+    print(f"Backend JSON:               {codec.BACKEND}")
+    for title, frames, results in scenarios:
+        print(f"{title}: {len(frames)} frames")
+        for result in results:
+            print(
+                f"  {result['label']:<24} {result['rate']:>10,.0f} frames/s | "
+                f"{result['decodes']:.2f} decodificações/frame JSON | "
+                f"{result['events']} eventos ({result['payouts']} payout_update)"
+            )
+        legacy, _, persistent = results
+        if legacy["rate"] > 0:
+            print(f"  Persistente / legado:     {persistent['rate'] / legacy['rate']:.2f}x")
+    print("O caminho legado descarta payouts [[5,...]] e frames 451- (sem payout_update).")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,388 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, desenvolvida para fornecer uma camada confiável, extensível, resiliente e orientada a eventos para automação operacional e processamento de dados de mercado em tempo real.
+
+Descrição:
+Teste de carga escalável contra o servidor local (LocalBrokerServer). Diferente do LoadTester do api_enhanced.py, que sobe poucos clientes contra o broker real, esta ferramenta conecta milhares de AsyncPocketOptionClient a partir de um único event loop (ou de alguns processos), com taxa de conexão controlada, mantém o fan-out de ticks em regime e mede quantas contas uma máquina consegue hospedar.
+
+O que ele faz:
+- Sobe o servidor local no mesmo processo (--workers 0) ou em um processo próprio (--workers N)
+- Conecta os clientes em rampa de taxa fixa (--ramp-rate conexões/s, dividida entre os workers)
+- Cada cliente pede histórico de um ativo e passa a receber ticks updateStream
+- Mantém o regime por --duration segundos contando ticks e o atraso de entrega
+- Mede em histogramas HDR a latência de conexão (a partir do horário pretendido da rampa), do histórico, do atraso dos ticks e do lag do event loop
+- Soma os histogramas dos workers e opcionalmente os salva em JSON (--hist-out)
+- Estima a memória por cliente pela variação do RSS do processo
+
+Características:
+- Execução 100% local, sem SSID real
+- Percentis p50/p99/p99.9/máx para todas as distribuições
+- Eleva o limite de descritores de arquivo até o máximo permitido
+- Com --workers 0 o servidor divide o loop com os clientes (lag e memória incluem o servidor)
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- loguru
+- Módulos internos do projeto:
+  - pocketoptionapi_async
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+# O placar de regiões não deve ser persistido com milhares de conexões locais
+os.environ.setdefault("POCKETOPTION_SCOREBOARD_PATH", "")
+
+from pocketoptionapi_async.client import AsyncPocketOptionClient
+from pocketoptionapi_async.constants import REGIONS
+from pocketoptionapi_async.latency import FixedRateSchedule, LatencyHistogram, LatencyRegistry
+from pocketoptionapi_async.local_server import DEFAULT_LOCAL_ASSETS, LocalBrokerServer
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+LOCAL_REGION = "LOCAL_DEMO"
+LOCAL_SSID = '42["auth",{"session":"load","isDemo":1,"uid":1,"platform":1}]'
+LAG_INTERVAL = 0.05
+
+
+@dataclass
+class LocalLoadConfig:
+    clients: int = 1000
+    ramp_rate: float = 200.0
+    duration: float = 30.0
+    workers: int = 0
+    tick_rate: float = 1.0
+    latency: float = 0.0
+    jitter: float = 0.0
+    payload_padding: int = 0
+    candle_count: int = 50
+    connect_timeout: float = 30.0
+
+
+# -------------------------
+# Medições auxiliares
+# -------------------------
+
+def rss_bytes() -> int:
+    """RSS atual do processo (Linux via /proc; nas demais plataformas o pico do getrusage)."""
+    try:
+        with open("/proc/self/statm", "r") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    return 0
+
+
+def raise_fd_limit() -> Optional[int]:
+    if resource is None:
+        return None
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+            soft = hard
+        except (ValueError, OSError):
+            pass
+    return soft
+
+
+class LoopLagMonitor:
+    """Mede o atraso do event loop: quanto um sleep de LAG_INTERVAL demora além do pedido."""
+
+    def __init__(self, histogram: LatencyHistogram, interval: float = LAG_INTERVAL):
+        self.interval = interval
+        self.histogram = histogram
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def switch(self, histogram: LatencyHistogram) -> None:
+        """Passa a registrar em outro histograma (ex.: da rampa para o regime)."""
+        self.histogram = histogram
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        interval_ns = int(self.interval * 1e9)
+        while True:
+            started = time.perf_counter_ns()
+            await asyncio.sleep(self.interval)
+            self.histogram.record(time.perf_counter_ns() - started - interval_ns)
+
+
+# -------------------------
+# Clientes simulados
+# -------------------------
+
+class SimulatedAccount:
+    def __init__(self, index: int):
+        self.index = index
+        self.asset = list(DEFAULT_LOCAL_ASSETS)[index % len(DEFAULT_LOCAL_ASSETS)]
+        self.client = AsyncPocketOptionClient(LOCAL_SSID, is_demo=True, enable_logging=False, auto_reconnect=False)
+        self.connected = False
+        self.ticks = 0
+        # Definido só no regime: os ticks da rampa não entram na distribuição
+        self.tick_histogram: Optional[LatencyHistogram] = None
+        self.client.add_event_callback("stream_update", self._on_tick)
+
+    def _on_tick(self, data: Any) -> None:
+        histogram = self.tick_histogram
+        if histogram is None or not isinstance(data, list):
+            return
+        now = time.time()
+        for item in data:
+            if isinstance(item, list) and len(item) >= 3:
+                self.ticks += 1
+                histogram.record(int((now - float(item[1])) * 1e9))
+
+
+async def _open_account(
+    account: SimulatedAccount,
+    config: LocalLoadConfig,
+    results: Dict[str, Any],
+    latency: LatencyRegistry,
+    intended_ns: int,
+) -> None:
+    try:
+        connected = await asyncio.wait_for(account.client.connect(regions=[LOCAL_REGION]), config.connect_timeout)
+    except asyncio.TimeoutError:
+        connected = False
+    if not connected:
+        results["failures"] += 1
+        return
+    # Medido a partir do horário pretendido na rampa: atrasos do próprio loop também contam
+    latency.record("connect", time.perf_counter_ns() - intended_ns)
+    results["connected"] += 1
+    account.connected = True
+
+    try:
+        with latency.measure("history"):
+            candles = await account.client.get_candles(account.asset, 60, config.candle_count)
+        if not candles:
+            results["history_empty"] += 1
+    except Exception as exc:
+        logger.debug(f"History request failed for client {account.index}: {exc}")
+
+
+async def run_clients(config: LocalLoadConfig, url: str, count: int, ramp_rate: float, offset: int = 0) -> Dict[str, Any]:
+    """Conecta `count` clientes em rampa, mantém o regime e devolve contadores e histogramas serializados."""
+    REGIONS.register_region(LOCAL_REGION, url)
+    results: Dict[str, Any] = {"clients": count, "connected": 0, "failures": 0, "history_empty": 0}
+    latency = LatencyRegistry()
+    monitor = LoopLagMonitor(latency.histogram("loop_lag_ramp"))
+    monitor.start()
+
+    rss_before = rss_bytes()
+    accounts: List[SimulatedAccount] = []
+    tasks: List[asyncio.Task] = []
+    schedule = FixedRateSchedule(ramp_rate) if ramp_rate > 0 else None
+    ramp_started = time.perf_counter()
+    for position in range(count):
+        intended_ns = await schedule.wait() if schedule else time.perf_counter_ns()
+        account = SimulatedAccount(offset + position)
+        accounts.append(account)
+        tasks.append(asyncio.create_task(_open_account(account, config, results, latency, intended_ns)))
+    await asyncio.gather(*tasks)
+    results["ramp_seconds"] = time.perf_counter() - ramp_started
+    results["rss_connected"] = rss_bytes() - rss_before
+
+    # Regime: só os ticks recebidos a partir daqui contam para a taxa de fan-out
+    monitor.switch(latency.histogram("loop_lag_steady"))
+    tick_histogram = latency.histogram("tick_delay")
+    for account in accounts:
+        account.ticks = 0
+        account.tick_histogram = tick_histogram
+    await asyncio.sleep(config.duration)
+    results["ticks"] = sum(account.ticks for account in accounts)
+    results["steady_seconds"] = config.duration
+
+    await monitor.stop()
+    await asyncio.gather(*(account.client.disconnect() for account in accounts if account.connected), return_exceptions=True)
+    results["latency"] = latency.to_dict()
+    return results
+
+
+def _worker_entry(config: Dict[str, Any], url: str, count: int, ramp_rate: float, offset: int) -> Dict[str, Any]:
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+    raise_fd_limit()
+    return asyncio.run(run_clients(LocalLoadConfig(**config), url, count, ramp_rate, offset))
+
+
+# -------------------------
+# Servidor
+# -------------------------
+
+def _build_server(config: LocalLoadConfig) -> LocalBrokerServer:
+    return LocalBrokerServer(
+        latency=config.latency,
+        jitter=config.jitter,
+        tick_rate=config.tick_rate,
+        candle_count=config.candle_count,
+        payload_padding=config.payload_padding,
+        seed=1,
+    )
+
+
+def _server_process(config: Dict[str, Any], channel: Any, stop: Any) -> None:
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+    raise_fd_limit()
+
+    async def serve() -> None:
+        async with _build_server(LocalLoadConfig(**config)) as server:
+            channel.put(server.url)
+            await asyncio.get_running_loop().run_in_executor(None, stop.wait)
+            channel.put(server.get_stats())
+
+    asyncio.run(serve())
+
+
+async def run_load(config: LocalLoadConfig) -> Dict[str, Any]:
+    if config.workers <= 0:
+        async with _build_server(config) as server:
+            results = [await run_clients(config, server.url, config.clients, config.ramp_rate)]
+            server_stats = server.get_stats()
+        return {"workers": results, "server": server_stats}
+
+    channel = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    server_proc = multiprocessing.Process(target=_server_process, args=(asdict(config), channel, stop), daemon=True)
+    server_proc.start()
+    url = channel.get(timeout=30)
+
+    share, extra = divmod(config.clients, config.workers)
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=config.workers) as pool:
+        futures = []
+        offset = 0
+        for index in range(config.workers):
+            count = share + (1 if index < extra else 0)
+            futures.append(
+                loop.run_in_executor(
+                    pool, _worker_entry, asdict(config), url, count, config.ramp_rate / config.workers, offset
+                )
+            )
+            offset += count
+        results = await asyncio.gather(*futures)
+
+    stop.set()
+    server_stats = channel.get(timeout=30)
+    server_proc.join(timeout=10)
+    return {"workers": list(results), "server": server_stats}
+
+
+# -------------------------
+# Relatório
+# -------------------------
+
+def merge_latency(report: Dict[str, Any]) -> LatencyRegistry:
+    merged = LatencyRegistry()
+    for item in report["workers"]:
+        merged.merge(LatencyRegistry.from_dict(item["latency"]))
+    return merged
+
+
+def _print_distribution(title: str, histogram: LatencyHistogram) -> None:
+    stats = histogram.summary(unit="ms")
+    print(
+        f"{title:<26} n={stats['count']:<7} p50={stats['p50']:8.2f} ms  "
+        f"p99={stats['p99']:8.2f} ms  p99.9={stats['p99.9']:8.2f} ms  máx={stats['max']:8.2f} ms"
+    )
+
+
+def print_report(config: LocalLoadConfig, report: Dict[str, Any], latency: LatencyRegistry) -> None:
+    workers = report["workers"]
+    connected = sum(item["connected"] for item in workers)
+    failures = sum(item["failures"] for item in workers)
+    ticks = sum(item["ticks"] for item in workers)
+    rss = sum(item["rss_connected"] for item in workers)
+    ramp = max(item["ramp_seconds"] for item in workers)
+
+    print("=" * 96)
+    print("TESTE DE CARGA LOCAL")
+    print("=" * 96)
+    print(f"Clientes:                  {config.clients} ({connected} conectados, {failures} falhas)")
+    print(f"Processos de clientes:     {max(1, config.workers)} (servidor {'no mesmo loop' if config.workers <= 0 else 'em processo próprio'})")
+    print(f"Rampa:                     {ramp:.2f}s ({connected / ramp if ramp > 0 else 0.0:,.0f} conexões/s efetivas)")
+    print(f"Memória por cliente (RSS): {rss / connected / 1024 if connected else 0.0:,.1f} KiB")
+    print(f"Ticks em regime:           {ticks} ({ticks / config.duration:,.0f}/s, "
+          f"{ticks / config.duration / connected if connected else 0.0:.2f}/s por cliente)")
+    _print_distribution("Conexão (connect)", latency.histogram("connect"))
+    _print_distribution("Histórico (get_candles)", latency.histogram("history"))
+    _print_distribution("Atraso dos ticks", latency.histogram("tick_delay"))
+    _print_distribution("Lag do loop (rampa)", latency.histogram("loop_lag_ramp"))
+    _print_distribution("Lag do loop (regime)", latency.histogram("loop_lag_steady"))
+    server = report["server"]
+    print(f"Servidor: {server['connections']} conexões | {server['messages_sent']} enviadas | "
+          f"{server['messages_received']} recebidas | {server['ticks_sent']} ticks")
+    print("=" * 96)
+
+
+def _fd_need(clients: int, workers: int) -> int:
+    # Cliente e servidor no mesmo processo: dois descritores por conexão
+    return clients * 2 + 64 if workers <= 0 else clients // max(1, workers) + 64
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Teste de carga com milhares de clientes contra o servidor local")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--ramp-rate", type=float, default=200.0, help="Conexões por segundo (0 = todas de uma vez)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Duração do regime (s)")
+    parser.add_argument("--workers", type=int, default=0, help="Processos de clientes (0 = tudo em um único loop)")
+    parser.add_argument("--tick-rate", type=float, default=1.0, help="Ticks por segundo por cliente")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--padding", type=int, default=0, help="Bytes extras em cada payload de evento")
+    parser.add_argument("--hist-out", help="Salva os histogramas somados em JSON")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+    limit = raise_fd_limit()
+    if limit is not None and _fd_need(args.clients, args.workers) > limit:
+        print(f"Aviso: limite de descritores ({limit}) pode ser insuficiente para {args.clients} clientes")
+
+    config = LocalLoadConfig(
+        clients=args.clients,
+        ramp_rate=args.ramp_rate,
+        duration=args.duration,
+        workers=args.workers,
+        tick_rate=args.tick_rate,
+        latency=args.latency,
+        jitter=args.jitter,
+        payload_padding=args.padding,
+    )
+    report = await run_load(config)
+    latency = merge_latency(report)
+    print_report(config, report, latency)
+    if args.hist_out:
+        latency.save(args.hist_out)
+        print(f"Histogramas salvos em {args.hist_out}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,7 +9,7 @@ O que ele faz:
 - Autentica múltiplas sessões da Pocket Option para execução paralela de cenários de teste
 - Estabelece conexões WebSocket concorrentes com e sem persistência
 - Exercita rotinas de saldo, candles, ping, leitura de mercado e operações simuladas
-- Mede latência por operação, taxa de sucesso, vazão média e picos de operações por segundo
+- Mede latência por operação em histogramas HDR (p50/p95/p99/p99.9, com correção de coordinated omission), taxa de sucesso, vazão média e picos de operações por segundo
 - Executa testes de carga padrão e fases progressivas de stress test
 - Valida comportamento de reconexão e conexão persistente via keep-alive
 - Registra estatísticas operacionais por tipo de operação
@@ -42,6 +42,7 @@ Requisitos:
   - models
   - connection_keep_alive
   - client
+  - latency
 """
 
 import sys
@@ -55,6 +56,7 @@ from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from collections import defaultdict, deque
 import statistics
+import time
 import types  # Para MethodType no patch de instância
 from loguru import logger
 
@@ -119,6 +121,7 @@ from pocketoptionapi_async.client import AsyncPocketOptionClient
 from pocketoptionapi_async.connection_keep_alive import ConnectionKeepAlive
 from pocketoptionapi_async.models import OrderDirection
 from pocketoptionapi_async.constants import TIMEFRAMES, ASSETS
+from pocketoptionapi_async.latency import LatencyRegistry
 
 try:
     from tabulate import tabulate
@@ -157,7 +160,8 @@ class LoadTester:
     def _reset_test_state(self):
         self.test_results: List[LoadTestResult] = []
         self.active_clients: List[AsyncPocketOptionClient] = []
-        self.operation_stats: Dict[str, List[float]] = defaultdict(list)
+        self.latency = LatencyRegistry()
+        self.expected_interval_ns = 0
         self.error_counts: Dict[str, int] = defaultdict(int)
         self.success_counts: Dict[str, int] = defaultdict(int)
         self.operations_per_second: deque = deque(maxlen=60)
@@ -168,6 +172,8 @@ class LoadTester:
         logger.info("Iniciando execução do Teste de Carga")
         logger.info(f"Configuração: {config.concurrent_clients} clientes, {config.operations_per_client} ops/cliente")
         self._reset_test_state()  # Antes de start_time
+        # Intervalo pretendido entre operações de um cliente (base da correção de coordinated omission)
+        self.expected_interval_ns = int(config.operation_delay * 1e9)
         self.test_start_time = datetime.now()
         try:
             if config.stress_mode:
@@ -278,6 +284,7 @@ class LoadTester:
                 client._on_message_received = types.MethodType(patched_message, client)
 
             connect_start = datetime.now()
+            connect_started_ns = time.perf_counter_ns()
             timeout = 15.0 if persistent else 10.0
             try:
                 success = await asyncio.wait_for(client.connect(), timeout=timeout)
@@ -285,13 +292,14 @@ class LoadTester:
                 success = False
                 logger.warning(f"Timeout na conexão para cliente {client_id}")
             connect_end = datetime.now()
+            connect_duration = (time.perf_counter_ns() - connect_started_ns) / 1e9
             if success:
                 self._record_result(
                     LoadTestResult(
                         operation_type="connect",
                         start_time=connect_start,
                         end_time=connect_end,
-                        duration=(connect_end - connect_start).total_seconds(),
+                        duration=connect_duration,
                         success=True,
                         response_data={"client_id": client_id},
                     )
@@ -303,7 +311,7 @@ class LoadTester:
                         operation_type="connect",
                         start_time=connect_start,
                         end_time=connect_end,
-                        duration=(connect_end - connect_start).total_seconds(),
+                        duration=connect_duration,
                         success=False,
                         error_message="Falha na conexão",
                     )
@@ -425,6 +433,7 @@ class LoadTester:
         self, client: AsyncPocketOptionClient, client_id: int, operation_type: str
     ) -> None:
         start_time = datetime.now()
+        started_ns = time.perf_counter_ns()
         result_data = {}
         timeout_val = 10.0 if hasattr(client, 'persistent_connection') and client.persistent_connection else 5.0
         try:
@@ -480,7 +489,7 @@ class LoadTester:
                     operation_type=operation_type,
                     start_time=start_time,
                     end_time=end_time,
-                    duration=(end_time - start_time).total_seconds(),
+                    duration=(time.perf_counter_ns() - started_ns) / 1e9,
                     success=True,
                     response_data=result_data,
                 )
@@ -493,7 +502,7 @@ class LoadTester:
                     operation_type=operation_type,
                     start_time=start_time,
                     end_time=end_time,
-                    duration=(end_time - start_time).total_seconds(),
+                    duration=(time.perf_counter_ns() - started_ns) / 1e9,
                     success=False,
                     error_message="Timeout na operação",
                 )
@@ -505,7 +514,7 @@ class LoadTester:
                     operation_type=operation_type,
                     start_time=start_time,
                     end_time=end_time,
-                    duration=(end_time - start_time).total_seconds(),
+                    duration=(time.perf_counter_ns() - started_ns) / 1e9,
                     success=False,
                     error_message=str(e),
                 )
@@ -531,7 +540,9 @@ class LoadTester:
         self.test_results.append(result)
         if result.success:
             self.success_counts[result.operation_type] += 1
-            self.operation_stats[result.operation_type].append(result.duration)
+            # Conexões não seguem o ritmo das operações; as demais são corrigidas pelo intervalo pretendido
+            interval = 0 if result.operation_type.endswith("connect") else self.expected_interval_ns
+            self.latency.record_corrected(result.operation_type, int(result.duration * 1e9), interval)
         else:
             self.error_counts[result.operation_type] += 1
 
@@ -563,18 +574,23 @@ class LoadTester:
         failed_operations = total_operations - successful_operations
         operation_analysis = {}
         trading_metrics = {}
-        for op_type, durations in self.operation_stats.items():
-            if durations:
+        for op_type in self.latency.names():
+            histogram = self.latency.histogram(op_type)
+            if histogram.total_count:
+                latency = histogram.summary(unit="s", percentiles=(50.0, 95.0, 99.0, 99.9))
                 operation_analysis[op_type] = {
-                    "count": len(durations),
+                    "count": self.success_counts[op_type],
+                    "corrected_count": latency["count"],
                     "success_count": self.success_counts[op_type],
                     "error_count": self.error_counts[op_type],
                     "success_rate": self.success_counts[op_type] / max(self.success_counts[op_type] + self.error_counts[op_type], 1),
-                    "avg_duration": statistics.mean(durations),
-                    "min_duration": min(durations),
-                    "max_duration": max(durations),
-                    "median_duration": statistics.median(durations),
-                    "p95_duration": sorted(durations)[int(len(durations) * 0.95)] if len(durations) > 20 else max(durations),
+                    "avg_duration": latency["mean"],
+                    "min_duration": latency["min"],
+                    "max_duration": latency["max"],
+                    "median_duration": latency["p50"],
+                    "p95_duration": latency["p95"],
+                    "p99_duration": latency["p99"],
+                    "p99_9_duration": latency["p99.9"],
                 }
                 if op_type == "place_order":
                     profits = [r.response_data.get("simulated_profit", 0) for r in self.test_results if r.operation_type == op_type and r.success]
@@ -605,6 +621,7 @@ class LoadTester:
                 "peak_throughput": self.peak_operations_per_second,
                 "avg_throughput": avg_ops_per_second,
             },
+            "latency_histograms": self.latency.to_dict(),
             "recommendations": self._generate_recommendations(
                 operation_analysis, avg_ops_per_second, successful_operations / max(total_operations, 1)
             ),
@@ -11,10 +11,12 @@ O que ele faz:
 - Avalia a performance de envio de ordens em conta demo ou real
 - Mede tempos de recuperação de saldo, candles e ordens ativas
 - Executa operações concorrentes para avaliar comportamento sob paralelismo
-- Calcula média, mínimo, máximo, desvio padrão e taxa de sucesso
+- Registra as latências em histogramas HDR (perf_counter_ns) e calcula p50/p99/p99.9/máx, média e taxa de sucesso
+- Envia ordens e leituras em taxa fixa, medindo a partir do horário pretendido (correção de coordinated omission)
 - Estima operações por segundo em cenários de ordem e concorrência
 - Consolida os resultados em relatório textual legível
 - Salva o relatório final em arquivo para análise posterior
+- Salva os histogramas em JSON para somar com outras execuções (merge_histogram_files)
 - Fornece feedback operacional por logging detalhado em PT-BR
 
 Características:
@@ -32,7 +34,6 @@ Características:
 Requisitos:
 - Python 3.10+
 - asyncio
-- statistics
 - loguru
 - Módulos internos do projeto:
   - pocketoptionapi_async
@@ -40,12 +41,12 @@ Requisitos:
 
 import asyncio
 import time
-import statistics
 import os
 import sys
 from typing import List, Dict, Any, Optional
 from loguru import logger
 from pocketoptionapi_async import AsyncPocketOptionClient, OrderDirection
+from pocketoptionapi_async.latency import FixedRateSchedule, LatencyRegistry
 
 # -------------------------
 # Configurações de Teste de Ordem (fáceis de editar)
@@ -54,6 +55,9 @@ ORDER_ASSET = "EURUSD_otc"
 ORDER_AMOUNT = 1.0
 ORDER_DURATION = 60  # segundos
 ORDER_DIRECTION = OrderDirection.CALL
+ORDER_RATE = 10.0  # ordens por segundo (taxa fixa)
+DATA_RATE = 10.0  # leituras por segundo por operação (taxa fixa)
+HISTOGRAM_FILE = "latencias_da_api.json"
 
 
 class PerformanceTester:
@@ -63,23 +67,40 @@ class PerformanceTester:
         self.ssid = ssid
         self.is_demo = is_demo
         self.results: Dict[str, List[float]] = {}
+        self.latency = LatencyRegistry()
+
+    def _latency_stats(self, name: str, attempts: int) -> Dict[str, float]:
+        """Resumo em segundos do histograma `name` (vazio se nenhuma amostra foi registrada)."""
+        histogram = self.latency.histogram(name)
+        if not histogram.total_count:
+            return {"success_rate": 0.0}
+        summary = histogram.summary(unit="s")
+        return {
+            "avg_time": summary["mean"],
+            "min_time": summary["min"],
+            "max_time": summary["max"],
+            "p50": summary["p50"],
+            "p99": summary["p99"],
+            "p99_9": summary["p99.9"],
+            "success_rate": summary["count"] / attempts * 100.0 if attempts else 0.0,
+        }
 
     async def test_connection_performance(
         self, iterations: int = 5
     ) -> Dict[str, float]:
         """Testa a performance de estabelecimento de conexão"""
         logger.info(f"Testando performance de conexão ({iterations} iterações)")
-        connection_times: List[float] = []
+        histogram = self.latency.histogram("connect")
 
         for i in range(iterations):
-            start_time = time.time()
+            start_time = time.perf_counter_ns()
             client = AsyncPocketOptionClient(ssid=self.ssid, is_demo=self.is_demo)
             try:
                 await client.connect()
                 if getattr(client, "is_connected", False):
-                    connection_time = time.time() - start_time
-                    connection_times.append(connection_time)
-                    logger.success(f"Conexão {i + 1}: {connection_time:.3f}s")
+                    connection_time = time.perf_counter_ns() - start_time
+                    histogram.record(connection_time)
+                    logger.success(f"Conexão {i + 1}: {connection_time / 1e9:.3f}s")
                 else:
                     logger.warning(f"Conexão {i + 1}: Falhou")
             except Exception as e:
@@ -91,18 +112,7 @@ class PerformanceTester:
                     pass
                 await asyncio.sleep(1)  # Pausa para resfriamento
 
-        if connection_times:
-            return {
-                "avg_time": statistics.mean(connection_times),
-                "min_time": min(connection_times),
-                "max_time": max(connection_times),
-                "std_dev": statistics.stdev(connection_times)
-                if len(connection_times) > 1
-                else 0.0,
-                "success_rate": len(connection_times) / iterations * 100.0,
-            }
-        else:
-            return {"success_rate": 0.0}
+        return self._latency_stats("connect", iterations)
 
     async def test_order_placement_performance(
         self, iterations: int = 10
@@ -112,8 +122,8 @@ class PerformanceTester:
             f"Testando performance de colocação de ordens ({iterations} iterações)"
         )
         client = AsyncPocketOptionClient(ssid=self.ssid, is_demo=self.is_demo)
-        order_times: List[float] = []
-        successful_orders = 0
+        histogram = self.latency.histogram("order_open")
+        schedule = FixedRateSchedule(ORDER_RATE)
 
         try:
             await client.connect()
@@ -125,7 +135,8 @@ class PerformanceTester:
             await asyncio.sleep(2)
 
             for i in range(iterations):
-                start_time = time.time()
+                # Latência medida a partir do horário pretendido: uma ordem lenta atrasa as seguintes
+                start_time = await schedule.wait()
                 try:
                     order = await client.place_order(
                         asset=ORDER_ASSET,
@@ -134,33 +145,23 @@ class PerformanceTester:
                         duration=ORDER_DURATION,
                     )
                     if order:
-                        order_time = time.time() - start_time
-                        order_times.append(order_time)
-                        successful_orders += 1
-                        logger.success(f"Ordem {i + 1}: {order_time:.3f}s")
+                        order_time = schedule.since(start_time)
+                        histogram.record(order_time)
+                        logger.success(f"Ordem {i + 1}: {order_time / 1e9:.3f}s")
                     else:
                         logger.warning(f"Ordem {i + 1}: Falhou (sem resposta)")
                 except Exception as e:
                     logger.error(f"Ordem {i + 1}: Erro - {e}")
-                await asyncio.sleep(0.1)  # Pequeno atraso entre ordens
         finally:
             try:
                 await client.disconnect()
             except Exception:
                 pass
 
-        if order_times:
-            mean_time = statistics.mean(order_times)
-            return {
-                "avg_time": mean_time,
-                "min_time": min(order_times),
-                "max_time": max(order_times),
-                "std_dev": statistics.stdev(order_times) if len(order_times) > 1 else 0.0,
-                "success_rate": successful_orders / iterations * 100.0,
-                "orders_per_second": (1.0 / mean_time) if mean_time > 0 else 0.0,
-            }
-        else:
-            return {"success_rate": 0.0}
+        results = self._latency_stats("order_open", iterations)
+        if results.get("avg_time"):
+            results["orders_per_second"] = 1.0 / results["avg_time"]
+        return results
 
     async def test_data_retrieval_performance(self) -> Dict[str, Dict[str, float]]:
         """Testa a performance de recuperação de dados"""
@@ -192,24 +193,20 @@ class PerformanceTester:
             await asyncio.sleep(2)  # Aguarda inicialização
 
             for operation_name, operation in operations.items():
-                times: List[float] = []
+                histogram = self.latency.histogram(operation_name)
+                schedule = FixedRateSchedule(DATA_RATE)
                 for i in range(5):  # 5 iterações por operação
-                    start_time = time.time()
+                    start_time = await schedule.wait()
                     try:
                         await operation()
-                        operation_time = time.time() - start_time
-                        times.append(operation_time)
-                        logger.success(f"{operation_name} {i + 1}: {operation_time:.3f}s")
+                        operation_time = schedule.since(start_time)
+                        histogram.record(operation_time)
+                        logger.success(f"{operation_name} {i + 1}: {operation_time / 1e9:.3f}s")
                     except Exception as e:
                         logger.error(f"{operation_name} {i + 1}: Erro - {e}")
-                    await asyncio.sleep(0.1)
 
-                if times:
-                    results[operation_name] = {
-                        "avg_time": statistics.mean(times),
-                        "min_time": min(times),
-                        "max_time": max(times),
-                    }
+                if histogram.total_count:
+                    results[operation_name] = self._latency_stats(operation_name, 5)
         finally:
             try:
                 await client.disconnect()
@@ -228,12 +225,13 @@ class PerformanceTester:
 
         async def perform_operation(operation_id: int) -> Dict[str, Any]:
             client = AsyncPocketOptionClient(ssid=self.ssid, is_demo=self.is_demo)
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
                 await client.connect()
                 if getattr(client, "is_connected", False):
                     balance = await client.get_balance()
-                    operation_time = time.time() - start_time
+                    operation_time = time.perf_counter() - start_time
+                    self.latency.record("concurrent_operation", int(operation_time * 1e9))
                     return {
                         "operation_id": operation_id,
                         "success": True,
@@ -244,14 +242,14 @@ class PerformanceTester:
                     return {
                         "operation_id": operation_id,
                         "success": False,
-                        "time": time.time() - start_time,
+                        "time": time.perf_counter() - start_time,
                         "error": "Conexão falhou",
                     }
             except Exception as e:
                 return {
                     "operation_id": operation_id,
                     "success": False,
-                    "time": time.time() - start_time,
+                    "time": time.perf_counter() - start_time,
                     "error": str(e),
                 }
             finally:
@@ -260,10 +258,10 @@ class PerformanceTester:
                 except Exception:
                     pass
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         tasks = [perform_operation(i) for i in range(concurrency_level)]
         results: List[Any] = await asyncio.gather(*tasks, return_exceptions=True)
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
 
         successful_operations = [
             r for r in results if isinstance(r, dict) and r.get("success")
@@ -273,16 +271,14 @@ class PerformanceTester:
         ]
 
         if successful_operations:
-            operation_times = [r["time"] for r in successful_operations]
+            latency = self._latency_stats("concurrent_operation", concurrency_level)
             return {
                 "total_time": total_time,
                 "success_rate": len(successful_operations) / concurrency_level * 100.0,
-                "avg_operation_time": statistics.mean(operation_times),
-                "min_operation_time": min(operation_times),
-                "max_operation_time": max(operation_times),
-                "std_dev_operation_time": statistics.stdev(operation_times)
-                if len(operation_times) > 1
-                else 0.0,
+                "avg_operation_time": latency["avg_time"],
+                "min_operation_time": latency["min_time"],
+                "max_operation_time": latency["max_time"],
+                "p99_operation_time": latency["p99"],
                 "operations_per_second": len(successful_operations) / total_time
                 if total_time > 0
                 else 0.0,
@@ -320,7 +316,8 @@ class PerformanceTester:
                     f"Sucesso: Tempo Máximo de Conexão: {conn_results['max_time']:.3f}s"
                 )
                 report.append(
-                    f"Sucesso: Desvio Padrão: {conn_results['std_dev']:.3f}s"
+                    f"Sucesso: p50 / p99 / p99.9: {conn_results['p50']:.3f}s / "
+                    f"{conn_results['p99']:.3f}s / {conn_results['p99_9']:.3f}s"
                 )
                 report.append(
                     f"Sucesso: Taxa de Sucesso: {conn_results['success_rate']:.1f}%"
@@ -348,6 +345,7 @@ class PerformanceTester:
                 report.append(
                     f"  Faixa: {stats['min_time']:.3f}s - {stats['max_time']:.3f}s"
                 )
+                report.append(f"  p50 / p99: {stats['p50']:.3f}s / {stats['p99']:.3f}s")
         except Exception as e:
             report.append(f"Erro: Erro no teste de recuperação de dados: {e}")
         report.append("")
@@ -368,7 +366,7 @@ class PerformanceTester:
                     f"Sucesso: Tempo Médio de Operação: {concurrent_results['avg_operation_time']:.3f}s"
                 )
                 report.append(
-                    f"Sucesso: Desvio Padrão das Operações: {concurrent_results['std_dev_operation_time']:.3f}s"
+                    f"Sucesso: p99 das Operações: {concurrent_results['p99_operation_time']:.3f}s"
                 )
                 report.append(
                     f"Sucesso: Tempo Total: {concurrent_results['total_time']:.3f}s"
@@ -458,6 +456,9 @@ async def main():
         f.write(report)
     logger.success("Arquivo salvo com sucesso em performance_da_api.txt")
 
+    tester.latency.save(HISTOGRAM_FILE)
+    logger.success(f"Histogramas de latência salvos em {HISTOGRAM_FILE}")
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,99 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, desenvolvida para fornecer uma camada confiável, extensível, resiliente e orientada a eventos para automação operacional e processamento de dados de mercado em tempo real.
+
+Descrição:
+Ferramenta de replay offline. Reproduz uma captura gravada pelo recorder (POCKETOPTION_CAPTURE_PATH ou start_recording) contra o AsyncPocketOptionClient completo, usando o ReplayWebSocketClient no lugar do socket real, e imprime frames/s, tempo por estágio, os handlers mais caros e um resumo do estado final do broker.
+
+O que ele faz:
+- Carrega uma captura binária do recorder ou gera o corpus sintético do benchmark de frames
+- Reproduz no ritmo original, N× mais rápido ou o mais rápido possível (--speed)
+- Mede decodificação/roteamento separado do tempo gasto nos handlers do cliente
+- Resume o estado final (saldo, ativos, payouts, candles, ordens, eventos desconhecidos)
+- Opcionalmente grava o estado final completo em JSON para comparar execuções
+
+Características:
+- Execução 100% local, sem SSID válido e sem conexão com o broker
+- Mesma captura produz o mesmo estado final, permitindo comparar versões da biblioteca
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- loguru
+- Módulos internos do projeto:
+  - pocketoptionapi_async
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any, Dict
+
+from loguru import logger
+
+from api_benchmark_frames import build_synthetic_corpus
+from pocketoptionapi_async.replay import ReplayEngine, create_replay_client
+
+
+def summarize_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    balance = state["account"]["balance"]
+    return {
+        "balance": getattr(balance, "balance", None),
+        "assets": state["assets"]["count"],
+        "payouts": len(state["assets"]["payouts"]),
+        "candle_series": len(state["candles"]["cache_keys"]),
+        "active_orders": state["orders"]["active_count"],
+        "completed_orders": state["orders"]["completed_count"],
+        "unknown_events": len(state["unknown_events"]),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay offline de tráfego gravado")
+    parser.add_argument("capture", nargs="?", help="Arquivo de captura do recorder")
+    parser.add_argument("--synthetic", type=int, default=20_000, help="Tamanho do corpus sintético (sem captura)")
+    parser.add_argument("--speed", type=float, default=0.0, help="Fator de velocidade (0 = o mais rápido possível)")
+    parser.add_argument("--state-out", help="Grava o estado final completo em JSON")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    source: Any = args.capture or build_synthetic_corpus(args.synthetic)
+    client = create_replay_client()
+
+    # Os handlers emitem logs de debug por frame; silencia para medir só o processamento
+    logger.remove()
+    report = await ReplayEngine(client, speed=args.speed).run(source)
+    logger.add(sys.stderr, level="INFO")
+
+    print("=" * 64)
+    print("REPLAY")
+    print("=" * 64)
+    print(f"Origem:                     {args.capture or 'corpus sintético'}")
+    print(f"Frames reproduzidos:        {report['frames']} (enviados ignorados: {report['outbound_frames_skipped']})")
+    print(f"Duração:                    {report['elapsed']:.3f}s")
+    print(f"Frames/s (parede):          {report['frames_per_second']:,.0f}")
+    print(f"Frames/s (processamento):   {report['processing_frames_per_second']:,.0f}")
+    print(f"Atraso máximo:              {report['max_lag'] * 1000:.1f} ms")
+    stages = report["stages"]
+    print(f"Decodificação/roteamento:   {stages['decode_route']:.3f}s")
+    print(f"Handlers:                   {stages['handlers']:.3f}s")
+    for event, entry in list(report["handlers"].items())[:8]:
+        print(f"  {event:<24} {entry['calls']:>8} chamadas {entry['time']:.3f}s")
+    print(f"Mensagens enviadas:         {len(report['sent'])}")
+    for key, value in summarize_state(report["state"]).items():
+        print(f"{key:<27} {value}")
+    print("=" * 64)
+
+    if args.state_out:
+        with open(args.state_out, "w", encoding="utf-8") as f:
+            json.dump(report["state"], f, indent=2, sort_keys=True, default=str)
+        logger.info(f"Estado final gravado em {args.state_out}")
+
+    await client.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
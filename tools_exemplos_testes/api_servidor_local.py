@@ -0,0 +1,137 @@
+"""
+Autor: ByJhonesDev
+Projeto: PocketOptionAPI – Biblioteca Python assíncrona de alto nível para integração com a corretora Pocket Option, desenvolvida para fornecer uma camada confiável, extensível, resiliente e orientada a eventos para automação operacional e processamento de dados de mercado em tempo real.
+
+Descrição:
+Sobe o servidor local compatível com a Pocket Option (LocalBrokerServer) para testes de carga e latência sem rede. Pode ficar no ar aguardando clientes externos ou executar uma sessão de verificação com o AsyncPocketOptionClient (saldo, ativos, candles, ticks e uma ordem completa) e imprimir as estatísticas do servidor.
+
+O que ele faz:
+- Inicia o servidor em ws://host:porta com latência, jitter, taxa de ticks e preenchimento configuráveis
+- Registra a região LOCAL_DEMO para uso com client.connect(regions=["LOCAL_DEMO"])
+- Opcionalmente (--smoke) conecta um cliente real e exercita os fluxos roteirizados
+- Imprime as estatísticas do servidor ao encerrar
+
+Características:
+- Execução 100% local, sem SSID real
+- Resultados de ordens reprodutíveis com --seed
+
+Requisitos:
+- Python 3.10+
+- asyncio
+- loguru
+- Módulos internos do projeto:
+  - pocketoptionapi_async
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, Dict
+
+from loguru import logger
+
+from pocketoptionapi_async.client import AsyncPocketOptionClient
+from pocketoptionapi_async.local_server import LocalBrokerServer
+from pocketoptionapi_async.models import OrderDirection
+
+LOCAL_SSID = '42["auth",{"session":"local","isDemo":1,"uid":1,"platform":1}]'
+
+
+async def smoke_session(region: str) -> Dict[str, Any]:
+    client = AsyncPocketOptionClient(LOCAL_SSID, is_demo=True, enable_logging=False, auto_reconnect=False)
+    report: Dict[str, Any] = {}
+
+    started = time.perf_counter()
+    await client.connect(regions=[region])
+    report["connect"] = time.perf_counter() - started
+
+    try:
+        started = time.perf_counter()
+        balance = await client.get_balance()
+        report["balance"] = (balance.balance, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        candles = await client.get_candles("EURUSD_otc", 60, 50)
+        report["candles"] = (len(candles), time.perf_counter() - started)
+
+        started = time.perf_counter()
+        order = await client.place_order("EURUSD_otc", 10, OrderDirection.CALL, 60)
+        report["order_open"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        result = await client.check_win(order.order_id, max_wait_time=30)
+        report["order_result"] = ((result or {}).get("result"), time.perf_counter() - started)
+    finally:
+        await client.disconnect()
+    return report
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor local compatível com a Pocket Option")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Latência por resposta (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Jitter máximo adicional (s)")
+    parser.add_argument("--tick-rate", type=float, default=2.0, help="Ticks por segundo por ativo assinado")
+    parser.add_argument("--binary-ticks", action="store_true", help="Envia ticks como 451- + anexo binário")
+    parser.add_argument("--binary-auth", action="store_true", help="Envia o successauth como 451- + anexo binário")
+    parser.add_argument("--candles", type=int, default=100, help="Candles por histórico")
+    parser.add_argument("--padding", type=int, default=0, help="Bytes extras em cada payload de evento")
+    parser.add_argument("--order-time-scale", type=float, default=1.0, help="Escala da expiração das ordens")
+    parser.add_argument("--win-rate", type=float, default=0.5)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--smoke", action="store_true", help="Executa uma sessão de verificação e encerra")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    server = LocalBrokerServer(
+        host=args.host,
+        port=0 if args.smoke else args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        tick_rate=args.tick_rate,
+        binary_ticks=args.binary_ticks,
+        binary_auth=args.binary_auth,
+        candle_count=args.candles,
+        payload_padding=args.padding,
+        order_time_scale=0.05 if args.smoke and args.order_time_scale == 1.0 else args.order_time_scale,
+        win_rate=args.win_rate,
+        seed=args.seed,
+    )
+
+    async with server:
+        region = server.register_region()
+        if args.smoke:
+            report = await smoke_session(region)
+            print("=" * 72)
+            print("SESSÃO DE VERIFICAÇÃO NO SERVIDOR LOCAL")
+            print("=" * 72)
+            print(f"Conexão:      {report['connect'] * 1000:.1f} ms")
+            print(f"Saldo:        {report['balance'][0]:.2f} ({report['balance'][1] * 1000:.1f} ms)")
+            print(f"Candles:      {report['candles'][0]} ({report['candles'][1] * 1000:.1f} ms)")
+            print(f"Ordem aberta: {report['order_open'] * 1000:.1f} ms")
+            print(f"Resultado:    {report['order_result'][0]} ({report['order_result'][1] * 1000:.1f} ms)")
+        else:
+            logger.info(f"Região {region} registrada; Ctrl+C para encerrar")
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                pass
+
+        stats = server.get_stats()
+        print("=" * 72)
+        print(f"Conexões: {stats['connections']} | recebidas: {stats['messages_received']} | "
+              f"enviadas: {stats['messages_sent']} | ticks: {stats['ticks_sent']} | "
+              f"ordens: {stats['orders_opened']}/{stats['orders_closed']}")
+        print(f"Eventos:  {stats['events']}")
+        print("=" * 72)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass